@@ -0,0 +1,407 @@
+"""
+Streaming CSV / JSON Lines (or JSON array) import into a single model.
+
+Rows are read one at a time, cleaned with the model fields' own
+validation (no serializer per row), and written in chunks: one
+transaction and one executemany() INSERT / UPDATE per chunk. Memory use
+depends on the chunk size, not on the file size. Invalid rows are
+reported by line number and skipped; they never abort the load. Neither
+do rows the database rejects (a duplicate unique value, say): their chunk
+is written again one row at a time to find and report them.
+
+Apps subclass ``BulkImporter`` and expose it through ``BulkImportView``
+and ``ImportCommand``.
+"""
+
+import codecs
+import csv
+import json
+import sys
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError as APIValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from dashboard import counters, versions
+
+FORMATS = ('csv', 'jsonl')
+
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'jsonl',
+    'application/jsonl': 'jsonl',
+    'application/x-jsonlines': 'jsonl',
+    'application/json': 'json',
+}
+
+MISSING = object()
+
+
+class RowError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(errors)
+
+
+class ImportReport:
+    def __init__(self, max_errors=1000):
+        self.max_errors = max_errors
+        self.rows = self.created = self.updated = self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def read_csv(lines):
+    """Yield ``(line_number, row_dict)``; the first row is the header."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(lines):
+    """Yield ``(line_number, object)``, or ``(line_number, RowError)`` for a bad line."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, RowError({"non_field_errors": [f"Invalid JSON: {exc}"]})
+            continue
+        if not isinstance(row, dict):
+            row = RowError({"non_field_errors": ["Each line must be a JSON object."]})
+        yield number, row
+
+
+def read_json_array(items):
+    """Yield ``(position, object)`` for an already parsed JSON array; positions start at 1."""
+    for number, row in enumerate(items, start=1):
+        if not isinstance(row, dict):
+            row = RowError({"non_field_errors": ["Each item must be a JSON object."]})
+        yield number, row
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+def decode_lines(chunks, encoding='utf-8-sig'):
+    """Decode an iterable of byte lines incrementally (a BOM is dropped)."""
+    return codecs.iterdecode(chunks, encoding)
+
+
+class BulkImporter:
+    """Clean and write rows for ``model`` in chunks.
+
+    ``fields`` lists the importable columns. With ``upsert`` a row whose
+    ``upsert_keys`` match an existing row updates it (only the columns the
+    row supplied) instead of inserting a new one.
+    """
+
+    model = None
+    fields = ()
+    upsert_keys = ()
+    chunk_size = 1000
+
+    def __init__(self, upsert=False, chunk_size=None, max_errors=1000):
+        if upsert and not self.upsert_keys:
+            raise ValueError(f"{type(self).__name__} does not support upserts.")
+        self.upsert = upsert
+        self.chunk_size = chunk_size or self.chunk_size
+        self.max_errors = max_errors
+        self.model_fields = [self.model._meta.get_field(name) for name in self.fields]
+
+    def clean_row(self, row):
+        """Return ``{field: value}`` for the supplied columns, or raise RowError."""
+        values = {}
+        errors = {}
+        for field in self.model_fields:
+            raw = row.get(field.name, MISSING)
+            if raw is None or raw == '':
+                raw = MISSING
+            if raw is MISSING:
+                if not field.has_default() and not field.null:
+                    errors[field.name] = ["This field is required."]
+                continue
+            try:
+                values[field.attname] = self.clean_value(field, raw)
+            except ValidationError as exc:
+                errors[field.name] = exc.messages
+        if errors:
+            raise RowError(errors)
+        return values
+
+    def clean_value(self, field, raw):
+        return field.clean(raw, None)
+
+    def run(self, lines, format):
+        """Import every row from ``lines`` (an iterable of text lines)."""
+        return self.run_rows(READERS[format](lines))
+
+    def run_rows(self, rows):
+        """Import ``(line, row)`` pairs, where ``row`` is a dict or a RowError."""
+        report = ImportReport(self.max_errors)
+        chunk = []
+        for line, row in rows:
+            report.rows += 1
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                chunk.append((line, self.clean_row(row)))
+            except RowError as exc:
+                report.add_error(line, exc.errors)
+                continue
+            if len(chunk) >= self.chunk_size:
+                self.write_chunk(chunk, report)
+                chunk = []
+        if chunk:
+            self.write_chunk(chunk, report)
+        return report
+
+    def upsert_key(self, values):
+        key = tuple(values.get(self.model._meta.get_field(name).attname) for name in self.upsert_keys)
+        return None if None in key else key
+
+    def existing_pks(self, keys):
+        first = self.upsert_keys[0]
+        rows = (
+            self.model.objects
+            .filter(**{f'{first}__in': {key[0] for key in keys}})
+            .order_by('pk')
+            .values_list('pk', *self.upsert_keys)
+        )
+        found = {}
+        for pk, *key in rows:
+            key = tuple(key)
+            if key in keys:
+                found.setdefault(key, pk)
+        return found
+
+    def write_chunk(self, chunk, report):
+        """Write ``(line, values)`` pairs; a chunk the database rejects is retried row by row."""
+        try:
+            with transaction.atomic():
+                created, updated = self.write_rows([values for _, values in chunk])
+        except (IntegrityError, DataError):
+            # One savepoint per row isolates the rows the database refuses.
+            created = updated = 0
+            for line, values in chunk:
+                try:
+                    with transaction.atomic():
+                        row_created, row_updated = self.write_rows([values])
+                except (IntegrityError, DataError) as exc:
+                    report.add_error(line, {"non_field_errors": [str(exc)]})
+                else:
+                    created += row_created
+                    updated += row_updated
+        report.created += created
+        report.updated += updated
+
+    def write_rows(self, rows):
+        """Insert or upsert cleaned ``rows``; returns ``(created, updated)``."""
+        creates = []
+        updates = {}
+        if self.upsert:
+            keyed = {}
+            for values in rows:
+                key = self.upsert_key(values)
+                if key is None:
+                    creates.append(values)
+                else:
+                    # A later row with the same key wins.
+                    keyed.setdefault(key, {}).update(values)
+            pks = self.existing_pks(set(keyed))
+            for key, values in keyed.items():
+                if key in pks:
+                    updates[pks[key]] = values
+                else:
+                    creates.append(values)
+        else:
+            creates = rows
+
+        if creates:
+            self.insert(creates)
+        if updates:
+            self.update(updates)
+        self.after_write(len(creates), len(updates))
+        return len(creates), len(updates)
+
+    # Rows are written with one prepared statement and executemany(): the
+    # values are already cleaned, and building a model instance plus a
+    # multi-row INSERT per row costs more than the database write itself.
+
+    def insert(self, rows):
+        db = transaction.get_connection()
+        meta = self.model._meta
+        moment = timezone.now()
+        fields = [f for f in meta.concrete_fields if not f.primary_key and not f.generated]
+        # Database values for columns a row leaves out, prepared once per chunk.
+        fillers = {}
+        for field in fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                filler = moment
+            elif field.has_default():
+                filler = field.get_default()
+            else:
+                filler = None
+            fillers[field.attname] = field.get_db_prep_save(filler, db)
+
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+            db.ops.quote_name(meta.db_table),
+            ', '.join(db.ops.quote_name(f.column) for f in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        params = [
+            [
+                f.get_db_prep_save(values[f.attname], db) if f.attname in values else fillers[f.attname]
+                for f in fields
+            ]
+            for values in rows
+        ]
+        with db.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+    def update(self, updates):
+        db = transaction.get_connection()
+        meta = self.model._meta
+        stamped = [f for f in meta.concrete_fields if getattr(f, 'auto_now', False)]
+        stamps = [f.get_db_prep_save(timezone.now(), db) for f in stamped]
+        # Group by supplied columns so a missing column never overwrites a stored value.
+        groups = {}
+        for pk, values in updates.items():
+            groups.setdefault(tuple(sorted(values)), []).append((pk, values))
+
+        with db.cursor() as cursor:
+            for columns, rows in groups.items():
+                fields = [meta.get_field(name) for name in columns]
+                sql = 'UPDATE %s SET %s WHERE %s = %%s' % (
+                    db.ops.quote_name(meta.db_table),
+                    ', '.join('%s = %%s' % db.ops.quote_name(f.column) for f in fields + stamped),
+                    db.ops.quote_name(meta.pk.column),
+                )
+                cursor.executemany(sql, [
+                    [f.get_db_prep_save(values[f.attname], db) for f in fields] + stamps + [pk]
+                    for pk, values in rows
+                ])
+
+    def after_write(self, created, updated):
+        # Raw writes skip the post_save receivers in dashboard.signals.
+        if not (created or updated):
+            return
+        versions.bump(self.model)
+        field = counters.MODEL_COUNTERS.get(self.model)
+        if field and created:
+            counters.bump(**{field: created})
+
+
+class BulkImportView(APIView):
+    """Stream a CSV (``text/csv``) or JSON Lines (``application/x-ndjson``) body into the model.
+
+    An ``application/json`` array of objects is accepted too; it is parsed
+    whole, so it suits batches that fit comfortably in memory.
+
+    ``?mode=upsert`` updates rows matching the importer's natural key and
+    ``?chunk_size=`` sets the write batch size.
+    """
+
+    importer_class = None
+    permission_classes = [IsAuthenticated]
+    max_chunk_size = 5000
+
+    def get_format(self, request):
+        content_type = (request.content_type or '').split(';')[0].strip().lower()
+        if content_type not in CONTENT_TYPES:
+            raise UnsupportedMediaType(content_type or 'none')
+        return CONTENT_TYPES[content_type]
+
+    def get_chunk_size(self, request):
+        raw = request.query_params.get('chunk_size')
+        if raw is None:
+            return None
+        if not raw.isdigit() or not 1 <= int(raw) <= self.max_chunk_size:
+            raise APIValidationError({"chunk_size": f"Must be between 1 and {self.max_chunk_size}."})
+        return int(raw)
+
+    def post(self, request):
+        format = self.get_format(request)
+        mode = request.query_params.get('mode', 'insert')
+        if mode not in ('insert', 'upsert'):
+            raise APIValidationError({"mode": "Must be 'insert' or 'upsert'."})
+        if mode == 'upsert' and not self.importer_class.upsert_keys:
+            raise APIValidationError({"mode": "This endpoint only inserts."})
+        importer = self.importer_class(upsert=mode == 'upsert', chunk_size=self.get_chunk_size(request))
+
+        if format == 'json':
+            if not isinstance(request.data, list):
+                raise APIValidationError({"non_field_errors": ["Expected a JSON array of objects."]})
+            return Response(importer.run_rows(read_json_array(request.data)).as_dict())
+
+        # Read the raw body line by line; request.data would buffer all of it.
+        stream = request.stream
+        lines = iter(lambda: stream.readline(64 * 1024), b'') if stream is not None else ()
+        try:
+            report = importer.run(decode_lines(lines), format)
+        except UnicodeDecodeError:
+            raise APIValidationError({"non_field_errors": ["The body is not valid UTF-8."]})
+        return Response(report.as_dict())
+
+
+class ImportCommand(BaseCommand):
+    importer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSON Lines file, or '-' for stdin.")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--upsert', action='store_true', help="Update rows matching the natural key.")
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--max-errors', type=int, default=100, help="Row errors to print.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format']
+        if format is None:
+            format = 'csv' if path.lower().endswith('.csv') else 'jsonl' if path != '-' else None
+        if format is None:
+            raise CommandError("--format is required when reading from stdin.")
+
+        importer = self.importer_class(
+            upsert=options['upsert'],
+            chunk_size=options['chunk_size'],
+            max_errors=options['max_errors'],
+        )
+        if path == '-':
+            report = importer.run(decode_lines(sys.stdin.buffer), format)
+        else:
+            try:
+                with open(path, 'rb') as handle:
+                    report = importer.run(decode_lines(handle), format)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f"... {report.failed - len(report.errors)} more row error(s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {report.rows} row(s): {report.created} created, "
+            f"{report.updated} updated, {report.failed} rejected."
+        ))
@@ -0,0 +1,246 @@
+"""
+Sparse fieldsets and expansions for ModelSerializer list/detail endpoints.
+
+``?fields=id,item_name`` trims the serializer to those fields and
+``?expand=item,item.user`` swaps a primary key for the related object.
+Dotted ``fields`` entries (``item.item_name``) trim an expansion. The view
+then shapes its queryset to match: ``.only()`` the columns the serializer
+will read, ``select_related`` for expanded foreign keys and
+``prefetch_related`` for many-to-many fields, so query cost and payload
+size follow what the client asked for.
+
+A to-many expansion may be bounded: given a ``relation``, ``ordering`` and
+``limit`` only the first ``limit`` related rows per object are fetched, in
+one window-function query per relation (a sliced Prefetch), and
+``?expand_limit=N`` overrides the limit for the request.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer, ModelSerializer
+
+MAX_EXPAND_LIMIT = 100
+# expandable_fields options read by queryset_shape rather than passed to the serializer.
+EXPANSION_OPTIONS = ('relation', 'ordering', 'limit')
+
+
+def parse_paths(value):
+    """``'a,b.c,b.d'`` -> ``{'a': {}, 'b': {'c': {}, 'd': {}}}``; None when absent."""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetSerializerMixin:
+    """Accept ``fields`` / ``expand`` trees (see ``parse_paths``) as serializer kwargs.
+
+    ``expandable_fields`` maps a relation name to ``(serializer, options)``,
+    where ``serializer`` is a class or a dotted path and ``options`` are
+    extra kwargs such as ``{'many': True}``. A bounded expansion names its
+    to-many ``relation`` (field or accessor name) with an ``ordering`` and a
+    default ``limit`` per object; ``expand_limit`` overrides every such limit.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=None, expand_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.expand_limit = expand_limit
+        expand = expand or {}
+        unknown = sorted(set(expand) - set(self.expandable_fields))
+        if unknown:
+            raise ValidationError({"expand": f"Cannot expand: {', '.join(unknown)}."})
+
+        for name, nested_expand in expand.items():
+            serializer_class, options = self.expandable_fields[name]
+            options = {key: value for key, value in options.items() if key not in EXPANSION_OPTIONS}
+            if isinstance(serializer_class, str):
+                serializer_class = import_string(serializer_class)
+            nested = {}
+            if issubclass(serializer_class, SparseFieldsetSerializerMixin):
+                nested = {
+                    'fields': (fields or {}).get(name) or None,
+                    'expand': nested_expand,
+                    'expand_limit': expand_limit,
+                }
+            elif (fields or {}).get(name) or nested_expand:
+                raise ValidationError({"fields": f"'{name}' cannot be narrowed further."})
+            self.fields[name] = serializer_class(read_only=True, **options, **nested)
+
+        if fields is not None:
+            unknown = sorted(set(fields) - set(self.fields))
+            if unknown:
+                raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+            for name in list(self.fields):
+                if name not in fields and name not in expand:
+                    self.fields.pop(name)
+
+
+def related_field(opts, name):
+    """``opts.get_field(name)``, also accepting a reverse relation's accessor name (``operationrecord_set``)."""
+    try:
+        return opts.get_field(name)
+    except FieldDoesNotExist:
+        for relation in opts.related_objects:
+            if relation.get_accessor_name() == name:
+                return relation
+        raise
+
+
+def _model_serializer(field):
+    if isinstance(field, ListSerializer):
+        field = field.child
+    return field if isinstance(field, ModelSerializer) else None
+
+
+def queryset_shape(serializer, model, prefix=''):
+    """``(only, select_related, prefetches)`` needed to render ``serializer`` for ``model``.
+
+    ``only`` is None when some field cannot be traced to a column (a method
+    field or property), in which case nothing is deferred.
+    """
+    opts = model._meta
+    expandable = getattr(serializer, 'expandable_fields', {})
+    only = {prefix + opts.pk.name}
+    select = []
+    prefetches = []
+    for field in serializer.fields.values():
+        options = expandable.get(field.field_name, (None, {}))[1]
+        if 'relation' in options:
+            # A bounded expansion is read from the list its Prefetch stores under the field's name.
+            model_field = related_field(opts, options['relation'])
+            lookup, to_attr = options['relation'], field.field_name
+        elif field.source == '*' or not field.source_attrs:
+            only = None
+            continue
+        else:
+            try:
+                model_field = related_field(opts, field.source_attrs[0])
+            except Exception:
+                only = None
+                continue
+            lookup, to_attr = field.source_attrs[0], None
+        name = model_field.name
+        nested = _model_serializer(field)
+
+        if model_field.many_to_many or model_field.one_to_many:
+            related = model_field.related_model
+            # Prefetching matches rows to their parent on the foreign key, so it is never deferred.
+            extra = [model_field.field.name] if model_field.one_to_many else []
+            queryset = related._default_manager.all()
+            if nested is not None:
+                queryset = shape_queryset(queryset, nested, extra=extra)
+            else:
+                queryset = queryset.only(related._meta.pk.name, *extra)
+            if options.get('ordering'):
+                queryset = queryset.order_by(*options['ordering'])
+            if options.get('limit'):
+                queryset = queryset[:serializer.expand_limit or options['limit']]
+            prefetches.append(Prefetch(prefix + lookup, queryset=queryset, to_attr=to_attr))
+        elif model_field.is_relation and nested is not None:
+            select.append(prefix + name)
+            nested_only, nested_select, nested_prefetches = queryset_shape(
+                nested, model_field.related_model, prefix=f'{prefix}{name}__'
+            )
+            if only is not None:
+                only.add(prefix + name)
+                only = only | nested_only if nested_only is not None else None
+            select.extend(nested_select)
+            prefetches.extend(nested_prefetches)
+        elif only is not None:
+            only.add(prefix + name)
+    return only, select, prefetches
+
+
+def shape_queryset(queryset, serializer, extra=()):
+    only, select, prefetches = queryset_shape(serializer, queryset.model)
+    if only is not None:
+        queryset = queryset.only(*only, *extra)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """GenericAPIView mixin wiring ``?fields=`` / ``?expand=`` into the serializer and queryset."""
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    expand_limit_query_param = 'expand_limit'
+
+    def sparse_enabled(self):
+        return (
+            self.request is not None
+            and self.request.method in ('GET', 'HEAD')
+            and issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin)
+        )
+
+    def get_sparse_kwargs(self):
+        if not hasattr(self, '_sparse_kwargs'):
+            params = self.request.query_params
+            self._sparse_kwargs = {
+                'fields': parse_paths(params.get(self.fields_query_param)),
+                'expand': parse_paths(params.get(self.expand_query_param)) or {},
+                'expand_limit': self.get_expand_limit(),
+            }
+        return self._sparse_kwargs
+
+    def get_expand_limit(self):
+        value = self.request.query_params.get(self.expand_limit_query_param)
+        if value is None:
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_EXPAND_LIMIT:
+            raise ValidationError({self.expand_limit_query_param: f"Must be an integer from 1 to {MAX_EXPAND_LIMIT}."})
+        return limit
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_enabled():
+            for key, value in self.get_sparse_kwargs().items():
+                kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.sparse_enabled():
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context(), **self.get_sparse_kwargs())
+        # The keyset paginator reads its ordering column from the last row.
+        extra = [f for f in [getattr(self, 'keyset_ordering_field', None)] if f]
+        return shape_queryset(queryset, serializer, extra=extra)
+
+    def get_conditional_models(self):
+        models = list(super().get_conditional_models())
+        if not self.sparse_enabled():
+            return models
+
+        def add_expanded(serializer_class, expand):
+            for name, nested_expand in expand.items():
+                if name not in serializer_class.expandable_fields:
+                    continue
+                nested_class, options = serializer_class.expandable_fields[name]
+                related = related_field(serializer_class.Meta.model._meta, options.get('relation', name)).related_model
+                if related not in models:
+                    models.append(related)
+                if isinstance(nested_class, str):
+                    nested_class = import_string(nested_class)
+                if issubclass(nested_class, SparseFieldsetSerializerMixin):
+                    add_expanded(nested_class, nested_expand)
+
+        add_expanded(self.get_serializer_class(), self.get_sparse_kwargs()['expand'])
+        return models
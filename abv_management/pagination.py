@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over (ordering field, id), newest first.
+
+    Each page is a single indexed range scan: the cursor carries the last
+    row's (value, id) and the next page is ``WHERE (field, id) < cursor``.
+    No COUNT(*) is ever run and rows inserted meanwhile never shift a page.
+    A ``previous`` cursor carries the page's first row and a flag, and is
+    answered by the same scan in the other direction. Views pick the column
+    with ``keyset_ordering_field`` and should have a composite index on
+    (field, id).
+    """
+
+    ordering_field = 'timestamp'
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering_field(self, view):
+        return getattr(view, 'keyset_ordering_field', self.ordering_field)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj, reverse=False):
+        value = getattr(obj, self.field)
+        position = [value.isoformat() if hasattr(value, 'isoformat') else value, obj.pk]
+        raw = json.dumps(position + [1] if reverse else position)
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor, model):
+        """Return ``(value, pk, reverse)``; ``reverse`` marks a cursor to the previous page."""
+        try:
+            value, pk, *reverse = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if reverse not in ([], [1]):
+                raise ValueError(cursor)
+            return model._meta.get_field(self.field).to_python(value), int(pk), bool(reverse)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field = self.get_ordering_field(view)
+        page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            page = list(queryset.order_by(f'-{self.field}', '-pk')[:page_size + 1])
+            self.has_next, self.has_previous = len(page) > page_size, False
+            self.page = page[:page_size]
+            return self.page
+
+        value, pk, reverse = self.decode_cursor(cursor, queryset.model)
+        # The redundant "field <= value" (">=" going back) bound lets the database seek
+        # straight to the cursor in the (field, id) index instead of scanning up to it.
+        if reverse:
+            queryset = queryset.order_by(self.field, 'pk').filter(
+                Q(**{f'{self.field}__gte': value}),
+                Q(**{f'{self.field}__gt': value}) | Q(pk__gt=pk),
+            )
+        else:
+            queryset = queryset.order_by(f'-{self.field}', '-pk').filter(
+                Q(**{f'{self.field}__lte': value}),
+                Q(**{f'{self.field}__lt': value}) | Q(pk__lt=pk),
+            )
+
+        page = list(queryset[:page_size + 1])
+        more = len(page) > page_size
+        page = page[:page_size]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next, self.has_previous = more, True
+        self.page = page
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """LimitOffsetPagination that stops paying a COUNT(*) per page once a table is large.
+
+    While the table holds fewer than PAGINATION_EXACT_COUNT_LIMIT rows every
+    page counts as usual. Past that, the total for each filter combination
+    is counted once and cached for PAGINATION_COUNT_CACHE_TIMEOUT seconds,
+    so ``count`` may lag recent writes by that long. The table size that
+    decides between the two is cached the same way.
+    """
+
+    cache_key_prefix = 'pagination-count'
+
+    def cached_count(self, queryset):
+        queryset = queryset.order_by()
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.sha1(f'{queryset.db}|{sql}|{params!r}'.encode()).hexdigest()
+        key = f'{self.cache_key_prefix}:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = super().get_count(queryset)
+            cache.set(key, count, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+        return count
+
+    def get_count(self, queryset):
+        table = queryset.model._default_manager.using(queryset.db).all()
+        if self.cached_count(table) < getattr(settings, 'PAGINATION_EXACT_COUNT_LIMIT', 10000):
+            return super().get_count(queryset)
+        return self.cached_count(queryset)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None:
+            # A cached total can be behind the rows actually returned.
+            self.count = max(self.count, self.offset + len(page))
+        return page
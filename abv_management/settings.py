@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -84,6 +85,51 @@ REST_FRAMEWORK = {
     
 }
 
+# Seconds an InventoryStatus payload is kept in the in-process cache. Entries are
+# keyed on the Inventory version stamp, so writes invalidate them immediately.
+INVENTORY_STATUS_CACHE_TIMEOUT = 30
+
+# Live dashboard stream (/api/dashboard/live/). The in-process broadcaster only
+# reaches clients connected to the same process; for several workers or nodes use
+# 'dashboard.live.RedisBroadcaster' with DASHBOARD_LIVE_OPTIONS = {'url': 'redis://...'}.
+DASHBOARD_LIVE_BACKEND = os.getenv('DASHBOARD_LIVE_BACKEND', 'dashboard.live.InProcessBroadcaster')
+DASHBOARD_LIVE_OPTIONS = {'url': os.environ['DASHBOARD_LIVE_REDIS_URL']} if os.getenv('DASHBOARD_LIVE_REDIS_URL') else {}
+DASHBOARD_LIVE_HEARTBEAT = 15
+
+# Hours a machine is expected to be available per day; the denominator of the
+# utilization ratio in /api/dashboard/equipment/utilization/.
+EQUIPMENT_AVAILABLE_HOURS_PER_DAY = 8
+
+# Depreciation defaults for /api/dashboard/finance/valuation/ (finance.valuation): years of
+# useful life, residual value as a share of cost, and the declining-balance multiple of
+# the straight-line rate (2 = double declining). Valuations are cached per Equipment version.
+EQUIPMENT_USEFUL_LIFE_YEARS = 10
+EQUIPMENT_SALVAGE_RATE = 0.1
+EQUIPMENT_DECLINING_BALANCE_FACTOR = 2
+EQUIPMENT_VALUATION_CACHE_TIMEOUT = 3600
+
+# Idempotency-Key handling for create endpoints (dashboard.idempotency): how long a
+# finished response is replayed, how long an unfinished claim blocks the key (after a
+# crash the key frees itself), and how long a duplicate waits for the first to finish.
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+
+# Background writers for OperationRecord batches posted with ?async=1. Keep this at 1 on
+# SQLite, which allows a single writer at a time.
+OPERATION_INGEST_WORKERS = 1
+
+# CachedCountPagination counts every page exactly below this many rows in the table;
+# above it each filter's total is cached for PAGINATION_COUNT_CACHE_TIMEOUT seconds.
+PAGINATION_EXACT_COUNT_LIMIT = 10000
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Operating hours between services; update_maintenance_due projects due dates from it.
+MAINTENANCE_SERVICE_INTERVAL_HOURS = 250
+
+# Threads shared by all /api/dashboard/batch/ requests for computing widgets.
+DASHBOARD_BATCH_WORKERS = 4
+
 SITE_ID = 1
 
 MIDDLEWARE = [
@@ -47,6 +47,8 @@ urlpatterns = [
     path('api/projects/', include('projects.urls')),
     path('api/equipment/', include('equipment.urls')),
     path('api/inventory/', include('inventory.urls')),
+    path('api/operations/', include('operations.urls')),
+    path('api/transactions/', include('transaction.urls')),
     path('api/dashboard/', include('dashboard.urls')),
     path('api/categories/', include(('category.urls', 'category'), namespace='category')),
 
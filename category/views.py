@@ -4,11 +4,14 @@ from rest_framework import generics
 from .models import UserCategory
 from .serializers import UserCategorySerializer
 from rest_framework.permissions import IsAuthenticated
+from dashboard.conditional import ConditionalGetMixin
+from dashboard.idempotency import IdempotencyMixin
 
-class UserCategoryListCreateView(generics.ListCreateAPIView):
+class UserCategoryListCreateView(IdempotencyMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = UserCategory.objects.all()
     serializer_class = UserCategorySerializer
     permission_classes = [IsAuthenticated]
+    conditional_models = [UserCategory]
 
 class UserCategoryUpdateView(generics.UpdateAPIView):
     queryset = UserCategory.objects.all()
@@ -0,0 +1,68 @@
+from datetime import datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+
+from abv_management.pagination import KeysetPagination
+from operations.models import MaintenanceRecord
+from projects.models import Project
+from safety.models import SafetyIncident
+
+from . import rollups, versions
+from .models import ActivityEvent
+
+EVENT_TYPES = {choice for choice, _ in ActivityEvent.TYPE_CHOICES}
+
+
+# Events carry their source record's own timestamp (maintenance records only have
+# a date, so midnight of it), so the live signal and the backfill write the same rows.
+def _midnight(day):
+    return timezone.make_aware(datetime.combine(rollups.as_date(day), time.min))
+
+
+def project_event(project):
+    return ActivityEvent(
+        type='project',
+        message=f"New Project '{project.project_name}' created",
+        object_id=project.pk,
+        timestamp=project.created_at,
+    )
+
+
+def incident_event(incident):
+    return ActivityEvent(
+        type='incident',
+        message=f"Safety incident reported on {incident.incident_date}",
+        object_id=incident.pk,
+        timestamp=incident.created_at,
+    )
+
+
+def maintenance_event(record):
+    return ActivityEvent(
+        type='maintenance',
+        message=f"{record.equipment.equipment_name} maintenance {record.status}",
+        object_id=record.pk,
+        timestamp=_midnight(record.performed_at),
+    )
+
+
+class ActivityFeedPagination(KeysetPagination):
+    """Newest-first pages of the log: ?before=<cursor>&limit=<n>."""
+
+    page_size = 15
+    page_size_query_param = 'limit'
+    cursor_query_param = 'before'
+
+
+@transaction.atomic
+def backfill_activity_events():
+    """Recreate the log from existing projects, safety incidents and maintenance records."""
+    ActivityEvent.objects.all().delete()
+    events = [project_event(project) for project in Project.objects.all()]
+    events += [incident_event(incident) for incident in SafetyIncident.objects.all()]
+    events += [maintenance_event(record) for record in MaintenanceRecord.objects.select_related('equipment')]
+    events.sort(key=lambda event: event.timestamp)
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+    versions.bump(ActivityEvent)
+    return len(events)
@@ -1,3 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import (
+    ActivityEvent, DashboardCounters, EquipmentUtilization, IdempotencyKey, ModelVersion, OperationRollup,
+)
+
+admin.site.register(DashboardCounters)
+admin.site.register(OperationRollup)
+admin.site.register(EquipmentUtilization)
+admin.site.register(ActivityEvent)
+admin.site.register(ModelVersion)
+admin.site.register(IdempotencyKey)
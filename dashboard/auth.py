@@ -0,0 +1,24 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+def authenticate_jwt(request, allow_query_token=False):
+    """Return the user for a JWT sent in the Authorization header.
+
+    For plain Django views that cannot use DRF's authentication classes.
+    ``allow_query_token`` also accepts ``?token=``, for the SSE stream only:
+    browsers' EventSource cannot set headers, and query strings end up in
+    access logs. Returns None when no valid token is present.
+    """
+    authenticator = JWTAuthentication()
+    try:
+        result = authenticator.authenticate(request)
+        if result is not None:
+            return result[0]
+        token = request.GET.get('token') if allow_query_token else None
+        if token:
+            return authenticator.get_user(authenticator.get_validated_token(token.encode()))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    return None
@@ -0,0 +1,74 @@
+import copy
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import QueryDict
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The bounded pool every batch request shares for computing widgets."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'DASHBOARD_BATCH_WORKERS', 4),
+                    thread_name_prefix='dashboard-batch',
+                )
+    return _executor
+
+
+def widget_params(query_params, name, reserved=('widgets', 'timing')):
+    """Shared query parameters, overridden by ``<name>.<param>`` ones."""
+    params = QueryDict(mutable=True)
+    prefix = f'{name}.'
+    for key, values in query_params.lists():
+        if key in reserved or '.' in key:
+            continue
+        params.setlist(key, values)
+    for key, values in query_params.lists():
+        if key.startswith(prefix):
+            params.setlist(key[len(prefix):], values)
+    return params
+
+
+def run_widget(view_class, path, request, user, params):
+    """Compute one widget's payload on a pool thread, reusing an already authenticated user.
+
+    Returns ``(status, payload, elapsed_ms)``.
+    """
+    started = time.perf_counter()
+    close_old_connections()
+    try:
+        widget_request = copy.copy(request)
+        widget_request.GET = params
+        widget_request.path = widget_request.path_info = path
+        widget_request.META = {**request.META, 'QUERY_STRING': params.urlencode()}
+        widget_request.user = user
+
+        drf_request = Request(widget_request)
+        drf_request.user = user
+        view = view_class(request=drf_request, args=(), kwargs={}, format_kwarg=None, headers={})
+        for permission in view.get_permissions():
+            if not permission.has_permission(drf_request, view):
+                raise PermissionDenied(getattr(permission, 'message', None))
+        status, payload = 200, view.get_payload(drf_request)
+    except APIException as exc:
+        status, payload = exc.status_code, {"detail": exc.detail}
+    except Exception:
+        logger.exception("Dashboard widget %s failed", view_class.__name__)
+        status, payload = 500, {"detail": "Internal error while computing this widget."}
+    finally:
+        close_old_connections()
+    return status, payload, (time.perf_counter() - started) * 1000
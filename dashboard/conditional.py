@@ -0,0 +1,76 @@
+import hashlib
+
+from django.utils.http import http_date, parse_etags
+from django.utils.timezone import localtime
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import versions
+
+
+class _NotModified(Exception):
+    pass
+
+
+class ConditionalGetMixin:
+    """Strong ETag / Last-Modified for read-mostly APIViews, from per-model version stamps.
+
+    Set ``conditional_models`` to every model the response is built from.
+    A GET whose If-None-Match still matches is answered with 304 right after
+    authentication and permission checks, before any queryset is evaluated
+    or serialized. If-Modified-Since is not honoured: HTTP dates have whole
+    seconds, so a write later in the same second would still look unmodified.
+    """
+
+    conditional_models = ()
+
+    def get_conditional_models(self):
+        return self.conditional_models
+
+    def get_validators(self, request):
+        stamps = versions.current(*self.get_conditional_models())
+        key = '|'.join(
+            [type(self).__name__, request.get_full_path(), getattr(request, 'accepted_media_type', '') or '']
+            + [f'{label}:{version}' for label, (version, _) in sorted(stamps.items())]
+        )
+        etag = '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+        modified = [updated_at for _, updated_at in stamps.values() if updated_at]
+        return etag, max(modified) if modified else None
+
+    def _not_modified(self, request):
+        if_none_match = request.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        return '*' in etags or self.etag in etags
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.last_modified = None
+        if request.method in ('GET', 'HEAD'):
+            self.etag, self.last_modified = self.get_validators(request)
+            if self._not_modified(request):
+                raise _NotModified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified:
+                response['Last-Modified'] = http_date(self.last_modified.timestamp())
+        return response
+
+
+class DailyConditionalGetMixin(ConditionalGetMixin):
+    """ConditionalGetMixin for responses that default to "as of today": the validators also change at midnight."""
+
+    def get_validators(self, request):
+        etag, last_modified = super().get_validators(request)
+        midnight = localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        etag = '"%s-%s"' % (etag.strip('"'), midnight.strftime('%Y%m%d'))
+        return etag, max(last_modified, midnight) if last_modified else midnight
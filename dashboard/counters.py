@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Q
+from django.utils.timezone import now
+
+from equipment.models import Equipment
+from projects.models import Project
+from incidents.models import Incident
+from inventory.models import Inventory
+from operations.models import OperationRecord, MaintenanceRecord
+
+from . import live, versions
+from .models import DashboardCounters
+
+User = get_user_model()
+
+COUNTERS_PK = 1
+
+# role value -> counter field
+ROLE_COUNTERS = {
+    'project_manager': 'project_managers',
+    'safety_officer': 'safety_officers',
+    'inventory_manager': 'inventory_managers',
+    'accounts_manager': 'accounts_managers',
+    'equipment_manager': 'equipment_managers',
+}
+
+# model -> counter field holding its row count
+MODEL_COUNTERS = {
+    User: 'users',
+    Equipment: 'equipments',
+    Project: 'projects',
+    Incident: 'incidents',
+    Inventory: 'inventory',
+    OperationRecord: 'operation_records',
+    MaintenanceRecord: 'maintenance_records',
+}
+
+COUNTER_FIELDS = (
+    'users',
+    'project_managers',
+    'safety_officers',
+    'inventory_managers',
+    'accounts_managers',
+    'equipment_managers',
+    'equipments',
+    'projects',
+    'incidents',
+    'inventory',
+    'operation_records',
+    'maintenance_records',
+)
+
+
+def live_counts():
+    """Count everything straight from the source tables."""
+    counts = User.objects.aggregate(
+        users=Count('id'),
+        **{field: Count('id', filter=Q(role=role)) for role, field in ROLE_COUNTERS.items()}
+    )
+    for model, field in MODEL_COUNTERS.items():
+        if model is not User:
+            counts[field] = model.objects.count()
+    return counts
+
+
+def rebuild():
+    """Recompute every counter from live counts and store them."""
+    counts = live_counts()
+    DashboardCounters.objects.update_or_create(pk=COUNTERS_PK, defaults=counts)
+    versions.bump(DashboardCounters)
+    return counts
+
+
+def get_counters():
+    row = DashboardCounters.objects.filter(pk=COUNTERS_PK).values(*COUNTER_FIELDS).first()
+    if row is None:
+        return rebuild()
+    return row
+
+
+def bump(**deltas):
+    """Apply relative changes, e.g. bump(users=1, safety_officers=1)."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = DashboardCounters.objects.filter(pk=COUNTERS_PK).update(
+        updated_at=now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        # First write ever: the live counts already include this change.
+        rebuild()
+    else:
+        versions.bump(DashboardCounters)
+    live.publish('counts', deltas)
+
+
+def check():
+    """Return {field: (stored, live)} for every counter that has drifted."""
+    stored = get_counters()
+    current = live_counts()
+    return {
+        field: (stored[field], current[field])
+        for field in COUNTER_FIELDS
+        if stored[field] != current[field]
+    }
@@ -0,0 +1,199 @@
+"""
+Idempotency-Key support for create endpoints.
+
+The first request with a given key (per user) claims it by inserting an
+IdempotencyKey row, runs, and stores its status code and body on that
+row. A retry with the same key gets the stored response back without the
+view running again. A retry that arrives while the first request is still
+running polls the row until the response is stored. Claims and stored
+responses expire (IDEMPOTENCY_LOCK_TIMEOUT / IDEMPOTENCY_KEY_TTL); expired
+rows are swept as new keys are claimed, or by purge_idempotency_keys.
+
+The view runs inside one database transaction that also stores the
+response, so its writes commit only together with the stored outcome. If
+the claim has expired and been taken over by a retry by then, the row is
+gone, and the transaction is rolled back instead: only one of the two
+requests ever commits. Server errors (5xx) roll back too and release the
+claim, so the client's retry runs the request again.
+"""
+
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+SWEEP_BATCH = 100
+
+
+class KeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still being processed; retry later."
+    default_code = 'idempotency_key_in_progress'
+
+
+class KeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = 'idempotency_key_reused'
+
+
+class KeyExpired(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "This request outlived its Idempotency-Key claim and was rolled back; "
+        "retry with the same key to get the outcome."
+    )
+    default_code = 'idempotency_key_expired'
+
+
+class _Replay(Exception):
+    def __init__(self, record):
+        self.record = record
+
+
+def _digest(*parts):
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else str(part).encode())
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+def sweep_expired(now=None, limit=SWEEP_BATCH):
+    """Delete up to ``limit`` expired keys; returns how many went."""
+    pks = list(
+        IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).values_list('pk', flat=True)[:limit]
+    )
+    if not pks:
+        return 0
+    return IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
+
+
+def claim(key, fingerprint):
+    """The new IdempotencyKey row if this request should run, or raise _Replay / KeyInProgress / KeyReused."""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while True:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+                )
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(key=key).first()
+        else:
+            sweep_expired(now)
+            return record
+
+        if existing is None:
+            continue  # expired and swept in the meantime
+        if existing.expires_at <= now:
+            # Stale: an old response past its TTL, or a claim whose request died.
+            IdempotencyKey.objects.filter(pk=existing.pk, expires_at=existing.expires_at).delete()
+            continue
+        if existing.fingerprint != fingerprint:
+            raise KeyReused()
+        if existing.status_code is not None:
+            raise _Replay(existing)
+        if time.monotonic() >= deadline:
+            raise KeyInProgress()
+        time.sleep(POLL_INTERVAL)
+
+
+def complete(record, response):
+    """Store ``response`` on the claim; False if the claim expired and another request took the key over."""
+    return IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True).update(
+        status_code=response.status_code,
+        response=getattr(response, 'data', None),
+        expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+    ) == 1
+
+
+def release(record):
+    IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True).delete()
+
+
+class IdempotencyMixin:
+    """APIView mixin honouring the Idempotency-Key header on POST.
+
+    The key is checked after authentication and permissions, so it is
+    scoped to the user and an unauthorised request never claims one.
+    """
+
+    idempotent_methods = ('POST',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._idempotency_record = self._idempotency_atomic = None
+        value = request.headers.get(HEADER)
+        if request.method not in self.idempotent_methods or value is None:
+            return
+        if not value or len(value) > MAX_KEY_LENGTH:
+            raise ValidationError({HEADER: f"Must be 1 to {MAX_KEY_LENGTH} characters."})
+        self._idempotency_record = claim(
+            _digest(request.user.pk, value),
+            _digest(request.method, request.get_full_path(), request.body),
+        )
+        # Committed by finalize_response together with the stored response.
+        self._idempotency_atomic = transaction.atomic()
+        self._idempotency_atomic.__enter__()
+
+    def _end_transaction(self, exc=None):
+        atomic, self._idempotency_atomic = self._idempotency_atomic, None
+        if exc is None:
+            atomic.__exit__(None, None, None)
+        else:
+            atomic.__exit__(type(exc), exc, exc.__traceback__)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            record = exc.record
+            return Response(record.response, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+        try:
+            return super().handle_exception(exc)
+        except Exception as error:
+            record = getattr(self, '_idempotency_record', None)
+            if record is not None:
+                self._idempotency_record = None
+                self._end_transaction(error)
+                release(record)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        record = getattr(self, '_idempotency_record', None)
+        if record is None:
+            return response
+        self._idempotency_record = None
+        if response.status_code >= 500:
+            transaction.set_rollback(True)
+            self._end_transaction()
+            release(record)
+            return response
+        try:
+            if not complete(record, response):
+                raise KeyExpired()
+        except Exception as exc:
+            self._end_transaction(exc)
+            if isinstance(exc, KeyExpired):
+                return self.finalize_response(request, self.handle_exception(exc), *args, **kwargs)
+            raise
+        try:
+            self._end_transaction()
+        except Exception:
+            release(record)
+            raise
+        return response
@@ -0,0 +1,187 @@
+"""
+Live dashboard updates pushed over Server-Sent Events.
+
+Writes publish small messages (counter deltas, new activity items,
+inventory status changes) through a broadcaster; each open
+``/api/dashboard/live/`` stream forwards them to its client.
+
+``DASHBOARD_LIVE_BACKEND`` selects the broadcaster. The default
+InProcessBroadcaster only reaches clients connected to the same process;
+use RedisBroadcaster (or any class with the same interface) when the app
+runs in several processes or on several nodes.
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription(abc.ABC):
+    @abc.abstractmethod
+    async def get(self, timeout):
+        """Next message, or None if nothing arrived within ``timeout`` seconds."""
+
+    async def close(self):
+        pass
+
+
+class Broadcaster(abc.ABC):
+    @abc.abstractmethod
+    def publish(self, message):
+        """Send ``message`` (a JSON-serializable dict) to every subscriber. Called from sync code."""
+
+    @abc.abstractmethod
+    async def subscribe(self):
+        """A new Subscription to the messages published from now on."""
+
+
+class _QueueSubscription(Subscription):
+    def __init__(self, broadcaster, loop, queue):
+        self.broadcaster = broadcaster
+        self.loop = loop
+        self.queue = queue
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broadcaster._remove(self)
+
+
+class InProcessBroadcaster(Broadcaster):
+    """Fans messages out to asyncio queues in this process only."""
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription.queue, message)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down.
+                self._remove(subscription)
+
+    @staticmethod
+    def _offer(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow client: drop its backlog and ask it to refetch everything.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": "resync", "data": {}})
+
+    async def subscribe(self):
+        subscription = _QueueSubscription(self, asyncio.get_running_loop(), asyncio.Queue(self.max_queue))
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def _remove(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class _RedisSubscription(Subscription):
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message['data'])
+
+    async def close(self):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroadcaster(Broadcaster):
+    """Relays messages through Redis pub/sub so every process and node sees them."""
+
+    def __init__(self, url='redis://localhost:6379/0', channel='abv:dashboard'):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroadcaster requires the 'redis' package.")
+        self.redis = redis
+        self.url = url
+        self.channel = channel
+        self._publisher = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        self._publisher.publish(self.channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    async def subscribe(self):
+        client = self.redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel)
+        return _RedisSubscription(client, pubsub)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                backend = getattr(settings, 'DASHBOARD_LIVE_BACKEND', 'dashboard.live.InProcessBroadcaster')
+                options = getattr(settings, 'DASHBOARD_LIVE_OPTIONS', {})
+                _broadcaster = import_string(backend)(**options)
+    return _broadcaster
+
+
+def publish(kind, data):
+    """Queue a live update; it is only sent once the current transaction commits."""
+    message = {"type": kind, "data": data}
+
+    def send():
+        try:
+            get_broadcaster().publish(message)
+        except Exception:
+            logger.exception("Could not publish live dashboard update")
+
+    transaction.on_commit(send)
+
+
+def format_event(message):
+    data = json.dumps(message["data"], cls=DjangoJSONEncoder)
+    return f"event: {message['type']}\ndata: {data}\n\n"
+
+
+async def event_stream(subscription, heartbeat=15):
+    """Yield SSE frames for ``subscription``, with a comment line every ``heartbeat`` seconds."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            message = await subscription.get(timeout=heartbeat)
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(message)
+    finally:
+        await subscription.close()
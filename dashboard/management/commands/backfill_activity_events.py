@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.activity import backfill_activity_events
+
+
+class Command(BaseCommand):
+    help = "Rebuild the activity event log from existing projects, safety incidents and maintenance records."
+
+    def handle(self, *args, **options):
+        written = backfill_activity_events()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} activity event(s)."))
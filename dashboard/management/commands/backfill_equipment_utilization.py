@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.utilization import backfill_utilization
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-equipment day/week/month utilization rollups from scratch."
+
+    def handle(self, *args, **options):
+        buckets = backfill_utilization()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} equipment utilization bucket(s)."))
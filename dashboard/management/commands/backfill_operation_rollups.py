@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.rollups import backfill_operation_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily/monthly/yearly OperationRecord rollups from scratch."
+
+    def handle(self, *args, **options):
+        buckets = backfill_operation_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} operation rollup bucket(s)."))
@@ -0,0 +1,116 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncMonth, TruncYear
+
+from dashboard.rollups import maintenance_summary
+from equipment.models import Equipment
+from operations.models import MaintenanceRecord
+
+
+def legacy_maintenance_summary():
+    """The previous MaintenanceSummary: three GROUP BY scans, one per granularity."""
+    result = {}
+    for name, key, trunc in (('daily', 'day', TruncDay), ('monthly', 'month', TruncMonth), ('yearly', 'year', TruncYear)):
+        result[name] = list(
+            MaintenanceRecord.objects.annotate(**{key: trunc('performed_at')})
+            .values(key)
+            .annotate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(status='completed')),
+                pending=Count('id', filter=Q(status='pending'))
+            )
+            .order_by(key)
+        )
+    return result
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the single-pass MaintenanceSummary with the previous three-scan version. "
+        "Seed rows are written inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--equipment', type=int, default=200)
+        parser.add_argument('--days', type=int, default=5 * 365)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, options):
+        rng = random.Random(0)
+        start = date.today() - timedelta(days=options['days'])
+        fleet = Equipment.objects.bulk_create(
+            Equipment(
+                equipment_name=f"bench-{n}",
+                serial_number=f"bench-{n}",
+                equipment_type="bench",
+                purchase_date=start,
+                purchase_cost=0,
+                status="Available",
+            )
+            for n in range(options['equipment'])
+        )
+        equipment_ids = [equipment.id for equipment in fleet]
+
+        began = time.perf_counter()
+        remaining = options['rows']
+        while remaining:
+            size = min(remaining, options['batch_size'])
+            MaintenanceRecord.objects.bulk_create(
+                MaintenanceRecord(
+                    equipment_id=rng.choice(equipment_ids),
+                    description="bench",
+                    performed_at=start + timedelta(days=rng.randrange(options['days'])),
+                    status=rng.choice(('completed', 'pending')),
+                )
+                for _ in range(size)
+            )
+            remaining -= size
+        self.stdout.write(f"Seeded {options['rows']} rows in {time.perf_counter() - began:.1f}s")
+        self._sample_equipment = equipment_ids[0]
+
+    def _time(self, label, func):
+        timings = []
+        for _ in range(self.repeat):
+            began = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - began)
+        best = min(timings)
+        self.stdout.write(f"{label:<40} best {best * 1000:9.1f} ms")
+        return best
+
+    def _run(self, options):
+        self.repeat = options['repeat']
+        legacy = self._time("legacy (3 scans)", legacy_maintenance_summary)
+        single = self._time("single pass", maintenance_summary)
+        self._time(
+            "single pass, one equipment",
+            lambda: maintenance_summary(equipment=self._sample_equipment),
+        )
+        self._time(
+            "single pass, one equipment, last 90 days",
+            lambda: maintenance_summary(
+                equipment=self._sample_equipment,
+                start=date.today() - timedelta(days=90),
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Speed-up over legacy: {legacy / single:.2f}x"))
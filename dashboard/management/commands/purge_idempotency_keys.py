@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import idempotency
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key records."
+
+    def handle(self, *args, **options):
+        deleted = 0
+        while True:
+            swept = idempotency.sweep_expired(limit=1000)
+            if not swept:
+                break
+            deleted += swept
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the DashboardSummary counters from live counts, or check them for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only compare stored counters with live counts; fail if any differ.",
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = counters.check()
+            if drift:
+                for field, (stored, live) in drift.items():
+                    self.stderr.write(f"{field}: stored={stored} live={live}")
+                raise CommandError(f"{len(drift)} dashboard counter(s) out of sync.")
+            self.stdout.write(self.style.SUCCESS("Dashboard counters match live counts."))
+            return
+
+        totals = counters.rebuild()
+        for field, value in totals.items():
+            self.stdout.write(f"{field}: {value}")
+        self.stdout.write(self.style.SUCCESS("Dashboard counters rebuilt."))
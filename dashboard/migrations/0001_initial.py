@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('users', models.IntegerField(default=0)),
+                ('project_managers', models.IntegerField(default=0)),
+                ('safety_officers', models.IntegerField(default=0)),
+                ('inventory_managers', models.IntegerField(default=0)),
+                ('accounts_managers', models.IntegerField(default=0)),
+                ('equipment_managers', models.IntegerField(default=0)),
+                ('equipments', models.IntegerField(default=0)),
+                ('projects', models.IntegerField(default=0)),
+                ('incidents', models.IntegerField(default=0)),
+                ('inventory', models.IntegerField(default=0)),
+                ('operation_records', models.IntegerField(default=0)),
+                ('maintenance_records', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_operationrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('project', 'Project'), ('incident', 'Incident'), ('maintenance', 'Maintenance')], max_length=20)),
+                ('message', models.CharField(max_length=255)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['timestamp', 'id'], name='activity_timestamp_idx'), models.Index(fields=['type', 'timestamp', 'id'], name='activity_type_timestamp_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_idempotency_key'),
+        ('equipment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentUtilization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('bucket', models.DateField()),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('records', models.IntegerField(default=0)),
+                ('equipment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization', to='equipment.equipment')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['granularity', 'bucket'], name='utilization_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('equipment', 'granularity', 'bucket'), name='unique_equipment_utilization_bucket')],
+            },
+        ),
+    ]
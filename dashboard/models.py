@@ -1,3 +1,129 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
+
+class DashboardCounters(models.Model):
+    """Single-row counter store backing DashboardSummary (kept current by dashboard.signals)."""
+
+    users = models.IntegerField(default=0)
+    project_managers = models.IntegerField(default=0)
+    safety_officers = models.IntegerField(default=0)
+    inventory_managers = models.IntegerField(default=0)
+    accounts_managers = models.IntegerField(default=0)
+    equipment_managers = models.IntegerField(default=0)
+    equipments = models.IntegerField(default=0)
+    projects = models.IntegerField(default=0)
+    incidents = models.IntegerField(default=0)
+    inventory = models.IntegerField(default=0)
+    operation_records = models.IntegerField(default=0)
+    maintenance_records = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard counters ({self.updated_at})"
+
+
+class OperationRollup(models.Model):
+    """OperationRecord counts per day, month and year bucket (kept current by dashboard.signals)."""
+
+    GRANULARITY_CHOICES = (
+        ('day', 'Day'),
+        ('month', 'Month'),
+        ('year', 'Year'),
+    )
+
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES)
+    bucket = models.DateField()  # first day of the bucket
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'bucket'], name='unique_operation_rollup_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket}: {self.count}"
+
+
+
+class EquipmentUtilization(models.Model):
+    """OperationRecord hours per equipment per day, week and month bucket (kept current by dashboard.signals)."""
+
+    GRANULARITY_CHOICES = (
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    )
+
+    equipment = models.ForeignKey('equipment.Equipment', on_delete=models.CASCADE, related_name='utilization')
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES)
+    bucket = models.DateField()  # first day of the bucket; weeks start on Monday
+    hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    records = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['equipment', 'granularity', 'bucket'], name='unique_equipment_utilization_bucket'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket'], name='utilization_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_id} {self.granularity} {self.bucket}: {self.hours}h"
+
+class ActivityEvent(models.Model):
+    """Append-only log behind RecentActivityFeed (written by dashboard.signals)."""
+
+    TYPE_CHOICES = (
+        ('project', 'Project'),
+        ('incident', 'Incident'),
+        ('maintenance', 'Maintenance'),
+    )
+
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    message = models.CharField(max_length=255)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='activity_timestamp_idx'),
+            models.Index(fields=['type', 'timestamp', 'id'], name='activity_type_timestamp_idx'),
+        ]
+
+    def __str__(self):
+        return self.message
+
+
+class ModelVersion(models.Model):
+    """Write counter per model, used for ETag / Last-Modified headers (see dashboard.versions)."""
+
+    label = models.CharField(max_length=100, unique=True)  # e.g. "inventory.Inventory"
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
+
+
+class IdempotencyKey(models.Model):
+    """Outcome of a write sent with an Idempotency-Key header (see dashboard.idempotency)."""
+
+    key = models.CharField(max_length=64, unique=True)  # sha256 of user id + header value
+    fingerprint = models.CharField(max_length=64)  # sha256 of method, path and body
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # null while running
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.status_code or 'running'})"
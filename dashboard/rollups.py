@@ -0,0 +1,118 @@
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
+
+from operations.models import OperationRecord, MaintenanceRecord
+
+from .models import OperationRollup
+
+GRANULARITIES = ('day', 'month', 'year')
+
+_date_field = models.DateField()
+
+
+def as_date(value):
+    return _date_field.to_python(value)
+
+
+def bucket_start(granularity, day):
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def bucket_deltas(dates, sign=1):
+    """Map (granularity, bucket) -> change in count for the given record dates."""
+    deltas = Counter()
+    for day in dates:
+        day = as_date(day)
+        for granularity in GRANULARITIES:
+            deltas[(granularity, bucket_start(granularity, day))] += sign
+    return deltas
+
+
+def apply_operation_deltas(deltas):
+    for (granularity, bucket), delta in deltas.items():
+        if not delta:
+            continue
+        rows = OperationRollup.objects.filter(granularity=granularity, bucket=bucket)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                OperationRollup.objects.create(granularity=granularity, bucket=bucket, count=delta)
+        except IntegrityError:
+            # Another writer created the bucket first.
+            rows.update(count=F('count') + delta)
+
+
+def record_operations(dates, sign=1):
+    """Count OperationRecords added (sign=1) or removed (sign=-1) on the given dates."""
+    apply_operation_deltas(bucket_deltas(dates, sign))
+
+
+@transaction.atomic
+def backfill_operation_rollups():
+    """Rebuild every rollup bucket from one GROUP BY over OperationRecord.date."""
+    deltas = Counter()
+    per_day = OperationRecord.objects.values('date').annotate(count=Count('id')).order_by()
+    for row in per_day:
+        for granularity in GRANULARITIES:
+            deltas[(granularity, bucket_start(granularity, row['date']))] += row['count']
+
+    OperationRollup.objects.all().delete()
+    OperationRollup.objects.bulk_create(
+        OperationRollup(granularity=granularity, bucket=bucket, count=count)
+        for (granularity, bucket), count in deltas.items()
+    )
+    return len(deltas)
+
+
+def operation_series(granularity, start=None, end=None):
+    rows = OperationRollup.objects.filter(granularity=granularity, count__gt=0)
+    if start:
+        rows = rows.filter(bucket__gte=bucket_start(granularity, start))
+    if end:
+        rows = rows.filter(bucket__lte=end)
+    return [
+        {granularity: bucket, 'count': count}
+        for bucket, count in rows.order_by('bucket').values_list('bucket', 'count')
+    ]
+
+
+def maintenance_summary(equipment=None, status=None, start=None, end=None):
+    """Daily/monthly/yearly MaintenanceRecord counts from a single GROUP BY performed_at.
+
+    Months and years are summed in memory from the daily rows.
+    """
+    records = MaintenanceRecord.objects.all()
+    if equipment is not None:
+        records = records.filter(equipment_id=equipment)
+    if start:
+        records = records.filter(performed_at__gte=start)
+    if end:
+        records = records.filter(performed_at__lte=end)
+    if status:
+        records = records.filter(status=status)
+
+    daily = records.values('performed_at').annotate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        pending=Count('id', filter=Q(status='pending'))
+    ).order_by('performed_at')
+
+    series = {granularity: {} for granularity in GRANULARITIES}
+    for row in daily:
+        for granularity in GRANULARITIES:
+            bucket = bucket_start(granularity, row['performed_at'])
+            totals = series[granularity].setdefault(bucket, {'total': 0, 'completed': 0, 'pending': 0})
+            for key in totals:
+                totals[key] += row[key]
+
+    return {
+        name: [{granularity: bucket, **totals} for bucket, totals in series[granularity].items()]
+        for name, granularity in (('daily', 'day'), ('monthly', 'month'), ('yearly', 'year'))
+    }
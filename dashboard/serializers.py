@@ -1,7 +1,39 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from transaction.models import Transaction
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'item': ('inventory.serializers.InventorySerializer', {}),
+        'user': ('users.serializers.UserSerializer', {}),
+    }
+
     class Meta:
         model = Transaction
         fields = '__all__'
+
+
+def money():
+    # Money leaves as a string; DRF's JSON encoder would turn a bare Decimal into a float.
+    return serializers.DecimalField(max_digits=None, decimal_places=2, read_only=True)
+
+
+class FinanceTotalsSerializer(serializers.Serializer):
+    revenue = money()
+    expenses = money()
+    profit = money()
+
+
+class FinanceMonthSerializer(serializers.Serializer):
+    month = serializers.DateField(read_only=True)
+    closed = serializers.BooleanField(read_only=True)
+    revenue = money()
+    expenses = money()
+    profit = money()
+
+
+class FinanceActivitySerializer(serializers.Serializer):
+    activity = serializers.CharField(read_only=True)
+    revenue = money()
+    expenses = money()
+    profit = money()
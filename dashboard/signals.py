@@ -0,0 +1,192 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from category.models import UserCategory
+from equipment.models import Equipment
+from finance.models import FinanceRecord
+from incidents.models import Incident
+from inventory.models import Inventory
+from operations.models import OperationRecord, MaintenanceRecord
+from projects.models import Project
+from safety.models import SafetyIncident
+from transaction.models import InventorySnapshot, Transaction
+
+from . import activity, counters, live, rollups, utilization, versions
+from .models import ActivityEvent
+
+User = counters.User
+
+
+def _counter_deltas(sender, instance, sign):
+    deltas = {counters.MODEL_COUNTERS[sender]: sign}
+    if sender is User:
+        role_field = counters.ROLE_COUNTERS.get(instance.role)
+        if role_field:
+            deltas[role_field] = sign
+    return deltas
+
+
+@receiver(pre_save, sender=User)
+def remember_user_role(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Role changes move a user between counters, so keep the stored role around.
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'role' not in update_fields:
+        return
+    instance._dashboard_previous_role = (
+        sender.objects.filter(pk=instance.pk).values_list('role', flat=True).first()
+    )
+
+
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.bump(**_counter_deltas(sender, instance, 1))
+        return
+    if sender is not User or not hasattr(instance, '_dashboard_previous_role'):
+        return
+    previous = counters.ROLE_COUNTERS.get(instance.__dict__.pop('_dashboard_previous_role'))
+    current = counters.ROLE_COUNTERS.get(instance.role)
+    if previous != current:
+        deltas = {}
+        if previous:
+            deltas[previous] = -1
+        if current:
+            deltas[current] = 1
+        counters.bump(**deltas)
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    counters.bump(**_counter_deltas(sender, instance, -1))
+
+
+for model in counters.MODEL_COUNTERS:
+    post_save.connect(update_counters_on_save, sender=model, dispatch_uid=f'dashboard-counters-save-{model._meta.label}')
+    post_delete.connect(update_counters_on_delete, sender=model, dispatch_uid=f'dashboard-counters-delete-{model._meta.label}')
+
+
+@receiver(pre_save, sender=OperationRecord)
+def remember_operation_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {'date', 'equipment', 'hours_used'} & set(update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('equipment_id', 'date', 'hours_used').first()
+    if previous is not None:
+        instance._rollup_previous_date = previous[1]
+        instance._utilization_previous = previous
+
+
+@receiver(post_save, sender=OperationRecord)
+def update_operation_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        rollups.record_operations([instance.date])
+        utilization.record_operations([(instance.equipment_id, instance.date, instance.hours_used)])
+        return
+    previous_usage = instance.__dict__.pop('_utilization_previous', None)
+    current_usage = (
+        instance.equipment_id, utilization.as_date(instance.date), utilization.as_hours(instance.hours_used)
+    )
+    if previous_usage and previous_usage != current_usage:
+        usage = utilization.bucket_deltas([previous_usage], -1)
+        for key, (hours, records) in utilization.bucket_deltas([current_usage]).items():
+            usage[key][0] += hours
+            usage[key][1] += records
+        utilization.apply_deltas(usage)
+
+    previous = instance.__dict__.pop('_rollup_previous_date', None)
+    current = rollups.as_date(instance.date)
+    if previous and previous != current:
+        deltas = rollups.bucket_deltas([previous], -1)
+        deltas.update(rollups.bucket_deltas([current]))
+        rollups.apply_operation_deltas(deltas)
+
+
+@receiver(post_delete, sender=OperationRecord)
+def update_operation_rollups_on_delete(sender, instance, **kwargs):
+    rollups.record_operations([instance.date], -1)
+    utilization.record_operations([(instance.equipment_id, instance.date, instance.hours_used)], -1)
+
+
+def _log_activity(build_event):
+    def receiver(sender, instance, created, raw=False, **kwargs):
+        if created and not raw:
+            event = build_event(instance)
+            event.save()
+            live.publish('activity', {
+                "type": event.type,
+                "message": event.message,
+                "timestamp": event.timestamp,
+            })
+    return receiver
+
+
+post_save.connect(_log_activity(activity.project_event), sender=Project, weak=False, dispatch_uid='dashboard-activity-project')
+post_save.connect(_log_activity(activity.incident_event), sender=SafetyIncident, weak=False, dispatch_uid='dashboard-activity-incident')
+post_save.connect(_log_activity(activity.maintenance_event), sender=MaintenanceRecord, weak=False, dispatch_uid='dashboard-activity-maintenance')
+
+
+@receiver(pre_save, sender=Inventory)
+def remember_inventory_status(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    instance._live_previous_status = (
+        sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Inventory)
+def inventory_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_live_previous_status', None)
+    if created or (previous is not None and previous != instance.status):
+        live.publish('inventory', {
+            "id": instance.pk,
+            "category": instance.category,
+            "status": instance.status,
+            "previous": previous,
+        })
+
+
+@receiver(post_delete, sender=Inventory)
+def inventory_deleted(sender, instance, **kwargs):
+    live.publish('inventory', {
+        "id": instance.pk,
+        "category": instance.category,
+        "status": None,
+        "previous": instance.status,
+    })
+
+
+# Models whose writes bump a version stamp for conditional GETs (dashboard.conditional).
+VERSIONED_MODELS = (
+    User,
+    Equipment,
+    Project,
+    Incident,
+    Inventory,
+    OperationRecord,
+    MaintenanceRecord,
+    SafetyIncident,
+    FinanceRecord,
+    Transaction,
+    InventorySnapshot,
+    UserCategory,
+    ActivityEvent,
+)
+
+
+def bump_model_version(sender, raw=False, **kwargs):
+    if not raw:
+        versions.bump(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=f'dashboard-version-save-{model._meta.label}')
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=f'dashboard-version-delete-{model._meta.label}')
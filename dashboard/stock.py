@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from inventory.models import Inventory
+
+from . import versions
+
+STATUS_CACHE_KEY = 'dashboard:inventory-status'
+
+
+def _empty_histogram():
+    return {status: 0 for status, _ in Inventory.STATUS_CHOICES}
+
+
+def compute_inventory_status():
+    """Status histogram and per-category totals from one GROUP BY status, category."""
+    statuses = _empty_histogram()
+    categories = {}
+    rows = Inventory.objects.values_list('status', 'category').annotate(count=Count('id')).order_by()
+    for status, category, count in rows:
+        statuses[status] = statuses.get(status, 0) + count
+        entry = categories.setdefault(category, {"category": category, "total": 0, "status": _empty_histogram()})
+        entry["total"] += count
+        entry["status"][status] = entry["status"].get(status, 0) + count
+
+    return {
+        "total": sum(statuses.values()),
+        "status": statuses,
+        "categories": [categories[name] for name in sorted(categories)],
+    }
+
+
+def inventory_status():
+    # Keyed on the Inventory version stamp, so writes made through any
+    # process (or through queryset updates that bump it) are seen at once.
+    version, _ = versions.current(Inventory)[Inventory._meta.label]
+    key = f'{STATUS_CACHE_KEY}:{version}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = compute_inventory_status()
+        cache.set(key, payload, getattr(settings, 'INVENTORY_STATUS_CACHE_TIMEOUT', 30))
+    return payload
@@ -1,3 +1,574 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from equipment.models import Equipment
+from finance.models import FinanceRecord
+from incidents.models import Incident
+from inventory.models import Inventory
+from inventory.views import InventoryListCreateView
+from operations.models import MaintenanceRecord, OperationRecord
+from projects.models import Project
+from safety.models import SafetyIncident
+from transaction.models import Transaction
+
+from . import activity, counters, idempotency, live, rollups, stock, utilization, versions
+from .auth import authenticate_jwt
+from .views import DashboardBatch
+from .models import ActivityEvent, DashboardCounters, EquipmentUtilization, IdempotencyKey, OperationRollup
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.machine = Equipment.objects.create(
+            equipment_name='Crane', serial_number='C-1', equipment_type='Crane', status='Available',
+            purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+        )
+        self.user = get_user_model().objects.create_user(
+            username='pm', email='pm@example.com', password='x', role='project_manager'
+        )
+        counters.rebuild()
+
+    def build(self):
+        # One fresh row per counted model.
+        return {
+            'users': lambda: get_user_model().objects.create_user(
+                username='new', email='new@example.com', password='x', role='safety_officer'
+            ),
+            'equipments': lambda: Equipment.objects.create(
+                equipment_name='Grader', serial_number='G-1', equipment_type='Grader', status='Available',
+                purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+            ),
+            'projects': lambda: Project.objects.create(
+                user=self.user, project_name='Road', location='South', start_date=date(2024, 1, 1),
+                end_date=date(2024, 6, 30), budget=Decimal(100), assigned_team='Kim',
+            ),
+            'incidents': lambda: Incident.objects.create(title='Spill', description='Oil', site='Yard'),
+            'inventory': lambda: Inventory.objects.create(item_name='Bolts', category='Parts', quantity=5, unit='Pieces'),
+            'operation_records': lambda: OperationRecord.objects.create(
+                equipment=self.machine, operator='Kim', date=date(2024, 1, 1), hours_used=Decimal(2),
+                activity='Lifting', status='completed',
+            ),
+            'maintenance_records': lambda: MaintenanceRecord.objects.create(
+                equipment=self.machine, description='Oil', performed_at=date(2024, 1, 2), status='completed'
+            ),
+        }
+
+    def test_create_and_delete_move_each_counter(self):
+        for field, create in self.build().items():
+            with self.subTest(field):
+                before = counters.get_counters()[field]
+                instance = create()
+                self.assertEqual(counters.get_counters()[field], before + 1)
+                instance.delete()
+                self.assertEqual(counters.get_counters()[field], before)
+                self.assertEqual(counters.check(), {})
+
+    def test_role_counters_follow_users(self):
+        self.build()['users']()
+        self.assertEqual(counters.get_counters()['safety_officers'], 1)
+        self.user.role = 'inventory_manager'
+        self.user.save()
+        stored = counters.get_counters()
+        self.assertEqual((stored['project_managers'], stored['inventory_managers']), (0, 1))
+        self.assertEqual(counters.check(), {})
+
+    def test_rebuild_matches_a_fresh_count(self):
+        for create in self.build().values():
+            create()
+        DashboardCounters.objects.update(equipments=99, users=0)
+        self.assertEqual(counters.check(), {'users': (0, 2), 'equipments': (99, 2)})
+        self.assertEqual(counters.rebuild(), counters.live_counts())
+        self.assertEqual(counters.check(), {})
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.machine = Equipment.objects.create(
+            equipment_name='Excavator', serial_number='E-1', equipment_type='Excavator', status='In Use',
+            purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+        )
+        self.record = OperationRecord.objects.create(
+            equipment=self.machine, operator='Kim', date=date(2024, 1, 31), hours_used=Decimal('3.25'),
+            activity='Digging', status='completed',
+        )
+
+    def counts(self):
+        rows = OperationRollup.objects.filter(count__gt=0)
+        return {
+            (granularity, bucket): count
+            for granularity, bucket, count in rows.values_list('granularity', 'bucket', 'count')
+        }
+
+    def hours(self):
+        rows = EquipmentUtilization.objects.exclude(hours=0, records=0)
+        return {
+            (granularity, bucket): (hours, records)
+            for granularity, bucket, hours, records in rows.values_list('granularity', 'bucket', 'hours', 'records')
+        }
+
+    def assertMatchesBackfill(self):
+        maintained = (self.counts(), self.hours())
+        rollups.backfill_operation_rollups()
+        utilization.backfill_utilization()
+        self.assertEqual((self.counts(), self.hours()), maintained)
+
+    def test_create_fills_every_bucket(self):
+        self.assertEqual(self.counts(), {
+            ('day', date(2024, 1, 31)): 1, ('month', date(2024, 1, 1)): 1, ('year', date(2024, 1, 1)): 1,
+        })
+        self.assertEqual(self.hours(), {
+            ('day', date(2024, 1, 31)): (Decimal('3.25'), 1),
+            ('week', date(2024, 1, 29)): (Decimal('3.25'), 1),
+            ('month', date(2024, 1, 1)): (Decimal('3.25'), 1),
+        })
+        self.assertMatchesBackfill()
+
+    def test_date_change_moves_the_record_to_the_new_buckets(self):
+        self.record.date = date(2024, 2, 1)
+        self.record.hours_used = Decimal('4.50')
+        self.record.save()
+        self.assertEqual(self.counts(), {
+            ('day', date(2024, 2, 1)): 1, ('month', date(2024, 2, 1)): 1, ('year', date(2024, 1, 1)): 1,
+        })
+        self.assertEqual(self.hours(), {
+            ('day', date(2024, 2, 1)): (Decimal('4.50'), 1),
+            ('week', date(2024, 1, 29)): (Decimal('4.50'), 1),
+            ('month', date(2024, 2, 1)): (Decimal('4.50'), 1),
+        })
+        self.assertMatchesBackfill()
+
+    def test_delete_empties_the_buckets(self):
+        OperationRecord.objects.create(
+            equipment=self.machine, operator='Kim', date=date(2024, 1, 30), hours_used=Decimal(1),
+            activity='Digging', status='completed',
+        )
+        self.record.delete()
+        self.assertEqual(self.counts(), {
+            ('day', date(2024, 1, 30)): 1, ('month', date(2024, 1, 1)): 1, ('year', date(2024, 1, 1)): 1,
+        })
+        self.assertEqual(self.hours()[('month', date(2024, 1, 1))], (Decimal('1.00'), 1))
+        self.assertMatchesBackfill()
+
+
+class InventoryStatusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='store', email='store@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for name, category, status in (
+            ('Bolts', 'Parts', 'good'), ('Nuts', 'Parts', 'critical'),
+            ('Diesel', 'Fuel', 'good'), ('Petrol', 'Fuel', 'good'),
+        ):
+            Inventory.objects.create(item_name=name, category=category, quantity=5, unit='Pieces', status=status)
+
+    def test_histogram_from_one_group_by(self):
+        with self.assertNumQueries(2):
+            payload = stock.inventory_status()
+        self.assertEqual(payload, {
+            "total": 4,
+            "status": {"good": 3, "average": 0, "critical": 1},
+            "categories": [
+                {"category": "Fuel", "total": 2, "status": {"good": 2, "average": 0, "critical": 0}},
+                {"category": "Parts", "total": 2, "status": {"good": 1, "average": 0, "critical": 1}},
+            ],
+        })
+        response = self.client.get(reverse('inventory-status'))
+        self.assertEqual((response.status_code, response.json()), (200, payload))
+
+    def test_cached_until_the_next_inventory_write(self):
+        first = stock.inventory_status()
+        with self.assertNumQueries(1):
+            self.assertEqual(stock.inventory_status(), first)
+
+        item = Inventory.objects.get(item_name='Nuts')
+        item.status = 'average'
+        item.save()
+        payload = stock.inventory_status()
+        self.assertEqual(payload["status"], {"good": 3, "average": 1, "critical": 0})
+
+        item.delete()
+        self.assertEqual(stock.inventory_status()["total"], 3)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='clerk', email='clerk@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_movements(self, count):
+        for n in range(count):
+            item = Inventory.objects.create(item_name=f'Item {n}', category='Parts', quantity=5, unit='Kg', user=self.user)
+            Transaction.objects.create(item=item, transaction_type='IN', quantity=1, user=self.user)
+
+    def get(self, **params):
+        cache.clear()
+        return self.client.get(reverse('transaction-list'), {'page_size': 100, **params})
+
+    def test_fields_trim_the_output(self):
+        self.add_movements(2)
+        response = self.get(fields='id,quantity')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([set(row) for row in response.json()['results']], [{'id', 'quantity'}] * 2)
+
+        response = self.get(fields='id,item.item_name', expand='item')
+        self.assertEqual(response.json()['results'][0]['item'], {'item_name': 'Item 1'})
+
+    def test_unknown_field_is_rejected(self):
+        for params in ({'fields': 'id,colour'}, {'expand': 'warehouse'}, {'fields': 'item.colour', 'expand': 'item'}):
+            with self.subTest(**params):
+                self.assertEqual(self.get(**params).status_code, 400)
+
+    def test_expand_costs_a_fixed_number_of_queries(self):
+        # Version stamps for the ETag, then one page query joining the expansions.
+        for count in (2, 10):
+            self.add_movements(count)
+            with self.assertNumQueries(2):
+                results = self.get(expand='item,item.user,user').json()['results']
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[0]['item']['user']['username'], 'clerk')
+
+
+class FinanceEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(username='cfo', email='cfo@example.com', password='x')
+        FinanceRecord.objects.create(type='revenue', amount=Decimal('10.50'), activity='Hauling')
+        FinanceRecord.objects.create(type='revenue', amount=Decimal('0.10'), activity='Hauling')
+        FinanceRecord.objects.create(type='expense', amount=Decimal('0.20'), activity='Fuel')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, name):
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_summary_amounts_are_exact_strings(self):
+        self.assertEqual(self.get('finance-summary'), {"revenue": "10.60", "expenses": "0.20", "profit": "10.40"})
+
+    def test_breakdowns_amounts_are_exact_strings(self):
+        [month] = self.get('finance-monthly')
+        self.assertEqual((month["revenue"], month["expenses"], month["profit"]), ("10.60", "0.20", "10.40"))
+        activities = {row["activity"]: row for row in self.get('finance-activities')}
+        self.assertEqual(activities["Fuel"]["profit"], "-0.20")
+        self.assertEqual(activities["Hauling"]["revenue"], "10.60")
+
+    def test_valuation_amounts_are_exact_strings(self):
+        for cost in ('1000.10', '999.95'):
+            Equipment.objects.create(
+                equipment_name=f'Loader {cost}', serial_number=cost, equipment_type='Loader', status='In Use',
+                purchase_date=date(2020, 1, 1), purchase_cost=Decimal(cost),
+            )
+        response = self.client.get(reverse('finance-valuation'), {'as_of': '2020-01-01'})
+        self.assertEqual(response.status_code, 200)
+        fleet = response.json()["fleet"]
+        self.assertEqual((fleet["purchase_cost"], fleet["book_value"]), ("2000.05", "2000.05"))
+
+
+class ActivityFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(username='feed', email='feed@example.com', password='x')
+        cls.machine = Equipment.objects.create(
+            equipment_name='Dozer', serial_number='D-1', equipment_type='Dozer', status='Available',
+            purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.older = MaintenanceRecord.objects.create(
+            equipment=self.machine, description='Oil', performed_at='2024-01-10', status='completed'
+        )
+        self.project = Project.objects.create(
+            user=self.admin, project_name='Quarry', location='North', start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31), budget=Decimal(5000), assigned_team='Kim',
+        )
+        self.newer = MaintenanceRecord.objects.create(
+            equipment=self.machine, description='Tracks', performed_at='2024-01-12', status='pending'
+        )
+        self.incident = SafetyIncident.objects.create(
+            incident_date=date(2024, 1, 11), description='Slip', actions_taken='Signage', incident_status='open'
+        )
+
+    def logged(self):
+        return list(ActivityEvent.objects.order_by('type', 'object_id').values_list('type', 'object_id', 'message', 'timestamp'))
+
+    def test_events_carry_their_record_timestamp(self):
+        response = self.client.get(reverse('recent-activity'))
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [event["message"] for event in results],
+            [
+                "Safety incident reported on 2024-01-11",
+                "New Project 'Quarry' created",
+                "Dozer maintenance pending",
+                "Dozer maintenance completed",
+            ],
+        )
+        self.assertEqual(results[2]["timestamp"], "2024-01-12T00:00:00Z")
+        self.assertEqual(ActivityEvent.objects.get(type='project').timestamp, self.project.created_at)
+
+    def test_backfill_rewrites_live_events_without_duplicates(self):
+        live_events = self.logged()
+        self.assertEqual(len(live_events), 4)
+        self.assertEqual(activity.backfill_activity_events(), 4)
+        self.assertEqual(self.logged(), live_events)
+
+
+class LiveStreamTests(TestCase):
+    def test_wsgi_request_is_refused_instead_of_hanging(self):
+        response = self.client.get(reverse('dashboard-live'))
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+    def test_stream_accepts_a_query_string_token(self):
+        user = get_user_model().objects.create_user(username='viewer', email='viewer@example.com', password='x')
+        request = RequestFactory().get('/', {'token': str(AccessToken.for_user(user))})
+        self.assertEqual(authenticate_jwt(request, allow_query_token=True), user)
+        self.assertIsNone(authenticate_jwt(request))
+
+    def test_broadcaster_must_implement_the_interface(self):
+        class Partial(live.Broadcaster):
+            def publish(self, message):
+                pass
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+
+class IdempotencyTestMixin:
+    body = json.dumps({"item_name": "Cement", "category": "Materials", "quantity": 5, "unit": "Bags"})
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='clerk', email='clerk@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('inventory-list-create')
+
+    def create(self, body=None, key='order-1'):
+        return self.client.post(
+            self.url, data=body or self.body, content_type='application/json', HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def claim(self, key='order-1', body=None):
+        """Claim ``key`` the way an in-flight request for ``body`` would have."""
+        return idempotency.claim(
+            idempotency._digest(self.user.pk, key),
+            idempotency._digest('POST', self.url, (body or self.body).encode()),
+        )
+
+
+class IdempotencyTests(IdempotencyTestMixin, TestCase):
+    def test_retry_replays_the_stored_response(self):
+        first = self.create()
+        self.assertEqual(first.status_code, 201)
+        retry = self.create()
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Inventory.objects.count(), 1)
+
+    def test_key_reused_with_a_different_body_is_rejected(self):
+        self.assertEqual(self.create().status_code, 201)
+        other = json.dumps({"item_name": "Sand", "category": "Materials", "quantity": 1, "unit": "Tonnes"})
+        self.assertEqual(self.create(other).status_code, 422)
+        self.assertEqual(Inventory.objects.count(), 1)
+
+    def test_each_key_runs_once(self):
+        self.assertEqual(self.create(key='order-1').status_code, 201)
+        self.assertEqual(self.create(key='order-2').status_code, 201)
+        self.assertEqual(Inventory.objects.count(), 2)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0.2)
+    def test_retry_gives_up_while_the_first_request_runs(self):
+        self.claim()
+        self.assertEqual(self.create().status_code, 409)
+        self.assertFalse(Inventory.objects.exists())
+
+    def test_request_whose_claim_was_taken_over_is_rolled_back(self):
+        original = InventoryListCreateView.perform_create
+
+        def outlive_claim(view, serializer):
+            original(view, serializer)
+            # The claim expired mid-request and a retry took the key over.
+            IdempotencyKey.objects.all().delete()
+            self.claim()
+
+        with mock.patch.object(InventoryListCreateView, 'perform_create', outlive_claim):
+            response = self.create()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['detail'].code, 'idempotency_key_expired')
+        self.assertFalse(Inventory.objects.exists())
+        self.assertIsNone(IdempotencyKey.objects.get().status_code)
+
+
+class IdempotencyWaitTests(IdempotencyTestMixin, TransactionTestCase):
+    def test_retry_waits_for_the_first_request(self):
+        record = self.claim()
+
+        def finish_first_request():
+            time.sleep(0.3)
+            try:
+                idempotency.complete(record, Response({"id": 99}, status=201))
+            finally:
+                close_old_connections()
+
+        first = threading.Thread(target=finish_first_request)
+        first.start()
+        retry = self.create()
+        first.join()
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), {"id": 99})
+        self.assertFalse(Inventory.objects.exists())
+
+
+class DashboardBatchTests(TransactionTestCase):
+    # Widgets are computed on pool threads, which only see committed rows.
+    widgets = ['summary', 'inventory', 'finance', 'transactions']
+
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(username='ops', email='ops@example.com', password='x')
+        self.token = str(AccessToken.for_user(self.admin))
+        Inventory.objects.create(item_name='Cement', category='Materials', quantity=5, unit='Bags', status='critical')
+        FinanceRecord.objects.create(type='revenue', amount=Decimal('12.34'), activity='Hauling')
+
+    def batch(self, query, **headers):
+        return self.client.get(f"{reverse('dashboard-batch')}?{query}", **headers)
+
+    def test_batch_matches_the_individual_widgets(self):
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+        response = self.batch(f"widgets={','.join(self.widgets)}", **auth)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["errors"], {})
+        for name in self.widgets:
+            single = self.client.get(reverse(DashboardBatch.widgets[name][0]), **auth)
+            self.assertEqual(single.status_code, 200, name)
+            self.assertEqual(body["widgets"][name], single.json(), name)
+
+    def test_unauthenticated_request_is_rejected(self):
+        self.assertEqual(self.batch('widgets=summary').status_code, 401)
+        self.assertEqual(self.batch('widgets=summary', HTTP_AUTHORIZATION='Bearer nonsense').status_code, 401)
+
+    def test_query_string_token_is_not_accepted(self):
+        self.assertEqual(self.batch(f'widgets=summary&token={self.token}').status_code, 401)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='viewer', email='viewer@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('inventory-status')
+        Inventory.objects.create(item_name='Cement', category='Materials', quantity=5, unit='Bags')
+
+    def test_matching_etag_is_not_modified(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+        self.assertFalse(again.content)
+
+    def test_write_changes_the_etag(self):
+        first = self.client.get(self.url)
+        Inventory.objects.create(item_name='Sand', category='Materials', quantity=1, unit='Tonnes')
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again['ETag'], first['ETag'])
+
+    def test_same_second_write_is_not_hidden_by_last_modified(self):
+        first = self.client.get(self.url)
+        with mock.patch('django.utils.timezone.now', return_value=versions.current(Inventory)[Inventory._meta.label][1]):
+            Inventory.objects.create(item_name='Sand', category='Materials', quantity=1, unit='Tonnes')
+        again = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again['Last-Modified'], first['Last-Modified'])
+
+
+class UtilizationTests(TestCase):
+    first_day = date(2023, 12, 1)
+    last_day = date(2024, 4, 30)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(username='fleet', email='fleet@example.com', password='x')
+        cls.busy = Equipment.objects.create(
+            equipment_name='Busy', serial_number='B-1', equipment_type='Loader', status='In Use',
+            purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+        )
+        cls.idle = Equipment.objects.create(
+            equipment_name='Idle', serial_number='I-1', equipment_type='Loader', status='Available',
+            purchase_date=date(2023, 1, 1), purchase_cost=Decimal(1000),
+        )
+        # One hour on every day, so any range's hours equal its number of days.
+        day = cls.first_day
+        while day <= cls.last_day:
+            OperationRecord.objects.create(
+                equipment=cls.busy, operator='Kim', date=day, hours_used=Decimal(1), activity='Hauling', status='completed'
+            )
+            day += timedelta(days=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def hours(self, start, end):
+        [busy] = [row for row in utilization.equipment_totals(start, end) if row["equipment"] == self.busy.pk]
+        return busy["hours"]
+
+    def months(self, start, end):
+        rows = EquipmentUtilization.objects.filter(utilization.range_buckets(start, end), equipment=self.busy)
+        return sorted(rows.filter(granularity='month').values_list('bucket', flat=True))
+
+    def test_range_within_one_month_uses_day_buckets(self):
+        self.assertEqual(self.months(date(2024, 1, 5), date(2024, 1, 20)), [])
+        self.assertEqual(self.hours(date(2024, 1, 5), date(2024, 1, 20)), 16)
+
+    def test_range_across_month_boundaries_is_tiled_exactly(self):
+        self.assertEqual(self.months(date(2023, 12, 15), date(2024, 3, 10)), [date(2024, 1, 1), date(2024, 2, 1)])
+        self.assertEqual(self.hours(date(2023, 12, 15), date(2024, 3, 10)), 17 + 31 + 29 + 10)
+        self.assertEqual(self.hours(date(2024, 1, 31), date(2024, 2, 1)), 2)
+
+    def test_leap_february(self):
+        self.assertEqual(self.months(date(2024, 2, 1), date(2024, 2, 29)), [date(2024, 2, 1)])
+        self.assertEqual(self.hours(date(2024, 2, 1), date(2024, 2, 29)), 29)
+        # Ending on the 28th of a leap February is not the whole month.
+        self.assertEqual(self.months(date(2024, 2, 1), date(2024, 2, 28)), [])
+        self.assertEqual(self.hours(date(2024, 2, 1), date(2024, 2, 28)), 28)
+
+    def test_idle_machine_shows_zero_hours(self):
+        response = self.client.get(reverse('equipment-utilization'), {'from': '2024-02-01', 'to': '2024-02-29'})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        machines = {row["equipment"]: row for row in body["equipment"]}
+        self.assertEqual((machines[self.idle.pk]["hours"], machines[self.idle.pk]["records"]), ("0.00", 0))
+        self.assertEqual(machines[self.idle.pk]["utilization"], 0.0)
+        self.assertEqual((machines[self.busy.pk]["hours"], machines[self.busy.pk]["available_hours"]), ("29.00", "232.00"))
+        self.assertEqual((body["fleet"]["hours"], body["fleet"]["percentiles"]["hours"]["p50"]), ("29.00", "14.50"))
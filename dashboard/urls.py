@@ -2,19 +2,31 @@ from django.urls import path
 from .views import DashboardSummary
 from .views import OperationalSummary
 from .views import MaintenanceSummary
+from .views import EquipmentUtilizationSummary
 from .views import RecentActivityFeed
 from .views import FinancialSummary
+from .views import FinancialMonthlyBreakdown
+from .views import FinancialActivityBreakdown
+from .views import EquipmentValuation
 from .views import InventoryStatus
 from .views import TransactionListView
+from .views import DashboardLiveStream
+from .views import DashboardBatch
 
 
 
 urlpatterns = [
     path('summary/', DashboardSummary.as_view(), name='dashboard-summary'),
     path('operations/summary/', OperationalSummary.as_view(), name='operations-summary'),
+    path('equipment/utilization/', EquipmentUtilizationSummary.as_view(), name='equipment-utilization'),
     path('maintenance/summary/', MaintenanceSummary.as_view(), name='maintenance-summary'),
     path('activity/recent/', RecentActivityFeed.as_view(), name='recent-activity'),
     path('finance/summary/', FinancialSummary.as_view(), name='finance-summary'),
+    path('finance/monthly/', FinancialMonthlyBreakdown.as_view(), name='finance-monthly'),
+    path('finance/activities/', FinancialActivityBreakdown.as_view(), name='finance-activities'),
+    path('finance/valuation/', EquipmentValuation.as_view(), name='finance-valuation'),
    path('inventory/status/', InventoryStatus.as_view(), name='inventory-status'),
    path('transactions/', TransactionListView.as_view(), name='transaction-list'),
+   path('live/', DashboardLiveStream.as_view(), name='dashboard-live'),
+   path('batch/', DashboardBatch.as_view(), name='dashboard-batch'),
           ]
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Equipment utilization from the EquipmentUtilization rollups.
+
+Every OperationRecord write moves its hours into the (equipment, day),
+(equipment, week) and (equipment, month) buckets, so reads never scan
+OperationRecord. A date range is answered from whole-month buckets where
+they fit and day buckets for the ragged ends, so a year across the fleet
+reads about 12 + 60 rows per machine rather than 365.
+
+Utilization is hours used over available hours, where a machine is
+available EQUIPMENT_AVAILABLE_HOURS_PER_DAY hours on every day of the
+range since its purchase date.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.constants import OnConflict
+
+from equipment.models import Equipment
+from operations.models import OperationRecord
+
+from . import versions
+from .models import EquipmentUtilization
+
+GRANULARITIES = ('day', 'week', 'month')
+PERCENTILES = (10, 25, 50, 75, 90, 95)
+HUNDREDTH = Decimal('0.01')
+
+_date_field = models.DateField()
+_hours_field = OperationRecord._meta.get_field('hours_used')
+
+
+def as_date(value):
+    return _date_field.to_python(value)
+
+
+def as_hours(value):
+    return (_hours_field.to_python(value) or Decimal(0)).quantize(HUNDREDTH)
+
+
+def bucket_start(granularity, day):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(granularity, bucket):
+    if granularity == 'day':
+        return bucket + timedelta(days=1)
+    if granularity == 'week':
+        return bucket + timedelta(days=7)
+    return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def available_hours_per_day():
+    return Decimal(str(getattr(settings, 'EQUIPMENT_AVAILABLE_HOURS_PER_DAY', 8)))
+
+
+def bucket_deltas(records, sign=1):
+    """Map (equipment_id, granularity, bucket) -> [hours, records] change for ``(equipment_id, date, hours)`` rows."""
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for equipment_id, day, hours in records:
+        day = as_date(day)
+        hours = as_hours(hours)
+        for granularity in GRANULARITIES:
+            delta = deltas[(equipment_id, granularity, bucket_start(granularity, day))]
+            delta[0] += sign * hours
+            delta[1] += sign
+    return deltas
+
+
+def apply_deltas(deltas):
+    """Add ``bucket_deltas`` to the stored buckets with two statements, whatever their number.
+
+    Missing buckets are inserted empty first (an insert racing another
+    writer's is ignored), then one executemany() UPDATE adds every delta.
+    """
+    changes = [
+        (equipment_id, granularity, bucket, hours, records)
+        for (equipment_id, granularity, bucket), (hours, records) in deltas.items()
+        if hours or records
+    ]
+    if not changes:
+        return
+    db = transaction.get_connection()
+    meta = EquipmentUtilization._meta
+    table = db.ops.quote_name(meta.db_table)
+    key_fields = [meta.get_field(name) for name in ('equipment', 'granularity', 'bucket')]
+    keys = ', '.join(db.ops.quote_name(field.column) for field in key_fields)
+    hours_column, records_column = (db.ops.quote_name(meta.get_field(name).column) for name in ('hours', 'records'))
+
+    insert = '%s %s (%s, %s, %s) VALUES (%%s, %%s, %%s, 0, 0) %s' % (
+        db.ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        table,
+        keys,
+        hours_column,
+        records_column,
+        db.ops.on_conflict_suffix_sql(key_fields, OnConflict.IGNORE, None, None),
+    )
+    update = 'UPDATE %s SET %s = %s + %%s, %s = %s + %%s WHERE %s' % (
+        table, hours_column, hours_column, records_column, records_column,
+        ' AND '.join('%s = %%s' % db.ops.quote_name(field.column) for field in key_fields),
+    )
+    rows = [
+        (equipment_id, granularity, db.ops.adapt_datefield_value(bucket), db.ops.adapt_decimalfield_value(delta), count)
+        for equipment_id, granularity, bucket, delta, count in changes
+    ]
+    with transaction.atomic(), db.cursor() as cursor:
+        cursor.executemany(insert, [row[:3] for row in rows])
+        cursor.executemany(update, [row[3:] + row[:3] for row in rows])
+
+
+def record_operations(records, sign=1):
+    """Count ``(equipment_id, date, hours)`` OperationRecords added (sign=1) or removed (sign=-1)."""
+    apply_deltas(bucket_deltas(records, sign))
+
+
+@transaction.atomic
+def backfill_utilization():
+    """Rebuild every bucket from one GROUP BY equipment, date over OperationRecord."""
+    totals = defaultdict(lambda: [Decimal(0), 0])
+    per_day = (
+        OperationRecord.objects
+        .values('equipment_id', 'date')
+        .annotate(hours=Sum('hours_used'), records=Count('id'))
+        .order_by()
+    )
+    for row in per_day.iterator(chunk_size=5000):
+        for granularity in GRANULARITIES:
+            total = totals[(row['equipment_id'], granularity, bucket_start(granularity, row['date']))]
+            total[0] += as_hours(row['hours'])
+            total[1] += row['records']
+
+    EquipmentUtilization.objects.all().delete()
+    EquipmentUtilization.objects.bulk_create(
+        (
+            EquipmentUtilization(
+                equipment_id=equipment_id, granularity=granularity, bucket=bucket, hours=hours, records=records
+            )
+            for (equipment_id, granularity, bucket), (hours, records) in totals.items()
+        ),
+        batch_size=1000,
+    )
+    versions.bump(EquipmentUtilization)
+    return len(totals)
+
+
+def range_buckets(start, end):
+    """Q matching the month and day buckets that exactly tile ``start``..``end`` (inclusive)."""
+    first_month = bucket_start('month', start)
+    if first_month != start:
+        first_month = next_bucket('month', first_month)
+    months = []
+    month = first_month
+    while next_bucket('month', month) <= end + timedelta(days=1):
+        months.append(month)
+        month = next_bucket('month', month)
+    if not months:
+        return Q(granularity='day', bucket__gte=start, bucket__lte=end)
+    return (
+        Q(granularity='month', bucket__in=months)
+        | Q(granularity='day', bucket__gte=start, bucket__lt=months[0])
+        | Q(granularity='day', bucket__gte=next_bucket('month', months[-1]), bucket__lte=end)
+    )
+
+
+def available_hours(purchase_date, start, end):
+    days = (end - max(start, purchase_date)).days + 1
+    return max(days, 0) * available_hours_per_day()
+
+
+def ratio(hours, available):
+    return float(hours / available) if available else None
+
+
+def equipment_totals(start, end, equipment=None):
+    """``[{equipment, equipment_name, equipment_type, purchase_date, hours, records, available_hours, utilization}]``.
+
+    Every machine purchased by ``end`` is listed, idle ones with zero hours.
+    """
+    rows = EquipmentUtilization.objects.filter(range_buckets(start, end))
+    machines = Equipment.objects.filter(purchase_date__lte=end)
+    if equipment is not None:
+        rows = rows.filter(equipment_id=equipment)
+        machines = machines.filter(pk=equipment)
+    used = {
+        row['equipment_id']: row
+        for row in rows.values('equipment_id').annotate(hours=Sum('hours'), records=Sum('records')).order_by()
+    }
+
+    totals = []
+    for pk, name, kind, purchased in machines.values_list(
+        'pk', 'equipment_name', 'equipment_type', 'purchase_date'
+    ).order_by('pk'):
+        row = used.get(pk, {})
+        hours = as_hours(row.get('hours'))
+        available = available_hours(purchased, start, end)
+        totals.append({
+            "equipment": pk,
+            "equipment_name": name,
+            "equipment_type": kind,
+            "purchase_date": purchased,
+            "hours": hours,
+            "records": row.get('records') or 0,
+            "available_hours": available,
+            "utilization": ratio(hours, available),
+        })
+    return totals
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return {f"p{q}": None for q in PERCENTILES}
+    return {f"p{q}": float(value) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def hours_percentiles(hours):
+    """Percentiles of Decimal ``hours`` as decimal strings, computed on exact hundredths."""
+    hundredths = np.asarray([int(value * 100) for value in hours], dtype=np.int64)
+    if not len(hundredths):
+        return {f"p{q}": None for q in PERCENTILES}
+    return {
+        f"p{q}": str((Decimal(str(value)) / 100).quantize(HUNDREDTH))
+        for q, value in zip(PERCENTILES, np.percentile(hundredths, PERCENTILES).tolist())
+    }
+
+
+def hours_as_strings(rows):
+    """Render the Decimal hours of ``rows`` (and their ``series``) as strings, like every decimal the API returns."""
+    for row in rows:
+        for key in ("hours", "available_hours"):
+            row[key] = str(as_hours(row[key]))
+        hours_as_strings(row.get("series", ()))
+    return rows
+
+
+def fleet_summary(totals):
+    """Fleet totals plus percentiles of per-machine hours and utilization."""
+    hours = sum((row["hours"] for row in totals), Decimal(0))
+    available = sum((row["available_hours"] for row in totals), Decimal(0))
+    return {
+        "equipment_count": len(totals),
+        "hours": hours,
+        "available_hours": available,
+        "utilization": ratio(hours, available),
+        "percentiles": {
+            "hours": hours_percentiles([row["hours"] for row in totals]),
+            "utilization": percentiles([row["utilization"] for row in totals if row["utilization"] is not None]),
+        },
+    }
+
+
+def add_series(totals, granularity, start, end):
+    """Attach each machine's ``granularity`` buckets overlapping ``start``..``end`` as ``series``.
+
+    Edge buckets are whole buckets, so a week or month may reach past the range.
+    """
+    by_machine = {row["equipment"]: row for row in totals}
+    for row in totals:
+        row["series"] = []
+    rows = EquipmentUtilization.objects.filter(
+        granularity=granularity,
+        bucket__gte=bucket_start(granularity, start),
+        bucket__lte=end,
+    )
+    if len(by_machine) == 1:
+        rows = rows.filter(equipment_id=next(iter(by_machine)))
+    for equipment_id, bucket, hours, records in (
+        rows.order_by('equipment_id', 'bucket').values_list('equipment_id', 'bucket', 'hours', 'records')
+    ):
+        machine = by_machine.get(equipment_id)
+        if machine is None:
+            continue
+        available = available_hours(machine["purchase_date"], bucket, next_bucket(granularity, bucket) - timedelta(days=1))
+        machine["series"].append({
+            granularity: bucket,
+            "hours": hours,
+            "records": records,
+            "available_hours": available,
+            "utilization": ratio(hours, available),
+        })
+    return totals
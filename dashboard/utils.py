@@ -0,0 +1,38 @@
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+
+def parse_date_param(query_params, name):
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Use the YYYY-MM-DD format."})
+
+
+def parse_date_range(query_params):
+    """Read the optional ?from= and ?to= dates (inclusive) from a request."""
+    start = parse_date_param(query_params, 'from')
+    end = parse_date_param(query_params, 'to')
+    if start and end and start > end:
+        raise ValidationError({'from': "'from' must not be after 'to'."})
+    return start, end
+
+
+def parse_moment_param(query_params, name):
+    """An aware datetime from ?name=; a bare date means the close of that day."""
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            return timezone.make_aware(datetime.combine(date.fromisoformat(value) + timedelta(days=1), time.min))
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Use YYYY-MM-DD or an ISO 8601 datetime."})
+    return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
@@ -0,0 +1,35 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ModelVersion
+
+
+def model_label(model):
+    return model if isinstance(model, str) else model._meta.label
+
+
+def bump(*models):
+    """Record a write to each model. Call after queryset-level writes that skip signals."""
+    stamp = timezone.now()
+    for model in models:
+        label = model_label(model)
+        rows = ModelVersion.objects.filter(label=label)
+        if rows.update(version=F('version') + 1, updated_at=stamp):
+            continue
+        try:
+            with transaction.atomic():
+                ModelVersion.objects.create(label=label, version=1, updated_at=stamp)
+        except IntegrityError:
+            rows.update(version=F('version') + 1, updated_at=stamp)
+
+
+def current(*models):
+    """{label: (version, updated_at)} for the given models in one query; unseen models are (0, None)."""
+    labels = [model_label(model) for model in models]
+    found = {
+        label: (version, updated_at)
+        for label, version, updated_at in ModelVersion.objects.filter(label__in=labels)
+        .values_list('label', 'version', 'updated_at')
+    }
+    return {label: found.get(label, (0, None)) for label in labels}
@@ -1,24 +1,38 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.urls import reverse
+from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.permissions import IsAdminUser
-from django.contrib.auth import get_user_model
 from equipment.models import Equipment
-from projects.models import Project
-from incidents.models import Incident
-from inventory.models import Inventory
-from django.db.models import Count, Q
-from django.utils.timezone import now
-from safety.models import SafetyIncident
-from finance.models import FinanceRecord
-from django.db.models import Count, Q, Sum
 from inventory.models import Inventory
+from django.utils.timezone import localdate, now
+from finance import ledger, valuation
+from finance.models import FinanceRecord, FinancePeriod
 from rest_framework.permissions import IsAuthenticated
 
 from rest_framework.generics import ListAPIView
 from transaction.models import Transaction
-from rest_framework.permissions import IsAuthenticated
-from .serializers import TransactionSerializer
+from .serializers import (
+    FinanceActivitySerializer, FinanceMonthSerializer, FinanceTotalsSerializer, TransactionSerializer,
+)
+from abv_management.pagination import KeysetPagination
+from abv_management.fieldsets import SparseFieldsetMixin
+from . import activity, batch, counters, live, rollups, stock, utilization
+from .auth import authenticate_jwt
+from .conditional import ConditionalGetMixin, DailyConditionalGetMixin
+from .models import ActivityEvent, DashboardCounters, EquipmentUtilization
+from .utils import parse_date_param, parse_date_range
+from datetime import timedelta
 
 
 
@@ -26,158 +40,313 @@ from .serializers import TransactionSerializer
 
 
 from operations.models import OperationRecord, MaintenanceRecord
-from django.db.models.functions import TruncDay, TruncMonth, TruncYear
 
 
-User = get_user_model()
+class DashboardSummary(ConditionalGetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    conditional_models = [DashboardCounters]
 
-class DashboardSummary(APIView):
+    def get(self, request):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        # Served from the maintained counter row (see dashboard.counters / dashboard.signals).
+        return counters.get_counters()
+class OperationalSummary(ConditionalGetMixin, APIView):
     permission_classes = [IsAdminUser]
+    conditional_models = [OperationRecord]
 
     def get(self, request):
-        return Response({
-            "users": User.objects.count(),
-            "project_managers": User.objects.filter(role='project_manager').count(),
-            "safety_officers": User.objects.filter(role='safety_officer').count(),
-            "inventory_managers": User.objects.filter(role='inventory_manager').count(),
-            "accounts_managers": User.objects.filter(role='accounts_manager').count(),
-            "equipment_managers": User.objects.filter(role='equipment_manager').count(),
-            "equipments": Equipment.objects.count(),
-            "projects": Project.objects.count(),
-            "incidents": Incident.objects.count(),
-            "inventory": Inventory.objects.count(),
-            "operation_records": OperationRecord.objects.count(),
-            "maintenance_records": MaintenanceRecord.objects.count()
-        })
-class OperationalSummary(APIView):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        # Read from the incrementally maintained rollups (see dashboard.rollups).
+        start, end = parse_date_range(request.query_params)
+
+        return {
+            "daily": rollups.operation_series('day', start, end),
+            "monthly": rollups.operation_series('month', start, end),
+            "yearly": rollups.operation_series('year', start, end)
+        }
+class EquipmentUtilizationSummary(DailyConditionalGetMixin, APIView):
+    """Hours used against available hours per machine, plus fleet percentiles.
+
+    ?from=&to= (default: the last 30 days), ?equipment=<id> for one machine,
+    and ?granularity=day|week|month to add each machine's bucket series.
+    """
+
     permission_classes = [IsAdminUser]
+    conditional_models = [OperationRecord, EquipmentUtilization, Equipment]
+    default_days = 30
 
     def get(self, request):
-        daily = OperationRecord.objects.annotate(day=TruncDay('date')) \
-            .values('day') \
-            .annotate(count=Count('id')) \
-            .order_by('day')
-
-        monthly = OperationRecord.objects.annotate(month=TruncMonth('date')) \
-            .values('month') \
-            .annotate(count=Count('id')) \
-            .order_by('month')
-
-        yearly = OperationRecord.objects.annotate(year=TruncYear('date')) \
-            .values('year') \
-            .annotate(count=Count('id')) \
-            .order_by('year')
-
-        return Response({
-            "daily": list(daily),
-            "monthly": list(monthly),
-            "yearly": list(yearly)
-        })
-class MaintenanceSummary(APIView):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        # Read from the incrementally maintained rollups (see dashboard.utilization).
+        start, end = parse_date_range(request.query_params)
+        end = end or now().date()
+        start = start or end - timedelta(days=self.default_days - 1)
+        if start > end:
+            raise ValidationError({'from': "'from' must not be after 'to'."})
+
+        granularity = request.query_params.get('granularity')
+        if granularity is not None and granularity not in utilization.GRANULARITIES:
+            raise ValidationError({"granularity": f"Must be one of: {', '.join(utilization.GRANULARITIES)}."})
+        equipment = request.query_params.get('equipment')
+        if equipment is not None and not equipment.isdigit():
+            raise ValidationError({"equipment": "Must be an equipment id."})
+
+        totals = utilization.equipment_totals(start, end, equipment=equipment and int(equipment))
+        fleet = utilization.fleet_summary(totals)
+        if granularity:
+            utilization.add_series(totals, granularity, start, end)
+        totals.sort(key=lambda row: (-(row["utilization"] or 0), row["equipment"]))
+        for row in totals:
+            del row["purchase_date"]
+
+        return {
+            "from": start,
+            "to": end,
+            "available_hours_per_day": str(utilization.as_hours(utilization.available_hours_per_day())),
+            "fleet": utilization.hours_as_strings([fleet])[0],
+            "equipment": utilization.hours_as_strings(totals),
+        }
+
+
+class MaintenanceSummary(ConditionalGetMixin, APIView):
     permission_classes = [IsAdminUser]
+    conditional_models = [MaintenanceRecord]
 
     def get(self, request):
-        daily = MaintenanceRecord.objects.annotate(day=TruncDay('performed_at')) \
-            .values('day') \
-            .annotate(
-                total=Count('id'),
-                completed=Count('id', filter=Q(status='completed')),
-                pending=Count('id', filter=Q(status='pending'))
-            ) \
-            .order_by('day')
-
-        monthly = MaintenanceRecord.objects.annotate(month=TruncMonth('performed_at')) \
-            .values('month') \
-            .annotate(
-                total=Count('id'),
-                completed=Count('id', filter=Q(status='completed')),
-                pending=Count('id', filter=Q(status='pending'))
-            ) \
-            .order_by('month')
-
-        yearly = MaintenanceRecord.objects.annotate(year=TruncYear('performed_at')) \
-            .values('year') \
-            .annotate(
-                total=Count('id'),
-                completed=Count('id', filter=Q(status='completed')),
-                pending=Count('id', filter=Q(status='pending'))
-            ) \
-            .order_by('year')
-
-        return Response({
-            "daily": list(daily),
-            "monthly": list(monthly),
-            "yearly": list(yearly)
-        })
-        
-class RecentActivityFeed(APIView):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        start, end = parse_date_range(request.query_params)
+        equipment = request.query_params.get('equipment')
+        if equipment is not None and not equipment.isdigit():
+            raise ValidationError({"equipment": "Must be an equipment id."})
+
+        return rollups.maintenance_summary(
+            equipment=int(equipment) if equipment is not None else None,
+            status=request.query_params.get('status'),
+            start=start,
+            end=end,
+        )
+
+class RecentActivityFeed(ConditionalGetMixin, APIView):
     permission_classes = [IsAdminUser]
+    conditional_models = [ActivityEvent]
 
     def get(self, request):
-        activities = []
-
-        # Recent Projects
-        recent_projects = Project.objects.order_by('-created_at')[:5]
-        for project in recent_projects:
-            activities.append({
-                "type": "project",
-                "message": f"New Project '{project.name}' created",
-                "timestamp": project.created_at
-            })
-
-        # Recent Safety Incidents
-        recent_incidents = SafetyIncident.objects.order_by('created_at')[:5]
-        for incident in recent_incidents:
-            activities.append({
-                "type": "incident",
-                "message": f"Safety incident report for '{incident.location}'",
-                "timestamp": incident.created_at
-            })
-
-        # Recent Maintenance
-        recent_maintenance = MaintenanceRecord.objects.order_by('-performed_at')[:5]
-        for record in recent_maintenance:
-            activities.append({
-                "type": "maintenance",
-                "message": f"{record.equipment.name} maintenance completed",
-                "timestamp": record.performed_at
-            })
-
-        # Sort all activities by timestamp descending
-        activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        return Response(activities)  # ✅ This line is critical
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        # Keyset pages over the ActivityEvent log: ?before=<cursor>&limit=15&type=project,maintenance
+        types = [t for t in request.query_params.get('type', '').split(',') if t]
+        unknown = set(types) - activity.EVENT_TYPES
+        if unknown:
+            raise ValidationError({"type": f"Unknown activity type(s): {', '.join(sorted(unknown))}."})
+
+        events = ActivityEvent.objects.all()
+        if types:
+            events = events.filter(type__in=types)
+        paginator = activity.ActivityFeedPagination()
+        page = paginator.paginate_queryset(events, request, view=self)
+
+        return paginator.get_paginated_response([
+            {
+                "type": event.type,
+                "message": event.message,
+                "timestamp": event.timestamp
+            }
+            for event in page
+        ]).data
     
-class FinancialSummary(APIView):
+class FinancialSummary(ConditionalGetMixin, APIView):
     permission_classes = [IsAdminUser]
+    conditional_models = [FinanceRecord, FinancePeriod]
 
     def get(self, request):
-        revenue = FinanceRecord.objects.filter(type='revenue').aggregate(total=Sum('amount'))['total'] or 0
-        expenses = FinanceRecord.objects.filter(type='expense').aggregate(total=Sum('amount'))['total'] or 0
-        profit = revenue - expenses
-
-        return Response({
-            "revenue": revenue,
-            "expenses": expenses,
-            "profit": profit
-        })
-        
-class InventoryStatus(APIView):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        # Closed FinancePeriod totals plus the still-open month(s); see finance.ledger.
+        return FinanceTotalsSerializer(ledger.summary()).data
+
+
+class FinancialMonthlyBreakdown(ConditionalGetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    conditional_models = [FinanceRecord, FinancePeriod]
+
+    def get(self, request):
+        start, end = parse_date_range(request.query_params)
+        return Response(FinanceMonthSerializer(ledger.monthly_breakdown(start, end), many=True).data)
+
+
+class FinancialActivityBreakdown(ConditionalGetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    conditional_models = [FinanceRecord, FinancePeriod]
+
+    def get(self, request):
+        return Response(FinanceActivitySerializer(ledger.activity_breakdown(), many=True).data)
+
+
+class EquipmentValuation(DailyConditionalGetMixin, APIView):
+    """Fleet book value: ?method=straight_line|declining_balance&as_of=YYYY-MM-DD
+
+    ?useful_life= (years) and ?salvage_rate= (0-1) override the settings,
+    ?group_by= picks the grouping (equipment_type and/or status, default
+    both) and ?assets=1 adds the per-asset rows. See finance.valuation.
+    """
+
+    permission_classes = [IsAdminUser]
+    conditional_models = [Equipment]
+
+    def get_number(self, request, name, default, low, high):
+        raw = request.query_params.get(name)
+        if raw is None:
+            return default
+        try:
+            value = float(raw)
+        except ValueError:
+            value = None
+        if value is None or not low <= value <= high:
+            raise ValidationError({name: f"Must be a number from {low} to {high}."})
+        return value
+
+    def get(self, request):
+        return Response(self.get_payload(request))
+
+    def get_payload(self, request):
+        params = request.query_params
+        method = params.get('method', 'straight_line')
+        if method not in valuation.METHODS:
+            raise ValidationError({"method": f"Must be one of: {', '.join(valuation.METHODS)}."})
+        group_by = [field for field in params.get('group_by', ','.join(valuation.GROUP_FIELDS)).split(',') if field]
+        unknown = sorted(set(group_by) - set(valuation.GROUP_FIELDS))
+        if unknown or len(set(group_by)) != len(group_by):
+            raise ValidationError({"group_by": f"Use any of: {', '.join(valuation.GROUP_FIELDS)}."})
+
+        defaults = valuation.defaults()
+        return valuation.fleet_valuation(
+            as_of=parse_date_param(params, 'as_of') or localdate(),
+            method=method,
+            useful_life=self.get_number(request, 'useful_life', defaults["useful_life"], 0.1, 100),
+            salvage_rate=self.get_number(request, 'salvage_rate', defaults["salvage_rate"], 0, 1),
+            factor=defaults["factor"],
+            group_by=group_by,
+            assets=params.get('assets') in ('1', 'true', 'yes'),
+        )
+
+
+class InventoryStatus(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
+    conditional_models = [Inventory]
 
     def get(self, request):
-        total = Inventory.objects.count()
-        status_counts = {
-            "good": Inventory.objects.filter(status='good').count(),
-            "average": Inventory.objects.filter(status='average').count(),
-            "critical": Inventory.objects.filter(status='critical').count(),
-        }
+        return Response(self.get_payload(request))
 
-        return Response({
-            "total": total,
-            "status": status_counts
-        })
+    def get_payload(self, request):
+        # One GROUP BY status, category, cached until the next Inventory write.
+        return stock.inventory_status()
         
-class TransactionListView(ListAPIView):
+class TransactionListView(SparseFieldsetMixin, ConditionalGetMixin, ListAPIView):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering_field = 'timestamp'
+    conditional_models = [Transaction]
+
+    def get_payload(self, request):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data).data
+
+
+class DashboardLiveStream(View):
+    """Server-Sent Events stream of dashboard changes (needs an ASGI server).
+
+    Authenticates with a JWT in the Authorization header or ``?token=``.
+    Under WSGI the stream would hold a worker forever, so it answers 501.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({"detail": "The live stream needs an ASGI server."}, status=501)
+        user = await sync_to_async(authenticate_jwt)(request, allow_query_token=True)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        if not user.is_staff:
+            return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+        subscription = await live.get_broadcaster().subscribe()
+        response = StreamingHttpResponse(
+            live.event_stream(subscription, getattr(settings, 'DASHBOARD_LIVE_HEARTBEAT', 15)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class DashboardBatch(View):
+    """Several dashboard widgets in one request: ?widgets=summary,inventory&timing=1
+
+    The JWT, from the Authorization header only, is checked once; the
+    widgets are then computed concurrently on a bounded thread pool. Query
+    parameters apply to every widget, and ``<widget>.<param>`` overrides
+    them for one widget (e.g. ``operations.from``).
+    """
+
+    widgets = {
+        'summary': ('dashboard-summary', DashboardSummary),
+        'operations': ('operations-summary', OperationalSummary),
+        'maintenance': ('maintenance-summary', MaintenanceSummary),
+        'utilization': ('equipment-utilization', EquipmentUtilizationSummary),
+        'activity': ('recent-activity', RecentActivityFeed),
+        'finance': ('finance-summary', FinancialSummary),
+        'valuation': ('finance-valuation', EquipmentValuation),
+        'inventory': ('inventory-status', InventoryStatus),
+        'transactions': ('transaction-list', TransactionListView),
+    }
+
+    async def get(self, request):
+        started = time.perf_counter()
+        requested = [w for w in request.GET.get('widgets', '').split(',') if w] or list(self.widgets)
+        unknown = sorted(set(requested) - set(self.widgets))
+        if unknown:
+            return JsonResponse({"widgets": f"Unknown widget(s): {', '.join(unknown)}."}, status=400)
+
+        user = await sync_to_async(authenticate_jwt)(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+        loop = asyncio.get_running_loop()
+        executor = batch.get_executor()
+        names = list(dict.fromkeys(requested))
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor,
+                batch.run_widget,
+                self.widgets[name][1],
+                reverse(self.widgets[name][0]),
+                request,
+                user,
+                batch.widget_params(request.GET, name),
+            )
+            for name in names
+        ))
+
+        body = {"widgets": {}, "errors": {}}
+        timing = {}
+        for name, (status, payload, elapsed) in zip(names, results):
+            if status == 200:
+                body["widgets"][name] = payload
+            else:
+                body["errors"][name] = {"status": status, **payload}
+            timing[name] = round(elapsed, 2)
+        if request.GET.get('timing') in ('1', 'true', 'yes'):
+            timing["total"] = round((time.perf_counter() - started) * 1000, 2)
+            body["timing"] = timing
+        return JsonResponse(body, encoder=JSONEncoder)
@@ -0,0 +1,70 @@
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from dashboard.utils import parse_date_param
+
+
+def split_param(query_params, name):
+    return [value.strip() for value in query_params.get(name, '').split(',') if value.strip()]
+
+
+def parse_decimal_param(query_params, name):
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: "Must be a number."})
+    if not value.is_finite():
+        raise ValidationError({name: "Must be a finite number."})
+    return value
+
+
+class EquipmentFilter(BaseFilterBackend):
+    """?status=Available,In Use&equipment_type=Excavator&purchased_from=&purchased_to=&cost_min=&cost_max=
+
+    Every filter maps onto one of the Equipment indexes; comma-separated
+    values match any of them, date and cost bounds are inclusive.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        statuses = split_param(params, 'status')
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        types = split_param(params, 'equipment_type')
+        if types:
+            queryset = queryset.filter(equipment_type__in=types)
+
+        purchased_from = parse_date_param(params, 'purchased_from')
+        purchased_to = parse_date_param(params, 'purchased_to')
+        if purchased_from and purchased_to and purchased_from > purchased_to:
+            raise ValidationError({'purchased_from': "'purchased_from' must not be after 'purchased_to'."})
+        if purchased_from:
+            queryset = queryset.filter(purchase_date__gte=purchased_from)
+        if purchased_to:
+            queryset = queryset.filter(purchase_date__lte=purchased_to)
+
+        cost_min = parse_decimal_param(params, 'cost_min')
+        cost_max = parse_decimal_param(params, 'cost_max')
+        if cost_min is not None:
+            queryset = queryset.filter(purchase_cost__gte=cost_min)
+        if cost_max is not None:
+            queryset = queryset.filter(purchase_cost__lte=cost_max)
+        return queryset
+
+
+class EquipmentOrdering(OrderingFilter):
+    """DRF's ?ordering= with ``id`` as the final tie-break, so offset pages never overlap."""
+
+    ordering_fields = ['status', 'equipment_type', 'purchase_date', 'purchase_cost', 'id']
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or ['id'])
+        if not {'id', '-id'} & set(ordering):
+            # Same direction as the last key, so each (field, id) index is read in one pass.
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
@@ -0,0 +1,16 @@
+from abv_management.bulk_import import BulkImporter
+
+from .models import Equipment
+
+
+class EquipmentImporter(BulkImporter):
+    model = Equipment
+    fields = (
+        'equipment_name',
+        'equipment_type',
+        'serial_number',
+        'purchase_date',
+        'purchase_cost',
+        'status',
+    )
+    upsert_keys = ('serial_number',)
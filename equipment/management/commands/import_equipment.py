@@ -0,0 +1,7 @@
+from abv_management.bulk_import import ImportCommand
+from equipment.importers import EquipmentImporter
+
+
+class Command(ImportCommand):
+    help = "Stream Equipment rows from a CSV or JSON Lines file (upsert key: serial_number)."
+    importer_class = EquipmentImporter
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['status', 'id'], name='equipment_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['equipment_type', 'id'], name='equipment_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['purchase_date', 'id'], name='equipment_purchase_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['purchase_cost', 'id'], name='equipment_purchase_cost_idx'),
+        ),
+    ]
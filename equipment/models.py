@@ -5,13 +5,22 @@ from users.models import CustomUser
 class Equipment(models.Model):
     equipment_name = models.CharField(max_length=255)
     equipment_type = models.CharField(max_length=100)
-    serial_number = models.CharField(max_length=100, blank=True, null=True)
+    serial_number = models.CharField(max_length=100, unique=True)
     purchase_date = models.DateField()
     purchase_cost = models.DecimalField(max_digits=15, decimal_places=2)
     status = models.CharField(max_length=50)  # Available, In Use, Under Maintenance, Retired
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # One per listing filter / ordering; the trailing id serves the tie-break.
+        indexes = [
+            models.Index(fields=['status', 'id'], name='equipment_status_idx'),
+            models.Index(fields=['equipment_type', 'id'], name='equipment_type_idx'),
+            models.Index(fields=['purchase_date', 'id'], name='equipment_purchase_date_idx'),
+            models.Index(fields=['purchase_cost', 'id'], name='equipment_purchase_cost_idx'),
+        ]
+
     def __str__(self):
         return str(self.equipment_name)
         
@@ -1,8 +1,19 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from .models import Equipment
 
 
-class EquipmentSerializer(serializers.ModelSerializer):
+class EquipmentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Latest history per machine, bounded to ``limit`` rows each (``?expand_limit=`` to change).
+    expandable_fields = {
+        'recent_operations': ('operations.serializers.OperationRecordSerializer', {
+            'many': True, 'relation': 'operationrecord_set', 'ordering': ('-date', '-id'), 'limit': 5,
+        }),
+        'recent_maintenance': ('operations.serializers.MaintenanceRecordSerializer', {
+            'many': True, 'relation': 'maintenancerecord_set', 'ordering': ('-performed_at', '-id'), 'limit': 5,
+        }),
+    }
+
     class Meta:
         model = Equipment
         fields = '__all__'  # This includes every field in the model
@@ -1,3 +1,239 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from dashboard import counters, versions
+from operations.models import MaintenanceRecord, OperationRecord
+
+from .models import Equipment
+
+TABLE = Equipment._meta.db_table
+
+
+class EquipmentListingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='planner', email='planner@example.com', password='x')
+        statuses = ['Available', 'In Use', 'Under Maintenance', 'Retired']
+        types = ['Excavator', 'Loader', 'Truck']
+        Equipment.objects.bulk_create([
+            Equipment(
+                equipment_name=f'Machine {i}',
+                serial_number=f'SN-{i}',
+                equipment_type=types[i % len(types)],
+                status=statuses[i % len(statuses)],
+                purchase_date=date(2020, 1 + i % 12, 1 + i % 28),
+                purchase_cost=Decimal(1000 + (i * 37) % 500),
+            )
+            for i in range(60)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def list(self, query=''):
+        response = self.client.get(f'/api/equipment/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+
+class EquipmentListingTests(EquipmentListingTestCase):
+    def test_filters_combine(self):
+        data = self.list('status=Available,Retired&equipment_type=Excavator&cost_min=1100&limit=100')
+        expected = Equipment.objects.filter(
+            status__in=['Available', 'Retired'], equipment_type='Excavator', purchase_cost__gte=1100
+        )
+        self.assertEqual(data['count'], expected.count())
+        self.assertEqual({row['id'] for row in data['results']}, set(expected.values_list('pk', flat=True)))
+
+    def test_purchase_date_bounds_are_inclusive(self):
+        data = self.list('purchased_from=2020-03-01&purchased_to=2020-03-31&limit=100')
+        dates = {row['purchase_date'] for row in data['results']}
+        self.assertTrue(dates)
+        self.assertTrue(all('2020-03-01' <= value <= '2020-03-31' for value in dates))
+
+    def test_ordering_breaks_ties_on_id(self):
+        rows = self.list('ordering=-purchase_cost&limit=100')['results']
+        keys = [(Decimal(row['purchase_cost']), row['id']) for row in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in (
+            'cost_min=cheap', 'cost_min=nan', 'cost_min=inf', 'cost_max=-Infinity',
+            'purchased_from=yesterday', 'purchased_from=2021-01-01&purchased_to=2020-01-01',
+        ):
+            self.assertEqual(self.client.get(f'/api/equipment/?{query}').status_code, 400, query)
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=10)
+    def test_large_table_total_is_cached(self):
+        self.assertEqual(self.list('status=Available')['count'], 15)
+        Equipment.objects.create(
+            equipment_name='New', serial_number='SN-new', equipment_type='Loader', status='Available',
+            purchase_date=date(2024, 1, 1), purchase_cost=Decimal(1),
+        )
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.list('status=Available&ordering=purchase_date')['count'], 15)
+        self.assertFalse([query for query in captured if 'COUNT(' in query['sql']])
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=1000)
+    def test_small_table_total_is_exact(self):
+        self.assertEqual(self.list('status=Available')['count'], 15)
+        Equipment.objects.create(
+            equipment_name='New', serial_number='SN-new', equipment_type='Loader', status='Available',
+            purchase_date=date(2024, 1, 1), purchase_cost=Decimal(1),
+        )
+        self.assertEqual(self.list('status=Available')['count'], 16)
+
+
+@skipUnless(connection.vendor == 'sqlite', "Reads SQLite's EXPLAIN QUERY PLAN output.")
+class EquipmentListingQueryPlanTests(EquipmentListingTestCase):
+    """Every supported filter and ordering is answered from an index, without a table scan or sort."""
+
+    def query_plans(self, query):
+        with CaptureQueriesContext(connection) as captured:
+            self.list(query)
+        plans = []
+        with connection.cursor() as cursor:
+            for executed in captured:
+                sql = executed['sql']
+                if f'FROM "{TABLE}"' not in sql or ('COUNT(' in sql and 'WHERE' not in sql):
+                    continue  # the unfiltered table-size count may read any index
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+        self.assertTrue(plans, query)
+        return plans
+
+    def assertUsesIndex(self, query, index, sorts=False):
+        for plan in self.query_plans(query):
+            self.assertIn(index, plan, query)
+            self.assertNotIn(f'SCAN {TABLE} |', f'{plan} |', query)
+            if not sorts:
+                self.assertNotIn('TEMP B-TREE', plan, query)
+
+    def test_status_filter(self):
+        self.assertUsesIndex('status=Available', 'equipment_status_idx')
+
+    def test_type_filter(self):
+        self.assertUsesIndex('equipment_type=Loader', 'equipment_type_idx')
+
+    def test_multiple_values_sort_only_the_matches(self):
+        # Each value is its own index range, so only the matching rows are put in order.
+        self.assertUsesIndex('equipment_type=Loader,Truck', 'equipment_type_idx', sorts=True)
+
+    def test_purchase_date_range(self):
+        self.assertUsesIndex('purchased_from=2020-02-01&purchased_to=2020-04-30&ordering=purchase_date', 'equipment_purchase_date_idx')
+
+    def test_purchase_cost_range(self):
+        self.assertUsesIndex('cost_min=1200&cost_max=1300&ordering=-purchase_cost', 'equipment_purchase_cost_idx')
+
+    def test_orderings(self):
+        for field, index in [
+            ('purchase_date', 'equipment_purchase_date_idx'),
+            ('-purchase_cost', 'equipment_purchase_cost_idx'),
+            ('status', 'equipment_status_idx'),
+            ('-equipment_type', 'equipment_type_idx'),
+        ]:
+            self.assertUsesIndex(f'ordering={field}', index)
+
+
+class EquipmentHistoryTests(EquipmentListingTestCase):
+    expand = 'expand=recent_operations,recent_maintenance&limit=100'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Equipment.objects.bulk_create([
+            Equipment(
+                equipment_name=f'Spare {i}', serial_number=f'SP-{i}', equipment_type='Truck', status='Available',
+                purchase_date=date(2021, 1, 1), purchase_cost=Decimal(500),
+            )
+            for i in range(40)
+        ])
+        machines = list(Equipment.objects.all())
+        OperationRecord.objects.bulk_create([
+            OperationRecord(
+                equipment=machine, operator='Kim', date=date(2024, 1, day), hours_used=Decimal(day),
+                activity='Hauling', status='completed',
+            )
+            for machine in machines for day in range(1, 8)
+        ])
+        MaintenanceRecord.objects.bulk_create([
+            MaintenanceRecord(
+                equipment=machine, description='Service', performed_at=date(2024, 2, day), status='completed'
+            )
+            for machine in machines for day in range(1, 8)
+        ])
+
+    def test_history_for_a_page_costs_a_constant_number_of_queries(self):
+        # Version stamp, table size and page COUNTs, the page, then one windowed query per history.
+        self.assertEqual(Equipment.objects.count(), 100)
+        with self.assertNumQueries(6):
+            rows = self.list(self.expand)['results']
+        self.assertEqual(len(rows), 100)
+        cache.clear()
+        with self.assertNumQueries(6):
+            self.assertEqual(len(self.list('expand=recent_operations,recent_maintenance&limit=10')['results']), 10)
+
+    def test_history_is_capped_at_the_limit(self):
+        rows = self.list(self.expand)['results']
+        self.assertTrue(all(len(row['recent_operations']) == 5 for row in rows))
+        self.assertEqual([record['date'] for record in rows[0]['recent_operations']], [
+            '2024-01-07', '2024-01-06', '2024-01-05', '2024-01-04', '2024-01-03',
+        ])
+        self.assertTrue(all(len(row['recent_maintenance']) == 5 for row in rows))
+
+        cache.clear()
+        rows = self.list(f'{self.expand}&expand_limit=2')['results']
+        self.assertEqual({len(row['recent_operations']) for row in rows}, {2})
+        latest = [record['performed_at'] for record in rows[-1]['recent_maintenance']]
+        self.assertEqual(latest, ['2024-02-07', '2024-02-06'])
+
+
+class EquipmentImportTests(TestCase):
+    header = 'equipment_name,equipment_type,serial_number,purchase_date,purchase_cost,status'
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='planner', email='planner@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, *lines, mode='insert'):
+        body = '\n'.join([self.header, *lines]) + '\n'
+        response = self.client.post(f"{reverse('equipment-import')}?mode={mode}", data=body, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_mixed_rows_are_reported_per_line(self):
+        stored = counters.get_counters()['equipments']
+        version = versions.current(Equipment)[Equipment._meta.label][0]
+        report = self.upload(
+            'Loader,Loader,SN-A,2020-01-01,1000,Available',
+            'Truck,Truck,SN-X,yesterday,1000,Available',
+            'Dozer,Dozer,SN-B,2021-05-01,2500.50,In Use',
+            'Copy,Loader,SN-A,2020-01-01,1000,Available',  # duplicate serial: rejected by the database
+        )
+        self.assertEqual({key: report[key] for key in ('rows', 'created', 'updated', 'failed')},
+                         {'rows': 4, 'created': 2, 'updated': 0, 'failed': 2})
+        self.assertEqual([error['line'] for error in report['errors']], [3, 5])
+        self.assertEqual(sorted(Equipment.objects.values_list('serial_number', flat=True)), ['SN-A', 'SN-B'])
+        # Raw writes skip the signals; the importer bumps counters and version stamps itself.
+        self.assertEqual(counters.get_counters()['equipments'], stored + 2)
+        self.assertFalse(counters.check())
+        self.assertGreater(versions.current(Equipment)[Equipment._meta.label][0], version)
+
+    def test_upsert_updates_matching_rows(self):
+        self.upload('Loader,Loader,SN-A,2020-01-01,1000,Available')
+        report = self.upload('Loader,Loader,SN-A,2020-01-01,900,Retired', 'Dozer,Dozer,SN-B,2021-05-01,2500,In Use', mode='upsert')
+        self.assertEqual((report['created'], report['updated'], report['failed']), (1, 1, 0))
+        self.assertEqual(Equipment.objects.get(serial_number='SN-A').status, 'Retired')
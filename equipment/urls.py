@@ -3,11 +3,13 @@ from .views import (
     EquipmentListCreateView,
     EquipmentUpdateView,
     EquipmentDeleteView,
-    EquipmentDetailView
+    EquipmentDetailView,
+    EquipmentImportView
 )
 
 urlpatterns = [
     path('', EquipmentListCreateView.as_view(), name='equipment-list-create'),
+    path('import/', EquipmentImportView.as_view(), name='equipment-import'),
     path('<int:id>/', EquipmentDetailView.as_view(), name='equipment-detail'),
     path('<int:id>/update/', EquipmentUpdateView.as_view(), name='equipment-update'),
     path('<int:id>/delete/', EquipmentDeleteView.as_view(), name='equipment-delete'),
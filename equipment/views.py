@@ -2,11 +2,24 @@ from rest_framework import generics
 from .models import Equipment
 from .serializers import EquipmentSerializer
 from rest_framework.permissions import IsAuthenticated
+from dashboard.conditional import ConditionalGetMixin
+from dashboard.idempotency import IdempotencyMixin
+from abv_management.bulk_import import BulkImportView
+from abv_management.fieldsets import SparseFieldsetMixin
+from abv_management.pagination import CachedCountPagination
+from .filters import EquipmentFilter, EquipmentOrdering
+from .importers import EquipmentImporter
 
-class EquipmentListCreateView(generics.ListCreateAPIView):
+class EquipmentListCreateView(IdempotencyMixin, SparseFieldsetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
     permission_classes = [IsAuthenticated]
+    conditional_models = [Equipment]
+    filter_backends = [EquipmentFilter, EquipmentOrdering]
+    pagination_class = CachedCountPagination
+
+class EquipmentImportView(BulkImportView):
+    importer_class = EquipmentImporter
 
 class EquipmentUpdateView(generics.UpdateAPIView):
     queryset = Equipment.objects.all()
@@ -20,7 +33,7 @@ class EquipmentDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
 
-class EquipmentDetailView(generics.RetrieveAPIView):
+class EquipmentDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
     permission_classes = [IsAuthenticated]
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import FinanceRecord
-admin.site.register(FinanceRecord)
\ No newline at end of file
+from .models import FinanceRecord, FinancePeriod
+admin.site.register(FinanceRecord)
+admin.site.register(FinancePeriod)
@@ -0,0 +1,160 @@
+"""
+Monthly period ledger for FinanceRecord.
+
+Complete months are closed into FinancePeriod rows (revenue and expense
+totals per activity), so summaries only read the small period table plus
+the records of the still-open month(s). ``summary()`` aggregates both in the
+database; SQLite's SUM() works in floating point, so those totals are rounded
+back to cents (exact well beyond any ledger's size). The per-month and
+per-activity breakdowns add Decimal values in Python.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, Max, Q, Sum
+from django.utils.timezone import localdate
+
+from dashboard import versions
+
+from .models import FinanceRecord, FinancePeriod
+
+ZERO = Decimal('0.00')
+TOTAL = DecimalField(max_digits=28, decimal_places=2)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    if day.month == 12:
+        return day.replace(year=day.year + 1, month=1, day=1)
+    return day.replace(month=day.month + 1, day=1)
+
+
+def open_period_start():
+    """First day not covered by a closed period, or None if nothing is closed yet."""
+    last = FinancePeriod.objects.aggregate(last=Max('period'))['last']
+    return next_month(last) if last else None
+
+
+def open_records():
+    start = open_period_start()
+    records = FinanceRecord.objects.all()
+    if start:
+        records = records.filter(date__gte=start)
+    return records
+
+
+def period_totals(records):
+    """{(month, activity): [revenue, expenses]} for the given FinanceRecord queryset."""
+    totals = defaultdict(lambda: [ZERO, ZERO])
+    rows = records.values_list('date', 'activity', 'type', 'amount').order_by()
+    for day, activity, kind, amount in rows.iterator(chunk_size=2000):
+        bucket = totals[(month_start(day), activity)]
+        bucket[0 if kind == 'revenue' else 1] += amount
+    return totals
+
+
+@transaction.atomic
+def close_periods(rebuild=False):
+    """Close every complete month that is still open; returns the number of rows written.
+
+    With ``rebuild`` all closed periods are dropped and recomputed first.
+    """
+    if rebuild:
+        FinancePeriod.objects.all().delete()
+    records = open_records().filter(date__lt=month_start(localdate()))
+    rows = [
+        FinancePeriod(period=period, activity=activity, revenue=revenue, expenses=expenses)
+        for (period, activity), (revenue, expenses) in sorted(period_totals(records).items())
+    ]
+    FinancePeriod.objects.bulk_create(rows)
+    versions.bump(FinancePeriod)
+    return len(rows)
+
+
+def _closed_totals():
+    return FinancePeriod.objects.values_list('period', 'activity', 'revenue', 'expenses')
+
+
+def _total(*args, **kwargs):
+    return Sum(*args, **kwargs, default=ZERO, output_field=TOTAL)
+
+
+def summary():
+    closed = FinancePeriod.objects.aggregate(revenue=_total('revenue'), expenses=_total('expenses'))
+    still_open = open_records().aggregate(
+        revenue=_total('amount', filter=Q(type='revenue')),
+        expenses=_total('amount', filter=~Q(type='revenue')),
+    )
+    revenue = closed['revenue'] + still_open['revenue']
+    expenses = closed['expenses'] + still_open['expenses']
+    return {"revenue": revenue, "expenses": expenses, "profit": revenue - expenses}
+
+
+def _row(totals, **extra):
+    revenue, expenses = totals
+    return {**extra, "revenue": revenue, "expenses": expenses, "profit": revenue - expenses}
+
+
+def monthly_breakdown(start=None, end=None):
+    months = defaultdict(lambda: [ZERO, ZERO])
+    closed = set()
+    periods = _closed_totals()
+    if start:
+        periods = periods.filter(period__gte=month_start(start))
+    if end:
+        periods = periods.filter(period__lte=end)
+    for period, _, revenue, expenses in periods:
+        months[period][0] += revenue
+        months[period][1] += expenses
+        closed.add(period)
+    for (period, _), (revenue, expenses) in period_totals(open_records()).items():
+        if (start and period < month_start(start)) or (end and period > end):
+            continue
+        months[period][0] += revenue
+        months[period][1] += expenses
+
+    return [
+        _row(months[period], month=period, closed=period in closed)
+        for period in sorted(months)
+    ]
+
+
+def activity_breakdown():
+    activities = defaultdict(lambda: [ZERO, ZERO])
+    for _, activity, revenue, expenses in _closed_totals():
+        activities[activity][0] += revenue
+        activities[activity][1] += expenses
+    for (_, activity), (revenue, expenses) in period_totals(open_records()).items():
+        activities[activity][0] += revenue
+        activities[activity][1] += expenses
+
+    return [_row(activities[activity], activity=activity) for activity in sorted(activities)]
+
+
+def reconcile():
+    """Compare every closed period with the raw records it was built from.
+
+    Returns a list of ``(period, activity, stored, actual)`` tuples for each
+    mismatch, where ``stored`` and ``actual`` are ``(revenue, expenses)``.
+    """
+    start = open_period_start()
+    if start is None:
+        return []
+    actual = period_totals(FinanceRecord.objects.filter(date__lt=start))
+    stored = {
+        (period, activity): (revenue, expenses)
+        for period, activity, revenue, expenses in _closed_totals()
+    }
+
+    mismatches = []
+    for key in sorted(set(actual) | set(stored)):
+        expected = tuple(actual.get(key, (ZERO, ZERO)))
+        found = stored.get(key, (ZERO, ZERO))
+        if expected != found:
+            mismatches.append((*key, found, expected))
+    return mismatches
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from finance import ledger
+
+
+class Command(BaseCommand):
+    help = "Close every complete month into per-activity FinancePeriod totals."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help="Drop all closed periods and recompute them from the raw records.",
+        )
+
+    def handle(self, *args, **options):
+        written = ledger.close_periods(rebuild=options['rebuild'])
+        start = ledger.open_period_start()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} period row(s); open period starts {start or 'at the first record'}."
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finance import ledger
+
+
+class Command(BaseCommand):
+    help = "Check that every closed FinancePeriod matches the FinanceRecord rows it covers."
+
+    def handle(self, *args, **options):
+        mismatches = ledger.reconcile()
+        for period, activity, stored, actual in mismatches:
+            self.stderr.write(
+                f"{period:%Y-%m} {activity}: stored revenue={stored[0]} expenses={stored[1]}, "
+                f"records revenue={actual[0]} expenses={actual[1]}"
+            )
+        if mismatches:
+            raise CommandError(
+                f"{len(mismatches)} closed period(s) do not match the records; "
+                "run close_finance_periods --rebuild to recompute them."
+            )
+        self.stdout.write(self.style.SUCCESS("Closed periods match the finance records."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='financerecord',
+            name='date',
+            field=models.DateField(auto_now_add=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='FinancePeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('activity', models.CharField(max_length=100)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('expenses', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('closed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'activity'), name='unique_finance_period_activity')],
+            },
+        ),
+    ]
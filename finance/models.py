@@ -12,8 +12,26 @@ class FinanceRecord(models.Model):
     type = models.CharField(max_length=10, choices=TRANSACTION_TYPES)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     description = models.TextField(blank=True)
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(auto_now_add=True, db_index=True)
     activity = models.CharField(max_length=100, default='General')
 
     def __str__(self):
         return f"{self.type.title()} - ₦{self.amount} on {self.date}"
+
+
+class FinancePeriod(models.Model):
+    """Closed monthly revenue/expense totals per activity (see finance.ledger)."""
+
+    period = models.DateField()  # first day of the month
+    activity = models.CharField(max_length=100)
+    revenue = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    expenses = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    closed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'activity'], name='unique_finance_period_activity'),
+        ]
+
+    def __str__(self):
+        return f"{self.period:%Y-%m} {self.activity}: +₦{self.revenue} / -₦{self.expenses}"
@@ -1,3 +1,43 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils.timezone import localdate
+
+from . import ledger
+from .models import FinancePeriod, FinanceRecord
+
+
+class LedgerSummaryTests(TestCase):
+    def record(self, kind, amount, day, activity='General'):
+        record = FinanceRecord.objects.create(type=kind, amount=Decimal(amount), activity=activity)
+        FinanceRecord.objects.filter(pk=record.pk).update(date=day)
+
+    def full_scan(self):
+        revenue = expenses = ledger.ZERO
+        for period_revenue, period_expenses in ledger.period_totals(FinanceRecord.objects.all()).values():
+            revenue += period_revenue
+            expenses += period_expenses
+        return {"revenue": revenue, "expenses": expenses, "profit": revenue - expenses}
+
+    def test_closed_periods_plus_open_records_match_a_full_scan(self):
+        for month in (1, 2, 3):
+            for _ in range(50):
+                self.record('revenue', '0.10', date(2024, month, 15), activity='Hauling')
+            self.record('expense', '1234567.89', date(2024, month, 1), activity='Fuel')
+            self.record('expense', '0.20', date(2024, month, 28))
+        self.assertEqual(ledger.close_periods(), 9)
+        self.record('revenue', '99.99', localdate())
+        self.record('expense', '0.01', localdate(), activity='Fuel')
+
+        with self.assertNumQueries(3):
+            totals = ledger.summary()
+        self.assertEqual(totals, self.full_scan())
+        self.assertEqual(
+            totals,
+            {"revenue": Decimal('114.99'), "expenses": Decimal('3703704.28'), "profit": Decimal('-3703589.29')},
+        )
 
-# Create your tests here.
+    def test_summary_of_an_empty_ledger_is_zero(self):
+        self.assertEqual(ledger.summary(), {"revenue": ledger.ZERO, "expenses": ledger.ZERO, "profit": ledger.ZERO})
+        self.assertFalse(FinancePeriod.objects.exists())
@@ -0,0 +1,180 @@
+"""
+Book value of the equipment fleet, vectorized with NumPy.
+
+The whole Equipment table is read once into arrays (cost in integer
+cents, purchase dates as datetime64), every asset's depreciation is one
+array expression, and group totals are integer sums over the rounded
+per-asset cents, so groups and the fleet total always add up exactly.
+
+Methods, over EQUIPMENT_USEFUL_LIFE_YEARS down to a salvage value of
+EQUIPMENT_SALVAGE_RATE x cost:
+
+* ``straight_line``: the same amount every year;
+* ``declining_balance``: a fixed share (EQUIPMENT_DECLINING_BALANCE_FACTOR
+  / useful life) of the remaining value every year, compounded by the day.
+
+The loaded arrays and each parameter set's result are cached under the
+Equipment version stamp, so any equipment write invalidates them.
+"""
+
+import hashlib
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from dashboard import versions
+from equipment.models import Equipment
+
+METHODS = ('straight_line', 'declining_balance')
+GROUP_FIELDS = ('equipment_type', 'status')
+DAYS_PER_YEAR = 365.25
+CACHE_KEY = 'finance:valuation'
+
+
+def defaults():
+    return {
+        "useful_life": float(getattr(settings, 'EQUIPMENT_USEFUL_LIFE_YEARS', 10)),
+        "salvage_rate": float(getattr(settings, 'EQUIPMENT_SALVAGE_RATE', 0.1)),
+        "factor": float(getattr(settings, 'EQUIPMENT_DECLINING_BALANCE_FACTOR', 2)),
+    }
+
+
+def encode(values):
+    """``(labels, codes)`` with ``labels[codes] == values``; integer codes group far faster than strings."""
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+    return np.asarray(list(index), dtype=object), codes
+
+
+def load_fleet():
+    """Column arrays for every machine, ids ascending, plus ``encode``d GROUP_FIELDS."""
+    rows = list(
+        Equipment.objects.order_by('pk').values_list(
+            'pk', 'equipment_name', 'equipment_type', 'status', 'purchase_date', 'purchase_cost'
+        )
+    )
+    ids, names, types, statuses, purchased, costs = zip(*rows) if rows else ([],) * 6
+    return {
+        "id": np.asarray(ids, dtype=np.int64),
+        "equipment_name": np.asarray(names, dtype=object),
+        "equipment_type": np.asarray(types, dtype=object),
+        "status": np.asarray(statuses, dtype=object),
+        "purchase_date": np.asarray(purchased, dtype='datetime64[D]'),
+        "cost": np.asarray([int(cost * 100) for cost in costs], dtype=np.int64),
+        "groups": {field: encode(values) for field, values in zip(GROUP_FIELDS, (types, statuses))},
+    }
+
+
+def book_values(cost, age_years, method, useful_life, salvage_rate, factor):
+    """Book value in cents (int64) of assets of ``cost`` cents that are ``age_years`` old."""
+    cost = cost.astype(np.float64)
+    salvage = cost * salvage_rate
+    if method == 'straight_line':
+        value = cost - (cost - salvage) * np.minimum(age_years / useful_life, 1.0)
+    else:
+        rate = min(factor / useful_life, 1.0)
+        value = np.maximum(cost * np.power(1.0 - rate, age_years), salvage)
+    return np.rint(value).astype(np.int64)
+
+
+def money(cents):
+    # A string, exact to the cent; DRF's JSON encoder would turn a Decimal into a float.
+    return str(Decimal(int(cents)).scaleb(-2))
+
+
+def totals(count, cost, value):
+    return {
+        "count": int(count),
+        "purchase_cost": money(cost),
+        "accumulated_depreciation": money(cost - value),
+        "book_value": money(value),
+    }
+
+
+def grouped(fleet, mask, cost, value, group_by):
+    """One totals row per combination of the ``group_by`` values, largest book value first."""
+    if not group_by:
+        return []
+    # Each field's codes are combined into one integer key per asset.
+    fields = []
+    combined = np.zeros(len(cost), dtype=np.int64)
+    for field in group_by:
+        labels, codes = fleet["groups"][field]
+        fields.append(labels)
+        combined = combined * len(labels) + codes[mask]
+    keys, codes = np.unique(combined, return_inverse=True)
+    counts = np.bincount(codes, minlength=len(keys))
+    cost_sums = np.zeros(len(keys), dtype=np.int64)
+    value_sums = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(cost_sums, codes, cost)
+    np.add.at(value_sums, codes, value)
+
+    groups = []
+    for i, key in enumerate(keys.tolist()):
+        row = {}
+        for field, labels in zip(reversed(group_by), reversed(fields)):
+            key, code = divmod(key, len(labels))
+            row[field] = labels[code]
+        order = (-int(value_sums[i]), *(row[field] for field in group_by))
+        groups.append((order, {**{field: row[field] for field in group_by}, **totals(counts[i], cost_sums[i], value_sums[i])}))
+    groups.sort(key=lambda pair: pair[0])
+    return [group for _, group in groups]
+
+
+def compute_valuation(fleet, as_of, method, useful_life, salvage_rate, factor, group_by, assets=False):
+    owned = fleet["purchase_date"] <= np.datetime64(as_of, 'D')
+    age_years = (np.datetime64(as_of, 'D') - fleet["purchase_date"][owned]).astype(np.float64) / DAYS_PER_YEAR
+    cost = fleet["cost"][owned]
+    value = book_values(cost, age_years, method, useful_life, salvage_rate, factor)
+
+    payload = {
+        "as_of": as_of,
+        "method": method,
+        "useful_life": useful_life,
+        "salvage_rate": salvage_rate,
+        "fleet": totals(len(cost), cost.sum(), value.sum()),
+        "group_by": list(group_by),
+        "groups": grouped(fleet, owned, cost, value, group_by),
+    }
+    if method == 'declining_balance':
+        payload["factor"] = factor
+    if assets:
+        payload["assets"] = [
+            {
+                "id": int(pk),
+                "equipment_name": name,
+                "equipment_type": kind,
+                "status": status,
+                "purchase_date": purchased.item(),
+                "age_years": round(float(age), 2),
+                "purchase_cost": money(item_cost),
+                "accumulated_depreciation": money(item_cost - item_value),
+                "book_value": money(item_value),
+            }
+            for pk, name, kind, status, purchased, age, item_cost, item_value in zip(
+                fleet["id"][owned], fleet["equipment_name"][owned], fleet["equipment_type"][owned],
+                fleet["status"][owned], fleet["purchase_date"][owned], age_years, cost, value,
+            )
+        ]
+    return payload
+
+
+def fleet_valuation(as_of, method, useful_life, salvage_rate, factor, group_by=GROUP_FIELDS, assets=False):
+    """``compute_valuation`` over the current fleet, cached until Equipment next changes."""
+    version, _ = versions.current(Equipment)[Equipment._meta.label]
+    params = repr((as_of.isoformat(), method, useful_life, salvage_rate, factor, tuple(group_by), assets))
+    key = f'{CACHE_KEY}:{version}:{hashlib.sha1(params.encode()).hexdigest()}'
+    timeout = getattr(settings, 'EQUIPMENT_VALUATION_CACHE_TIMEOUT', 3600)
+    payload = cache.get(key)
+    if payload is None:
+        # Reading the table is most of the cost, so the arrays are shared by every parameter set.
+        fleet_key = f'{CACHE_KEY}:{version}:fleet'
+        fleet = cache.get(fleet_key)
+        if fleet is None:
+            fleet = load_fleet()
+            cache.set(fleet_key, fleet, timeout)
+        payload = compute_valuation(fleet, as_of, method, useful_life, salvage_rate, factor, group_by, assets)
+        cache.set(key, payload, timeout)
+    return payload
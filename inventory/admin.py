@@ -3,4 +3,9 @@ from django.contrib import admin
 # Register your models here.
 from .models import Inventory
 
-admin.site.register(Inventory)
\ No newline at end of file
+
+@admin.register(Inventory)
+class InventoryAdmin(admin.ModelAdmin):
+    def get_readonly_fields(self, request, obj=None):
+        # Existing stock changes through Transactions (see transaction.admin).
+        return ['quantity'] if obj else []
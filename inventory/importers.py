@@ -0,0 +1,20 @@
+from abv_management.bulk_import import BulkImporter
+from transaction import services
+
+from .models import Inventory
+
+
+class InventoryImporter(BulkImporter):
+    model = Inventory
+    fields = ('item_name', 'category', 'quantity', 'unit', 'status', 'reorder_level')
+    upsert_keys = ('item_name', 'category')
+
+    def update(self, updates):
+        # An upsert sets quantity outright; the difference is posted as an
+        # adjustment so stock as of earlier moments (transaction.snapshots) holds.
+        quantities = {pk: values['quantity'] for pk, values in updates.items() if 'quantity' in values}
+        before = dict(
+            Inventory.objects.select_for_update().filter(pk__in=quantities).values_list('pk', 'quantity')
+        ) if quantities else {}
+        super().update(updates)
+        services.record_adjustments({pk: (before[pk], quantity) for pk, quantity in quantities.items()})
@@ -0,0 +1,7 @@
+from abv_management.bulk_import import ImportCommand
+from inventory.importers import InventoryImporter
+
+
+class Command(ImportCommand):
+    help = "Stream Inventory rows from a CSV or JSON Lines file (upsert key: item_name + category)."
+    importer_class = InventoryImporter
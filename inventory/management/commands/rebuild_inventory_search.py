@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from inventory.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Drop and re-create the Inventory search index (and its triggers) from the inventory table."
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the inventory search index ({type(backend).__name__})."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_inventory_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='reorder_level',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='is_low_stock',
+            field=models.GeneratedField(db_persist=True, expression=models.Q(('quantity__lte', models.F('reorder_level'))), output_field=models.BooleanField()),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(condition=models.Q(('is_low_stock', True)), fields=['id'], name='inventory_low_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['status', 'id'], name='inventory_status_idx'),
+        ),
+    ]
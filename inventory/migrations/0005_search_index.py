@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# A snapshot of the index inventory.search installs, so this migration keeps
+# building the same schema whatever the search module later becomes.
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS inventory_search USING fts5("
+    "item_name, category, content='inventory_inventory', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS inventory_search_ai AFTER INSERT ON inventory_inventory BEGIN "
+    "INSERT INTO inventory_search(rowid, item_name, category) VALUES (new.id, new.item_name, new.category); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS inventory_search_ad AFTER DELETE ON inventory_inventory BEGIN "
+    "INSERT INTO inventory_search(inventory_search, rowid, item_name, category) "
+    "VALUES ('delete', old.id, old.item_name, old.category); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS inventory_search_au AFTER UPDATE OF item_name, category "
+    "ON inventory_inventory BEGIN "
+    "INSERT INTO inventory_search(inventory_search, rowid, item_name, category) "
+    "VALUES ('delete', old.id, old.item_name, old.category); "
+    "INSERT INTO inventory_search(rowid, item_name, category) VALUES (new.id, new.item_name, new.category); "
+    "END",
+    "INSERT INTO inventory_search(inventory_search) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS inventory_search_ai",
+    "DROP TRIGGER IF EXISTS inventory_search_ad",
+    "DROP TRIGGER IF EXISTS inventory_search_au",
+    "DROP TABLE IF EXISTS inventory_search",
+]
+
+POSTGRES_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS inventory_search_gin ON inventory_inventory USING gin "
+    "((to_tsvector('simple', coalesce(item_name, '') || ' ' || coalesce(category, ''))))",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS inventory_search_gin",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_reorder_level'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRES_INSTALL}),
+            run({'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRES_UNINSTALL}),
+        ),
+    ]
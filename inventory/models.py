@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F, Q
 from users.models import CustomUser
 from django.conf import settings
 
@@ -17,6 +18,13 @@ class Inventory(models.Model):
     quantity = models.IntegerField()
     unit = models.CharField(max_length=50)  # e.g., Pieces, Liters
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='good')  # 👈 NEW
+    reorder_level = models.PositiveIntegerField(default=0)
+    # Maintained by the database on every write (including F() updates and bulk loads).
+    is_low_stock = models.GeneratedField(
+        expression=Q(quantity__lte=F('reorder_level')),
+        output_field=models.BooleanField(),
+        db_persist=True,
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -26,5 +34,12 @@ class Inventory(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Partial: holds only the low-stock rows, so listing them never touches the rest.
+            models.Index(fields=['id'], condition=Q(is_low_stock=True), name='inventory_low_stock_idx'),
+            models.Index(fields=['status', 'id'], name='inventory_status_idx'),
+        ]
+
     def __str__(self):
         return self.item_name
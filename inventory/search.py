@@ -0,0 +1,221 @@
+"""
+Inventory search over item_name and category.
+
+Every backend matches each word of the query as a prefix (``cem gre``
+finds "Grey Cement"), ranks item_name hits above category hits, and
+returns per-category facet counts for the whole match set.
+
+The backend is picked by ``INVENTORY_SEARCH_BACKEND`` (a dotted path) or,
+when unset, by database vendor:
+
+* ``SQLiteFTSBackend``: an FTS5 external-content table kept in step by
+  triggers on inventory_inventory, so ORM saves, queryset updates and raw
+  bulk loads are all indexed.
+* ``PostgresSearchBackend``: a GIN index over the same tsvector expression
+  the query uses; PostgreSQL maintains it itself.
+* ``BasicSearchBackend``: portable icontains matching, no index.
+
+Backends that keep an index outside the database override ``item_saved``
+and ``item_deleted``, which inventory.signals calls on every write.
+"""
+
+import abc
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+from .models import Inventory
+
+SearchResult = namedtuple('SearchResult', 'count results facets')
+
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def query_terms(query):
+    return TOKEN.findall(query or '')
+
+
+class SearchBackend(abc.ABC):
+    def install(self):
+        """Create whatever the index needs; safe to run again."""
+
+    def uninstall(self):
+        pass
+
+    def rebuild(self):
+        """Re-create the index from the inventory table."""
+        self.uninstall()
+        self.install()
+
+    def item_saved(self, item):
+        pass
+
+    def item_deleted(self, item):
+        pass
+
+    @abc.abstractmethod
+    def search(self, query, category=None, limit=20, offset=0):
+        """Return a SearchResult of ``(item, rank)`` pairs, best first."""
+
+    def _load(self, ranked):
+        items = Inventory.objects.in_bulk([pk for pk, _ in ranked])
+        return [(items[pk], rank) for pk, rank in ranked if pk in items]
+
+
+class SQLiteFTSBackend(SearchBackend):
+    table = 'inventory_search'
+    # item_name hits weigh ten times a category hit in bm25().
+    weights = (10.0, 1.0)
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                "item_name, category, content='inventory_inventory', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table}_ai AFTER INSERT ON inventory_inventory BEGIN "
+                f"INSERT INTO {self.table}(rowid, item_name, category) VALUES (new.id, new.item_name, new.category); "
+                "END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table}_ad AFTER DELETE ON inventory_inventory BEGIN "
+                f"INSERT INTO {self.table}({self.table}, rowid, item_name, category) "
+                "VALUES ('delete', old.id, old.item_name, old.category); "
+                "END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table}_au AFTER UPDATE OF item_name, category "
+                f"ON inventory_inventory BEGIN "
+                f"INSERT INTO {self.table}({self.table}, rowid, item_name, category) "
+                "VALUES ('delete', old.id, old.item_name, old.category); "
+                f"INSERT INTO {self.table}(rowid, item_name, category) VALUES (new.id, new.item_name, new.category); "
+                "END"
+            )
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def uninstall(self):
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {self.table}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def match_expression(self, terms):
+        return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+    def search(self, query, category=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return SearchResult(0, [], [])
+        match = self.match_expression(terms)
+        joined = (
+            f"FROM {self.table} JOIN inventory_inventory i ON i.id = {self.table}.rowid "
+            f"WHERE {self.table} MATCH %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT i.category, COUNT(*) {joined} GROUP BY i.category ORDER BY COUNT(*) DESC, i.category",
+                [match],
+            )
+            facets = [{"category": name, "count": count} for name, count in cursor.fetchall()]
+
+            params = [match]
+            where = joined
+            if category is not None:
+                where += " AND i.category = %s"
+                params.append(category)
+            cursor.execute(
+                f"SELECT i.id, bm25({self.table}, %s, %s) AS rank {where} ORDER BY rank, i.id LIMIT %s OFFSET %s",
+                [*self.weights, *params, limit, offset],
+            )
+            # bm25() is lower-is-better; expose higher-is-better scores.
+            ranked = [(pk, -rank) for pk, rank in cursor.fetchall()]
+
+        count = sum(f["count"] for f in facets if category is None or f["category"] == category)
+        return SearchResult(count, self._load(ranked), facets)
+
+
+class PostgresSearchBackend(SearchBackend):
+    index = 'inventory_search_gin'
+    document = "to_tsvector('simple', coalesce(item_name, '') || ' ' || coalesce(category, ''))"
+    weighted = (
+        "setweight(to_tsvector('simple', coalesce(item_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(category, '')), 'B')"
+    )
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {self.index} ON inventory_inventory USING gin (({self.document}))")
+
+    def uninstall(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {self.index}")
+
+    def search(self, query, category=None, limit=20, offset=0):
+        terms = [term.lower() for term in query_terms(query)]
+        if not terms:
+            return SearchResult(0, [], [])
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        where = f"WHERE {self.document} @@ to_tsquery('simple', %s)"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT category, COUNT(*) FROM inventory_inventory {where} "
+                "GROUP BY category ORDER BY COUNT(*) DESC, category",
+                [tsquery],
+            )
+            facets = [{"category": name, "count": count} for name, count in cursor.fetchall()]
+
+            params = [tsquery]
+            if category is not None:
+                where += " AND category = %s"
+                params.append(category)
+            cursor.execute(
+                f"SELECT id, ts_rank({self.weighted}, to_tsquery('simple', %s)) AS rank "
+                f"FROM inventory_inventory {where} ORDER BY rank DESC, id LIMIT %s OFFSET %s",
+                [tsquery, *params, limit, offset],
+            )
+            ranked = cursor.fetchall()
+
+        count = sum(f["count"] for f in facets if category is None or f["category"] == category)
+        return SearchResult(count, self._load(ranked), facets)
+
+
+class BasicSearchBackend(SearchBackend):
+    """Unindexed fallback: every term must appear in item_name or category."""
+
+    def search(self, query, category=None, limit=20, offset=0):
+        terms = query_terms(query)
+        if not terms:
+            return SearchResult(0, [], [])
+        matches = Inventory.objects.all()
+        for term in terms:
+            matches = matches.filter(Q(item_name__icontains=term) | Q(category__icontains=term))
+        facets = [
+            {"category": row['category'], "count": row['count']}
+            for row in matches.values('category').annotate(count=Count('id')).order_by('-count', 'category')
+        ]
+        if category is not None:
+            matches = matches.filter(category=category)
+        ranked = matches.annotate(
+            rank=Case(When(item_name__istartswith=terms[0], then=Value(2)), default=Value(1), output_field=IntegerField())
+        ).order_by('-rank', 'item_name', 'id').values_list('id', 'rank')[offset:offset + limit]
+
+        count = sum(f["count"] for f in facets if category is None or f["category"] == category)
+        return SearchResult(count, self._load(list(ranked)), facets)
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend():
+    path = getattr(settings, 'INVENTORY_SEARCH_BACKEND', None)
+    backend_class = import_string(path) if path else VENDOR_BACKENDS.get(connection.vendor, BasicSearchBackend)
+    return backend_class()
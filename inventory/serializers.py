@@ -1,8 +1,37 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from .models import Inventory
 
 
-class InventorySerializer(serializers.ModelSerializer):
+class InventorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'user': ('users.serializers.UserSerializer', {}),
+        'forecast': ('transaction.serializers.StockForecastSerializer', {}),
+    }
+
     class Meta:
         model = Inventory
         fields = '__all__'  # This includes every field in the model
+
+    def get_extra_kwargs(self):
+        extra_kwargs = super().get_extra_kwargs()
+        if isinstance(self.instance, Inventory):
+            # After creation stock only moves through posted Transactions (transaction.services).
+            extra_kwargs['quantity'] = {**extra_kwargs.get('quantity', {}), 'read_only': True}
+        return extra_kwargs
+
+    def update(self, instance, validated_data):
+        # Writing only the supplied columns never puts back a quantity that a
+        # movement posted since this instance was read has already changed.
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class InventoryAsOfSerializer(serializers.ModelSerializer):
+    quantity = serializers.IntegerField(source='as_of_quantity', read_only=True)
+
+    class Meta:
+        model = Inventory
+        fields = ['id', 'item_name', 'category', 'unit', 'quantity']
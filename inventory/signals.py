@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Inventory
+
+
+# Database-backed search indexes maintain themselves; these hooks are for
+# backends that keep their index elsewhere (see inventory.search).
+
+@receiver(post_save, sender=Inventory)
+def index_inventory_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.get_backend().item_saved(instance)
+
+
+@receiver(post_delete, sender=Inventory)
+def unindex_inventory_item(sender, instance, **kwargs):
+    search.get_backend().item_deleted(instance)
@@ -1,3 +1,93 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from transaction import services
+
+from .models import Inventory
+from .search import SearchBackend, SQLiteFTSBackend
+
+
+class SearchBackendTests(TestCase):
+    def test_backends_must_implement_search(self):
+        with self.assertRaises(TypeError):
+            SearchBackend()
+
+    @skipUnless(connection.vendor == 'sqlite', "Uses the FTS5 index from migration 0005.")
+    def test_migrated_index_tracks_writes(self):
+        item = Inventory.objects.create(item_name='Grey Cement', category='Building', quantity=5, unit='Bags')
+        Inventory.objects.create(item_name='Cement Mixer', category='Tools', quantity=1, unit='Units')
+        result = SQLiteFTSBackend().search('cem gre')
+        self.assertEqual(result.count, 1)
+        self.assertEqual(result.results[0][0], item)
+
+        Inventory.objects.filter(pk=item.pk).update(item_name='White Cement')
+        self.assertEqual(SQLiteFTSBackend().search('cem gre').count, 0)
+        self.assertEqual(SQLiteFTSBackend().search('whi').count, 1)
+
+
+class InventoryUpdateTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='clerk', email='clerk@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.item = Inventory.objects.create(item_name='Cement', category='Materials', quantity=10, unit='Bags')
+        self.url = reverse('inventory-detail', args=[self.item.pk])
+
+    def test_quantity_is_read_only(self):
+        response = self.client.patch(self.url, {'quantity': 60, 'reorder_level': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['quantity'], 10)
+        self.item.refresh_from_db()
+        self.assertEqual((self.item.quantity, self.item.reorder_level), (10, 5))
+
+    def test_quantity_is_set_on_create(self):
+        response = self.client.post(
+            reverse('inventory-list-create'),
+            {'item_name': 'Sand', 'category': 'Materials', 'quantity': 4, 'unit': 'Tonnes'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Inventory.objects.get(item_name='Sand').quantity, 4)
+
+    def test_update_keeps_movements_posted_since_the_read(self):
+        stale = self.client.get(self.url).data
+        services.post_movement(self.item.pk, 'OUT', 3)
+        response = self.client.put(self.url, {**stale, 'unit': 'Sacks', 'user': None}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.item.refresh_from_db()
+        self.assertEqual((self.item.unit, self.item.quantity), ('Sacks', 7))
+
+
+class LowStockTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            username='keeper', email='keeper@example.com', password='x'
+        ))
+        self.below = Inventory.objects.create(item_name='Nails', category='Parts', quantity=4, reorder_level=5, unit='Kg')
+        self.at = Inventory.objects.create(item_name='Bolts', category='Parts', quantity=5, reorder_level=5, unit='Kg')
+        self.above = Inventory.objects.create(item_name='Nuts', category='Parts', quantity=6, reorder_level=5, unit='Kg')
+
+    def test_reorder_level_itself_is_low_stock(self):
+        low = dict(Inventory.objects.values_list('item_name', 'is_low_stock'))
+        self.assertEqual(low, {'Nails': True, 'Bolts': True, 'Nuts': False})
+
+    def test_flag_follows_stock_movements(self):
+        services.post_movement(self.above.pk, 'OUT', 1)
+        services.post_movement(self.at.pk, 'IN', 1)
+        self.above.refresh_from_db()
+        self.at.refresh_from_db()
+        self.assertEqual((self.above.is_low_stock, self.at.is_low_stock), (True, False))
 
-# Create your tests here.
+    def test_summary_lists_low_stock_items(self):
+        response = self.client.get(reverse('inventory-summary'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['low_stock_count'], 2)
+        alerts = response.data['low_stock_alerts']
+        self.assertEqual([row['item_name'] for row in alerts['results']], ['Bolts', 'Nails'])
+        self.assertIsNone(alerts['next'])
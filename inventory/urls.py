@@ -2,11 +2,17 @@ from django.urls import path
 from .views import (
     InventoryListCreateView,
     InventoryDetailView,
-    InventorySummaryView
+    InventorySummaryView,
+    InventoryImportView,
+    InventorySearchView,
+    StockForecastListView
 )
 
 urlpatterns = [
     path('', InventoryListCreateView.as_view(), name='inventory-list-create'),
     path('<int:id>/', InventoryDetailView.as_view(), name='inventory-detail'),
+    path('search/', InventorySearchView.as_view(), name='inventory-search'),
+    path('import/', InventoryImportView.as_view(), name='inventory-import'),
+    path('forecast/', StockForecastListView.as_view(), name='inventory-forecast'),
     path('summary/', InventorySummaryView.as_view(), name='inventory-summary'),
 ]
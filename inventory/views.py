@@ -4,34 +4,154 @@ from django.shortcuts import render
 from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, F
+from dashboard.conditional import ConditionalGetMixin
+from dashboard.idempotency import IdempotencyMixin
+from django.db.models import Sum
+from abv_management.pagination import KeysetPagination
+from abv_management.fieldsets import SparseFieldsetMixin
 from .models import Inventory
-from .serializers import InventorySerializer
+from dashboard.utils import parse_moment_param
+from transaction import snapshots
+from transaction.models import InventorySnapshot, StockForecast, Transaction
+from transaction.serializers import StockForecastSerializer
+from .serializers import InventoryAsOfSerializer, InventorySerializer
+from .importers import InventoryImporter
+from . import search
+from abv_management.bulk_import import BulkImportView
 
-class InventoryListCreateView(generics.ListCreateAPIView):
+class StockAsOfMixin:
+    """?as_of=<date or datetime> on GET: quantities rebuilt from InventorySnapshot checkpoints."""
+
+    def get_as_of(self):
+        if self.request.method != 'GET':
+            return None
+        if not hasattr(self, '_as_of'):
+            self._as_of = parse_moment_param(self.request.query_params, 'as_of')
+        return self._as_of
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        moment = self.get_as_of()
+        if moment is not None:
+            queryset = snapshots.with_stock_as_of(queryset, moment)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.get_as_of() is not None:
+            return InventoryAsOfSerializer
+        return super().get_serializer_class()
+
+
+class InventoryListCreateView(IdempotencyMixin, StockAsOfMixin, SparseFieldsetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Inventory.objects.all()
     serializer_class = InventorySerializer
     permission_classes = [IsAuthenticated]
+    conditional_models = [Inventory]
+
+    def get_conditional_models(self):
+        models = super().get_conditional_models()
+        if self.get_as_of() is not None:
+            models = [*models, Transaction, InventorySnapshot]
+        return models
+
+class InventoryImportView(BulkImportView):
+    importer_class = InventoryImporter
 
-class InventoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class InventoryDetailView(StockAsOfMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Inventory.objects.all()
     serializer_class = InventorySerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
 
+class LowStockPagination(KeysetPagination):
+    ordering_field = 'id'
+    page_size_query_param = 'low_stock_limit'
+    cursor_query_param = 'low_stock_cursor'
+
+
+class CriticalItemsPagination(KeysetPagination):
+    ordering_field = 'id'
+    page_size_query_param = 'critical_limit'
+    cursor_query_param = 'critical_cursor'
+
+
 class InventorySummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    def paginated(self, paginator, queryset, request):
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(InventorySerializer(page, many=True).data).data
+
     def get(self, request):
         total_stock = Inventory.objects.aggregate(total=Sum('quantity'))['total'] or 0
-        low_stock_items = Inventory.objects.filter(quantity__lte=F('quantity') * 0.2)
+        # quantity <= reorder_level, read through the partial inventory_low_stock_idx index
+        low_stock_items = Inventory.objects.filter(is_low_stock=True)
         critical_items = Inventory.objects.filter(status='critical')
-        low_stock_data = InventorySerializer(low_stock_items, many=True).data
-        critical_data = InventorySerializer(critical_items, many=True).data
 
         return Response({
             "total_stock": total_stock,
-            "low_stock_alerts": low_stock_data,
-            "critical_items": critical_data
+            "low_stock_count": low_stock_items.count(),
+            "critical_count": critical_items.count(),
+            "low_stock_alerts": self.paginated(LowStockPagination(), low_stock_items, request),
+            "critical_items": self.paginated(CriticalItemsPagination(), critical_items, request),
+        })
+
+
+class StockForecastListView(ConditionalGetMixin, generics.ListAPIView):
+    """Items by days to stockout, soonest first; ?within=N keeps those running out in N days."""
+
+    serializer_class = StockForecastSerializer
+    permission_classes = [IsAuthenticated]
+    conditional_models = [StockForecast, Inventory]
+
+    def get_queryset(self):
+        queryset = (
+            StockForecast.objects
+            .filter(days_to_stockout__isnull=False)
+            .select_related('item')
+            .order_by('days_to_stockout', 'item_id')
+        )
+        within = self.request.query_params.get('within')
+        if within is not None:
+            try:
+                queryset = queryset.filter(days_to_stockout__lte=float(within))
+            except ValueError:
+                raise ValidationError({"within": "Must be a number of days."})
+        return queryset
+
+
+class InventorySearchView(APIView):
+    """?q=cem gre&category=Materials&limit=20&offset=0 -> ranked matches plus category facets."""
+
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    def get_int_param(self, name, default, maximum=None):
+        raw = self.request.query_params.get(name)
+        if raw is None:
+            return default
+        if not raw.isdigit():
+            raise ValidationError({name: "Must be a non-negative integer."})
+        return min(int(raw), maximum) if maximum else int(raw)
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        if not search.query_terms(query):
+            raise ValidationError({"q": "Enter at least one word to search for."})
+        limit = max(1, self.get_int_param('limit', self.default_limit, self.max_limit))
+        offset = self.get_int_param('offset', 0)
+
+        result = search.get_backend().search(
+            query, category=request.query_params.get('category'), limit=limit, offset=offset
+        )
+        return Response({
+            "count": result.count,
+            "results": [
+                {**InventorySerializer(item).data, "rank": rank}
+                for item, rank in result.results
+            ],
+            "facets": {"category": result.facets},
         })
@@ -1,2 +1,6 @@
 from django.contrib import admin
 
+from .models import IngestBatch, MaintenanceDue
+
+admin.site.register(IngestBatch)
+admin.site.register(MaintenanceDue)
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from abv_management.bulk_import import BulkImporter
+from dashboard import rollups, utilization, versions
+from equipment.models import Equipment
+
+from .models import OperationRecord
+
+EQUIPMENT_IDS_CACHE_KEY = 'operations:equipment-ids'
+
+
+def equipment_ids():
+    """Every Equipment id, cached until the next Equipment write."""
+    version, _ = versions.current(Equipment)[Equipment._meta.label]
+    key = f'{EQUIPMENT_IDS_CACHE_KEY}:{version}'
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Equipment.objects.values_list('id', flat=True))
+        cache.set(key, ids, getattr(settings, 'EQUIPMENT_IDS_CACHE_TIMEOUT', 300))
+    return ids
+
+
+class OperationRecordImporter(BulkImporter):
+    model = OperationRecord
+    fields = (
+        'equipment',
+        'operator',
+        'date',
+        'hours_used',
+        'activity',
+        'status',
+    )
+    chunk_size = 2000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One lookup per batch instead of ForeignKey.validate()'s query per row.
+        self.equipment_ids = equipment_ids()
+
+    def clean_value(self, field, raw):
+        if field.name != 'equipment':
+            return super().clean_value(field, raw)
+        value = field.to_python(raw)
+        if value not in self.equipment_ids:
+            raise ValidationError(f"Equipment {raw} does not exist.")
+        return value
+
+    def insert(self, rows):
+        super().insert(rows)
+        # Raw inserts skip the rollup receivers in dashboard.signals.
+        rollups.record_operations([row['date'] for row in rows])
+        utilization.record_operations([(row['equipment_id'], row['date'], row['hours_used']) for row in rows])
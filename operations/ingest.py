@@ -0,0 +1,88 @@
+"""
+Accept-then-persist ingestion of OperationRecord batches.
+
+``accept`` stores the raw body as an IngestBatch row and returns at once;
+the batch is written on a small background pool after the request's
+transaction commits, in one transaction of its own, so a batch that fails
+is recorded as failed with none of its rows written. A batch left pending or running by a restarted
+process is picked up again by the process_ingest_batches command.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from abv_management.bulk_import import READERS, RowError, read_json_array
+
+from .importers import OperationRecordImporter
+from .models import IngestBatch
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The bounded pool background batches are written on."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'OPERATION_INGEST_WORKERS', 1),
+                    thread_name_prefix='operation-ingest',
+                )
+    return _executor
+
+
+def batch_rows(batch):
+    if batch.format != 'json':
+        return READERS[batch.format](batch.payload.splitlines(keepends=True))
+    try:
+        items = json.loads(batch.payload)
+    except ValueError as exc:
+        return iter([(1, RowError({"non_field_errors": [f"Invalid JSON: {exc}"]}))])
+    if not isinstance(items, list):
+        return iter([(1, RowError({"non_field_errors": ["Expected a JSON array of objects."]}))])
+    return read_json_array(items)
+
+
+def process_batch(batch_id, chunk_size=None):
+    """Write one pending batch; returns the finished IngestBatch, or None if another worker took it."""
+    claimed = IngestBatch.objects.filter(pk=batch_id, status='pending').update(status='running')
+    if not claimed:
+        return None
+    batch = IngestBatch.objects.get(pk=batch_id)
+    try:
+        # All or nothing, like the synchronous path: a failed batch leaves no rows behind.
+        with transaction.atomic():
+            report = OperationRecordImporter(chunk_size=chunk_size).run_rows(batch_rows(batch))
+    except Exception as exc:
+        logger.exception("Operation ingest batch %s failed", batch_id)
+        batch.status, batch.report = 'failed', {"detail": str(exc)}
+    else:
+        batch.status, batch.report, batch.payload = 'done', report.as_dict(), ''
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=['status', 'report', 'payload', 'finished_at'])
+    return batch
+
+
+def _run_in_background(batch_id, chunk_size):
+    close_old_connections()
+    try:
+        process_batch(batch_id, chunk_size)
+    finally:
+        close_old_connections()
+
+
+def accept(payload, format, user=None, chunk_size=None):
+    """Store ``payload`` (text) as a pending batch and schedule it; returns the IngestBatch."""
+    batch = IngestBatch.objects.create(format=format, payload=payload, user=user)
+    transaction.on_commit(lambda: get_executor().submit(_run_in_background, batch.pk, chunk_size))
+    return batch
@@ -0,0 +1,148 @@
+"""
+Service due dates from operating hours, computed set-based per chunk of machines.
+
+For a chunk of machines one query returns each machine's last completed
+service and the sum, first date and last date of the operating hours
+logged after it, the latter as correlated aggregates that range-scan the
+(equipment, date) index from the service date on. The due date extends
+that period's average daily use until MAINTENANCE_SERVICE_INTERVAL_HOURS
+is reached. Projections more than PROJECTION_HORIZON_DAYS past the last
+logged day (a trickle of hours long after a service) are left null.
+
+Runs are incremental: a machine is recomputed only when it has operation
+or maintenance rows newer than the ids its MaintenanceDue row recorded.
+Edits and deletes of old rows do not move those ids, so run with
+``full=True`` after correcting history or changing the interval.
+"""
+
+import math
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dashboard import versions
+from equipment.models import Equipment
+
+from .models import MaintenanceDue, MaintenanceRecord, OperationRecord
+
+CHUNK_SIZE = 500
+HUNDREDTH = Decimal('0.01')
+PROJECTION_HORIZON_DAYS = 100 * 366
+
+
+def service_interval():
+    return Decimal(str(getattr(settings, 'MAINTENANCE_SERVICE_INTERVAL_HOURS', 250)))
+
+
+def stale_equipment_ids(full=False):
+    """Ids of machines whose MaintenanceDue row is missing or behind their newest records."""
+    machines = Equipment.objects.order_by('pk')
+    if full:
+        return list(machines.values_list('pk', flat=True))
+    newest_operation = OperationRecord.objects.filter(equipment=OuterRef('pk')).order_by('-id').values('id')[:1]
+    newest_maintenance = MaintenanceRecord.objects.filter(equipment=OuterRef('pk')).order_by('-id').values('id')[:1]
+    return list(
+        machines
+        .annotate(
+            newest_operation=Coalesce(Subquery(newest_operation), 0),
+            newest_maintenance=Coalesce(Subquery(newest_maintenance), 0),
+        )
+        .filter(
+            Q(maintenance_due__isnull=True)
+            | Q(newest_operation__gt=F('maintenance_due__last_operation_id'))
+            | Q(newest_maintenance__gt=F('maintenance_due__last_maintenance_id'))
+        )
+        .values_list('pk', flat=True)
+    )
+
+
+def since_service(aggregate):
+    """``aggregate`` over a machine's operation records after its last service (range scan per machine)."""
+    return Subquery(
+        OperationRecord.objects
+        .filter(equipment=OuterRef('pk'), date__gt=OuterRef('since'))
+        .order_by()
+        .values('equipment')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+def usage_since_service(ids):
+    """One row per machine in ``ids``: last service, hours after it and the dates they span."""
+    last_service = (
+        MaintenanceRecord.objects
+        .filter(equipment=OuterRef('pk'), status='completed')
+        .order_by('-performed_at')
+        .values('performed_at')[:1]
+    )
+    newest_operation = OperationRecord.objects.filter(equipment=OuterRef('pk')).order_by('-id').values('id')[:1]
+    newest_maintenance = MaintenanceRecord.objects.filter(equipment=OuterRef('pk')).order_by('-id').values('id')[:1]
+    return (
+        Equipment.objects
+        .filter(pk__in=ids)
+        .annotate(
+            last_service=Subquery(last_service),
+            since=Coalesce(F('last_service'), Value(date.min)),
+        )
+        .annotate(
+            hours=since_service(Sum('hours_used')),
+            first_date=since_service(Min('date')),
+            last_date=since_service(Max('date')),
+            newest_operation=Subquery(newest_operation),
+            newest_maintenance=Subquery(newest_maintenance),
+        )
+        .values('pk', 'last_service', 'hours', 'first_date', 'last_date', 'newest_operation', 'newest_maintenance')
+    )
+
+
+def project(row, interval, now):
+    hours = (row['hours'] or Decimal(0)).quantize(HUNDREDTH)
+    remaining = interval - hours
+    rate = due_date = None
+    if hours > 0:
+        start = row['last_service'] + timedelta(days=1) if row['last_service'] else row['first_date']
+        days = max((row['last_date'] - start).days + 1, 1)
+        rate = float(hours) / days
+        days_left = math.ceil(float(remaining) / rate)
+        # Also keeps the date arithmetic clear of date.max.
+        if days_left <= PROJECTION_HORIZON_DAYS:
+            due_date = row['last_date'] + timedelta(days=days_left)
+    return MaintenanceDue(
+        equipment_id=row['pk'],
+        last_service=row['last_service'],
+        hours_since_service=hours,
+        average_daily_hours=rate,
+        hours_remaining=remaining,
+        due_date=due_date,
+        last_operation_id=row['newest_operation'] or 0,
+        last_maintenance_id=row['newest_maintenance'] or 0,
+        computed_at=now,
+    )
+
+
+def update_maintenance_due(full=False, now=None):
+    """Recompute MaintenanceDue for stale machines (every machine with ``full``); returns how many."""
+    now = now or timezone.now()
+    interval = service_interval()
+    ids = stale_equipment_ids(full)
+    for offset in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[offset:offset + CHUNK_SIZE]
+        with transaction.atomic():
+            MaintenanceDue.objects.bulk_create(
+                [project(row, interval, now) for row in usage_since_service(chunk)],
+                update_conflicts=True,
+                unique_fields=['equipment'],
+                update_fields=[
+                    'last_service', 'hours_since_service', 'average_daily_hours', 'hours_remaining',
+                    'due_date', 'last_operation_id', 'last_maintenance_id', 'computed_at',
+                ],
+            )
+    if ids:
+        versions.bump(MaintenanceDue)
+    return len(ids)
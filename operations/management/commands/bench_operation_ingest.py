@@ -0,0 +1,89 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from abv_management.bulk_import import read_json_array, read_jsonl
+from equipment.models import Equipment
+from operations.importers import OperationRecordImporter
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure sustained OperationRecord ingest in records per second. "
+        "Everything is written inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=100_000)
+        parser.add_argument('--equipment', type=int, default=200)
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--chunk-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _records(self, options, equipment_ids):
+        rng = random.Random(0)
+        start = date.today() - timedelta(days=options['days'])
+        return [
+            {
+                "equipment": rng.choice(equipment_ids),
+                "operator": f"operator-{rng.randrange(50)}",
+                "date": (start + timedelta(days=rng.randrange(options['days']))).isoformat(),
+                "hours_used": f"{rng.randrange(1, 1200) / 100:.2f}",
+                "activity": "bench",
+                "status": rng.choice(("completed", "pending")),
+            }
+            for _ in range(options['records'])
+        ]
+
+    def _time(self, label, count, func):
+        began = time.perf_counter()
+        report = func()
+        elapsed = time.perf_counter() - began
+        self.stdout.write(
+            f"{label:<28} {report.created:>9} rows in {elapsed:6.2f}s  {count / elapsed:>10,.0f} records/s"
+        )
+
+    def _run(self, options):
+        fleet = Equipment.objects.bulk_create(
+            Equipment(
+                equipment_name=f"bench-{n}",
+                serial_number=f"bench-{n}",
+                equipment_type="bench",
+                purchase_date=date.today() - timedelta(days=options['days'] + 1),
+                purchase_cost=0,
+                status="Available",
+            )
+            for n in range(options['equipment'])
+        )
+        records = self._records(options, [equipment.id for equipment in fleet])
+        body = json.dumps(records)
+        lines = [json.dumps(record) + '\n' for record in records]
+        count = len(records)
+
+        self._time(
+            "JSON array",
+            count,
+            lambda: OperationRecordImporter(chunk_size=options['chunk_size']).run_rows(
+                read_json_array(json.loads(body))
+            ),
+        )
+        self._time(
+            "JSON Lines",
+            count,
+            lambda: OperationRecordImporter(chunk_size=options['chunk_size']).run_rows(read_jsonl(lines)),
+        )
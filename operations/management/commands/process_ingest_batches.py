@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from operations import ingest
+from operations.models import IngestBatch
+
+
+class Command(BaseCommand):
+    help = "Write OperationRecord batches still pending, e.g. after a restart dropped the background pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requeue-running',
+            action='store_true',
+            help="Also retry batches marked running. Only use this while no server process is writing batches.",
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_running']:
+            IngestBatch.objects.filter(status='running').update(status='pending')
+        done = 0
+        for batch_id in IngestBatch.objects.filter(status='pending').order_by('id').values_list('id', flat=True):
+            batch = ingest.process_batch(batch_id)
+            if batch is not None:
+                done += 1
+                report = batch.report or {}
+                self.stdout.write(
+                    f"batch {batch.pk}: {batch.status}, {report.get('created', 0)} created, "
+                    f"{report.get('failed', 0)} rejected"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Processed {done} batch(es)."))
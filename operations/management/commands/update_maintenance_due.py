@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from operations import maintenance
+
+
+class Command(BaseCommand):
+    help = "Recompute service due dates for machines with new operation or maintenance records."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Recompute every machine, e.g. after editing old records or changing the service interval.",
+        )
+
+    def handle(self, *args, **options):
+        updated = maintenance.update_maintenance_due(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} maintenance projection(s)."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+        ('operations', '0003_operationrecord_activity_operationrecord_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(fields=['equipment', 'performed_at', 'status'], name='maint_equip_date_status_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+        ('operations', '0004_maintenancerecord_equipment_date_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operationrecord',
+            index=models.Index(fields=['timestamp', 'id'], name='operation_timestamp_idx'),
+        ),
+    ]
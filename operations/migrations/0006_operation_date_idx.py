@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+        ('operations', '0005_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operationrecord',
+            index=models.Index(fields=['date', 'id'], name='operation_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+        ('operations', '0007_ingest_batch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operationrecord',
+            index=models.Index(fields=['equipment', 'date', 'id'], name='operation_equip_date_idx'),
+        ),
+    ]
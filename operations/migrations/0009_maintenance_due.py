@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+        ('operations', '0008_operation_equip_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenanceDue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_service', models.DateField(blank=True, null=True)),
+                ('hours_since_service', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('average_daily_hours', models.FloatField(blank=True, null=True)),
+                ('hours_remaining', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('last_operation_id', models.PositiveBigIntegerField(default=0)),
+                ('last_maintenance_id', models.PositiveBigIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('equipment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_due', to='equipment.equipment')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['due_date', 'equipment'], name='maintenance_due_date_idx'), models.Index(fields=['hours_remaining'], name='maintenance_due_hours_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from equipment.models import Equipment
 
@@ -11,6 +12,14 @@ class OperationRecord(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=[('completed', 'Completed'), ('pending', 'Pending')])
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='operation_timestamp_idx'),
+            models.Index(fields=['date', 'id'], name='operation_date_idx'),
+            # Latest records per machine (equipment detail history).
+            models.Index(fields=['equipment', 'date', 'id'], name='operation_equip_date_idx'),
+        ]
+
     
 class MaintenanceRecord(models.Model):
     equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE)
@@ -18,3 +27,66 @@ class MaintenanceRecord(models.Model):
     performed_at = models.DateField()
     status = models.CharField(max_length=20, choices=[('completed', 'Completed'), ('pending', 'Pending')])
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['equipment', 'performed_at', 'status'], name='maint_equip_date_status_idx'),
+        ]
+
+
+
+class MaintenanceDue(models.Model):
+    """Service projection for one machine, kept current by the update_maintenance_due job.
+
+    ``hours_since_service`` sums operating hours after the last completed
+    MaintenanceRecord. ``due_date`` extends that period's average daily use
+    until MAINTENANCE_SERVICE_INTERVAL_HOURS is reached (in the past when
+    ``hours_remaining`` is negative), and is null for machines not in use or
+    so lightly used that the date lies beyond the projection horizon.
+    The ``last_*_id`` columns record the newest rows already counted.
+    """
+
+    equipment = models.OneToOneField(Equipment, on_delete=models.CASCADE, related_name='maintenance_due')
+    last_service = models.DateField(null=True, blank=True)
+    hours_since_service = models.DecimalField(max_digits=12, decimal_places=2)
+    average_daily_hours = models.FloatField(null=True, blank=True)
+    hours_remaining = models.DecimalField(max_digits=12, decimal_places=2)
+    due_date = models.DateField(null=True, blank=True)
+    last_operation_id = models.PositiveBigIntegerField(default=0)
+    last_maintenance_id = models.PositiveBigIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['due_date', 'equipment'], name='maintenance_due_date_idx'),
+            models.Index(fields=['hours_remaining'], name='maintenance_due_hours_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_id} due {self.due_date}"
+
+
+class IngestBatch(models.Model):
+    """An OperationRecord batch accepted with 202 and written in the background (see operations.ingest)."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    format = models.CharField(max_length=5)  # csv, jsonl or json
+    payload = models.TextField(blank=True)  # cleared once the batch has been written
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    report = models.JSONField(null=True, blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='ingest_batch_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ingest batch {self.pk} ({self.status})"
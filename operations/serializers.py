@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
+from .models import IngestBatch, MaintenanceDue, OperationRecord, MaintenanceRecord
+
+
+class OperationRecordSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = OperationRecord
+        fields = '__all__'
+
+
+class MaintenanceRecordSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = MaintenanceRecord
+        fields = '__all__'
+
+
+class IngestBatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IngestBatch
+        fields = ['id', 'format', 'status', 'report', 'created_at', 'finished_at']
+
+
+class MaintenanceDueSerializer(serializers.ModelSerializer):
+    equipment_name = serializers.CharField(source='equipment.equipment_name', read_only=True)
+    overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MaintenanceDue
+        fields = [
+            'equipment', 'equipment_name', 'last_service', 'hours_since_service', 'hours_remaining',
+            'average_daily_hours', 'due_date', 'overdue', 'computed_at',
+        ]
+
+    def get_overdue(self, obj):
+        return obj.hours_remaining <= 0
@@ -1,3 +1,130 @@
-from django.test import TestCase
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from equipment.models import Equipment
+
+from . import ingest
+from .importers import OperationRecordImporter
+from .maintenance import update_maintenance_due
+from .models import IngestBatch, MaintenanceDue, MaintenanceRecord, OperationRecord
+
+
+@override_settings(MAINTENANCE_SERVICE_INTERVAL_HOURS=250)
+class MaintenanceDueTests(TestCase):
+    def machine(self, name):
+        return Equipment.objects.create(
+            equipment_name=name, serial_number=name, equipment_type='Loader', status='In Use',
+            purchase_date=date(2020, 1, 1), purchase_cost=Decimal(1000),
+        )
+
+    def log(self, machine, day, hours):
+        OperationRecord.objects.create(
+            equipment=machine, operator='Kim', date=day, hours_used=Decimal(hours),
+            activity='Hauling', status='completed',
+        )
+
+    def test_due_date_extends_average_daily_use(self):
+        machine = self.machine('Busy')
+        MaintenanceRecord.objects.create(equipment=machine, description='Service', performed_at=date(2024, 1, 1), status='completed')
+        self.log(machine, date(2024, 1, 2), '10')
+        self.log(machine, date(2024, 1, 11), '40')
+        update_maintenance_due(full=True)
+        due = MaintenanceDue.objects.get(equipment=machine)
+        self.assertEqual(due.hours_remaining, Decimal('200.00'))
+        self.assertEqual(due.average_daily_hours, 5.0)
+        self.assertEqual(due.due_date, date(2024, 2, 20))
+
+    def test_negligible_use_leaves_due_date_empty(self):
+        # 0.01 h over decades projects millions of years out, past date.max.
+        idle = self.machine('Idle')
+        MaintenanceRecord.objects.create(equipment=idle, description='Service', performed_at=date(1990, 1, 1), status='completed')
+        self.log(idle, date(2024, 1, 1), '0.01')
+        busy = self.machine('Busy')
+        self.log(busy, date(2024, 1, 1), '5')
+
+        self.assertEqual(update_maintenance_due(full=True), 2)
+        idle_due = MaintenanceDue.objects.get(equipment=idle)
+        self.assertIsNone(idle_due.due_date)
+        self.assertEqual(idle_due.hours_since_service, Decimal('0.01'))
+        self.assertIsNotNone(MaintenanceDue.objects.get(equipment=busy).due_date)
+
+
+class OperationIngestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='foreman', email='foreman@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.machine = Equipment.objects.create(
+            equipment_name='Loader', serial_number='L-1', equipment_type='Loader', status='In Use',
+            purchase_date=date(2020, 1, 1), purchase_cost=Decimal(1000),
+        )
+        self.url = reverse('operation-record-ingest')
+
+    def csv(self, *hours):
+        lines = ['equipment,operator,date,hours_used,activity,status']
+        lines += [f'{self.machine.pk},Kim,2024-01-0{i + 1},{value},Hauling,completed' for i, value in enumerate(hours)]
+        return '\n'.join(lines) + '\n'
+
+    def post(self, body, query='', content_type='text/csv'):
+        return self.client.post(f'{self.url}?{query}', data=body, content_type=content_type)
+
+    def test_sync_ingest_reports_rejected_rows(self):
+        response = self.post(self.csv('4.5', 'lots', '2'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {key: response.data[key] for key in ('rows', 'created', 'failed')}, {'rows': 3, 'created': 2, 'failed': 1}
+        )
+        self.assertEqual([error['line'] for error in response.data['errors']], [3])
+        self.assertEqual(sorted(OperationRecord.objects.values_list('hours_used', flat=True)), [Decimal('2'), Decimal('4.5')])
+
+    def test_sync_ingest_unknown_equipment_is_a_row_error(self):
+        body = json.dumps([{"equipment": 999, "operator": "Kim", "date": "2024-01-01", "hours_used": "1",
+                            "activity": "Hauling", "status": "completed"}])
+        response = self.post(body, content_type='application/json')
+        self.assertEqual((response.status_code, response.data['failed']), (200, 1))
+        self.assertFalse(OperationRecord.objects.exists())
+
+    def test_async_ingest_is_written_by_the_worker(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.post(self.csv('1', '2', '3'), 'async=1')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(OperationRecord.objects.exists())
+
+        batch = ingest.process_batch(response.data['id'])
+        self.assertEqual((batch.status, batch.report['created']), ('done', 3))
+        self.assertEqual(OperationRecord.objects.count(), 3)
+        self.assertEqual(self.client.get(response['Location']).data['status'], 'done')
+        self.assertIsNone(ingest.process_batch(batch.pk))
+
+    def test_failed_batch_writes_nothing(self):
+        batch = IngestBatch.objects.create(format='csv', payload=self.csv('1', '2', '3'), user=self.user)
+        original = OperationRecordImporter.insert
+        calls = []
+
+        def fail_second_chunk(importer, rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError("disk full")
+            original(importer, rows)
+
+        with mock.patch.object(OperationRecordImporter, 'insert', fail_second_chunk), self.assertLogs(ingest.logger):
+            batch = ingest.process_batch(batch.pk, chunk_size=1)
+        self.assertEqual(batch.status, 'failed')
+        self.assertFalse(OperationRecord.objects.exists())
+
+    def test_invalid_encoding_is_rejected(self):
+        body = self.csv('1').encode() + b'\xff\xfe broken\n'
+        for query in ('', 'async=1'):
+            self.assertEqual(self.post(body, query).status_code, 400, query)
+        self.assertFalse(OperationRecord.objects.exists())
+        self.assertFalse(IngestBatch.objects.exists())
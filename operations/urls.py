@@ -0,0 +1,16 @@
+from django.urls import path
+from .views import (
+    OperationRecordListCreateView,
+    OperationRecordExportView,
+    OperationRecordIngestView,
+    IngestBatchDetailView,
+    MaintenanceDueListView,
+)
+
+urlpatterns = [
+    path('records/', OperationRecordListCreateView.as_view(), name='operation-record-list'),
+    path('records/ingest/', OperationRecordIngestView.as_view(), name='operation-record-ingest'),
+    path('records/ingest/<int:pk>/', IngestBatchDetailView.as_view(), name='operation-ingest-batch'),
+    path('maintenance/due/', MaintenanceDueListView.as_view(), name='maintenance-due'),
+    path('records/export/', OperationRecordExportView.as_view(), name='operation-record-export'),
+]
@@ -1,3 +1,109 @@
 from django.shortcuts import render
 
 # Create your views here.
+from datetime import timedelta
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.timezone import localdate
+from abv_management.bulk_import import BulkImportView
+from abv_management.export import BulkExportView
+from abv_management.pagination import KeysetPagination
+from dashboard.conditional import DailyConditionalGetMixin
+from dashboard.idempotency import IdempotencyMixin
+from equipment.models import Equipment
+from .models import IngestBatch, MaintenanceDue, OperationRecord
+from .serializers import IngestBatchSerializer, MaintenanceDueSerializer, OperationRecordSerializer
+from .importers import OperationRecordImporter
+from . import ingest
+
+
+class OperationRecordListCreateView(IdempotencyMixin, generics.ListCreateAPIView):
+    queryset = OperationRecord.objects.all()
+    serializer_class = OperationRecordSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering_field = 'timestamp'
+
+
+class OperationRecordIngestView(IdempotencyMixin, BulkImportView):
+    """POST many OperationRecords as a JSON array, JSON Lines or CSV.
+
+    The synchronous path writes the whole body in one transaction, so a
+    batch that fails part-way commits nothing and can be retried as is.
+    ?async=1 stores the batch and answers 202 at once with a status URL;
+    the records are written in the background.
+    """
+
+    importer_class = OperationRecordImporter
+
+    def post(self, request):
+        if request.query_params.get('async') not in ('1', 'true', 'yes'):
+            with transaction.atomic():
+                return super().post(request)
+        format = self.get_format(request)
+        chunk_size = self.get_chunk_size(request)
+        try:
+            payload = request.body.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ValidationError({"non_field_errors": ["The body is not valid UTF-8."]})
+        batch = ingest.accept(payload, format, user=request.user, chunk_size=chunk_size)
+        url = reverse('operation-ingest-batch', kwargs={'pk': batch.pk})
+        return Response(
+            {"id": batch.pk, "status": batch.status, "url": request.build_absolute_uri(url)},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': url},
+        )
+
+
+class IngestBatchDetailView(generics.RetrieveAPIView):
+    serializer_class = IngestBatchSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        batches = IngestBatch.objects.defer('payload')
+        if not self.request.user.is_staff:
+            batches = batches.filter(user=self.request.user)
+        return batches
+
+
+class MaintenanceDueListView(DailyConditionalGetMixin, generics.ListAPIView):
+    """Machines past their service interval or projected to reach it within ?within=N days (default 14)."""
+
+    serializer_class = MaintenanceDueSerializer
+    permission_classes = [IsAuthenticated]
+    conditional_models = [MaintenanceDue, Equipment]
+    default_within = 14
+
+    def get_queryset(self):
+        within = self.request.query_params.get('within', str(self.default_within))
+        if not within.isdigit():
+            raise ValidationError({"within": "Must be a non-negative number of days."})
+        cutoff = localdate() + timedelta(days=int(within))
+        return (
+            MaintenanceDue.objects
+            .filter(Q(hours_remaining__lte=0) | Q(due_date__lte=cutoff))
+            .select_related('equipment')
+            .order_by('due_date', 'equipment_id')
+        )
+
+
+class OperationRecordExportView(BulkExportView):
+    queryset = OperationRecord.objects.all()
+    date_field = 'date'
+    filename = 'operation-records'
+    export_columns = {
+        'id': 'id',
+        'date': 'date',
+        'equipment': 'equipment_id',
+        'equipment_name': 'equipment__equipment_name',
+        'operator': 'operator',
+        'hours_used': 'hours_used',
+        'activity': 'activity',
+        'status': 'status',
+        'timestamp': 'timestamp',
+    }
@@ -1,7 +1,14 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from .models import Project
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'user': ('users.serializers.UserSerializer', {}),
+        'equipment': ('equipment.serializers.EquipmentSerializer', {'many': True}),
+        'inventory': ('inventory.serializers.InventorySerializer', {'many': True}),
+    }
+
     class Meta:
         model = Project
         fields = '__all__'  # This includes every field in the model
\ No newline at end of file
@@ -1,10 +1,12 @@
 from django.shortcuts import render
 
 from rest_framework import viewsets
+from abv_management.fieldsets import SparseFieldsetMixin
+from dashboard.idempotency import IdempotencyMixin
 from .models import Project
 from .serializers import ProjectSerializer
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(IdempotencyMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
 
@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from .models import Report
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'generated_by': ('users.serializers.UserSerializer', {}),
+    }
+
     class Meta:
         model = Report
         fields = '__all__'
@@ -1,9 +1,11 @@
 from django.shortcuts import render
 from rest_framework import viewsets
+from abv_management.fieldsets import SparseFieldsetMixin
+from dashboard.idempotency import IdempotencyMixin
 from .models import Report
 from .serializers import ReportSerializer
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportViewSet(IdempotencyMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
 # Create your views here.
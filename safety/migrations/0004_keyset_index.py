@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('safety', '0003_rename_safety_safetyincident'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='safetyincident',
+            index=models.Index(fields=['created_at', 'id'], name='safety_created_at_idx'),
+        ),
+    ]
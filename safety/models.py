@@ -24,6 +24,11 @@ class SafetyIncident(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='safety_created_at_idx'),
+        ]
+
     def __str__(self):
         return f"{self.incident_date} - {self.incident_status}"
     
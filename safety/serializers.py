@@ -1,8 +1,13 @@
 from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
 from .models import  SafetyIncident  
 
 
-class SafetyIncidentSerializer(serializers.ModelSerializer):
+class SafetyIncidentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'reported_by': ('users.serializers.UserSerializer', {}),
+    }
+
     class Meta:
         model = SafetyIncident
         fields = '__all__'
@@ -2,10 +2,15 @@ from django.shortcuts import render
 from rest_framework import viewsets
 from .models import SafetyIncident
 from .serializers import SafetyIncidentSerializer
+from abv_management.pagination import KeysetPagination
+from abv_management.fieldsets import SparseFieldsetMixin
+from dashboard.idempotency import IdempotencyMixin
 
 def profile(request):
     return render(request, "account/profile.html")
 
-class SafetyIncidentViewSet(viewsets.ModelViewSet):
+class SafetyIncidentViewSet(IdempotencyMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = SafetyIncident.objects.all()
     serializer_class = SafetyIncidentSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering_field = 'created_at'
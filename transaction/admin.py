@@ -1,3 +1,43 @@
+from django import forms
 from django.contrib import admin
 
 # Register your models here.
+from . import services
+from .models import InventorySnapshot, StockForecast, Transaction
+
+
+class TransactionForm(forms.ModelForm):
+    class Meta:
+        model = Transaction
+        fields = ['item', 'transaction_type', 'quantity']
+
+    def clean(self):
+        cleaned = super().clean()
+        item = cleaned.get('item')
+        if cleaned.get('transaction_type') == 'OUT' and item and cleaned.get('quantity', 0) > item.quantity:
+            raise forms.ValidationError(f"Insufficient stock: {item.quantity} {item.unit} available.")
+        return cleaned
+
+
+@admin.register(Transaction)
+class TransactionAdmin(admin.ModelAdmin):
+    """Adds go through the posting service; posted movements are never edited or deleted."""
+
+    form = TransactionForm
+    list_display = ['timestamp', 'transaction_type', 'item', 'quantity', 'user']
+    list_filter = ['transaction_type']
+    list_select_related = ['item', 'user']
+
+    def save_model(self, request, obj, form, change):
+        posted = services.post_movement(obj.item_id, obj.transaction_type, obj.quantity, user=request.user)
+        obj.pk, obj.user, obj.timestamp = posted.pk, posted.user, posted.timestamp
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(InventorySnapshot)
+admin.site.register(StockForecast)
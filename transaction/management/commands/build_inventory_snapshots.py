@@ -0,0 +1,39 @@
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from transaction import snapshots
+
+
+class Command(BaseCommand):
+    help = "Write InventorySnapshot checkpoints up to now, and optionally compact old ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', choices=snapshots.INTERVALS, default='day')
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help="Backfill checkpoints from this date (YYYY-MM-DD) instead of the newest one.",
+        )
+        parser.add_argument(
+            '--compact-after',
+            type=int,
+            metavar='DAYS',
+            help="Thin checkpoints older than DAYS to one per item per --compact-interval.",
+        )
+        parser.add_argument('--compact-interval', choices=snapshots.INTERVALS, default='month')
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is not None:
+            since = timezone.make_aware(datetime.combine(since, time.min))
+        written = snapshots.build_snapshots(options['interval'], since=since)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} snapshot row(s)."))
+
+        if options['compact_after'] is not None:
+            if options['compact_after'] < 0:
+                raise CommandError("--compact-after must not be negative.")
+            cutoff = timezone.now() - timedelta(days=options['compact_after'])
+            deleted = snapshots.compact_snapshots(cutoff, options['compact_interval'])
+            self.stdout.write(self.style.SUCCESS(f"Compacted away {deleted} snapshot row(s)."))
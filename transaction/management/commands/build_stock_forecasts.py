@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from transaction import forecast
+
+
+class Command(BaseCommand):
+    help = "Recompute burn rates and days-to-stockout for every inventory item."
+
+    def handle(self, *args, **options):
+        written = forecast.build_forecasts()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} stock forecast(s)."))
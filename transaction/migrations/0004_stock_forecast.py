@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_search_index'),
+        ('transaction', '0003_inventory_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('computed_at', models.DateTimeField()),
+                ('burn_rate_7d', models.FloatField()),
+                ('burn_rate_30d', models.FloatField()),
+                ('burn_rate_90d', models.FloatField()),
+                ('days_to_stockout', models.FloatField(null=True)),
+                ('stockout_date', models.DateField(null=True)),
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='inventory.inventory')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['days_to_stockout', 'item'], name='forecast_stockout_idx')],
+            },
+        ),
+    ]
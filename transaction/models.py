@@ -16,5 +16,52 @@ class Transaction(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='transaction_timestamp_idx'),
+            models.Index(fields=['item', 'timestamp'], name='transaction_item_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.transaction_type} - {self.item.item_name}"
+
+
+class InventorySnapshot(models.Model):
+    """Stock of one item at a checkpoint: every Transaction before ``taken_at`` is included."""
+
+    item = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='snapshots')
+    taken_at = models.DateTimeField()
+    quantity = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item', 'taken_at'], name='unique_inventory_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"{self.item_id} @ {self.taken_at:%Y-%m-%d %H:%M}: {self.quantity}"
+
+
+class StockForecast(models.Model):
+    """Latest consumption forecast for one item, rewritten by the build_stock_forecasts job.
+
+    Burn rates are average OUT units per day over the trailing 7, 30 and 90
+    days. ``days_to_stockout`` divides current stock by the faster of the 7-
+    and 30-day rates, and is null for items that are not being consumed.
+    """
+
+    item = models.OneToOneField(Inventory, on_delete=models.CASCADE, related_name='forecast')
+    computed_at = models.DateTimeField()
+    burn_rate_7d = models.FloatField()
+    burn_rate_30d = models.FloatField()
+    burn_rate_90d = models.FloatField()
+    days_to_stockout = models.FloatField(null=True)
+    stockout_date = models.DateField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['days_to_stockout', 'item'], name='forecast_stockout_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.transaction_type} - {self.item.name}"
+        return f"{self.item_id}: {self.days_to_stockout} day(s) of stock"
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from abv_management.fieldsets import SparseFieldsetSerializerMixin
+from .models import StockForecast, Transaction
+
+
+class TransactionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'item': ('inventory.serializers.InventorySerializer', {}),
+        'user': ('users.serializers.UserSerializer', {}),
+    }
+
+    class Meta:
+        model = Transaction
+        fields = '__all__'
+        read_only_fields = ['user', 'timestamp']
+
+
+class StockMovementSerializer(serializers.Serializer):
+    """One IN/OUT movement to post; the item is checked by the posting UPDATE itself."""
+
+    item = serializers.IntegerField(min_value=1)
+    transaction_type = serializers.ChoiceField(choices=Transaction.TRANSACTION_TYPES)
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class StockForecastSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    item_name = serializers.CharField(source='item.item_name', read_only=True)
+    quantity = serializers.IntegerField(source='item.quantity', read_only=True)
+
+    class Meta:
+        model = StockForecast
+        fields = [
+            'item', 'item_name', 'quantity', 'burn_rate_7d', 'burn_rate_30d', 'burn_rate_90d',
+            'days_to_stockout', 'stockout_date', 'computed_at',
+        ]
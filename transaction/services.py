@@ -0,0 +1,128 @@
+"""
+Stock posting: every Transaction moves Inventory.quantity with it.
+
+Writes that set a quantity outright (bulk import upserts) record the
+difference with ``record_adjustments`` instead, so the Transaction log
+still accounts for every change to an item's stock.
+
+Each movement is one conditional UPDATE (``quantity = quantity - n WHERE
+quantity >= n`` for OUT), so the row lock is held only for that statement
+and concurrent stock-outs can never drive a quantity below zero.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from dashboard import versions
+from inventory.models import Inventory
+
+from .models import Transaction
+
+
+class StockError(Exception):
+    pass
+
+
+class UnknownItem(StockError):
+    def __init__(self, item_id):
+        self.item_id = item_id
+        super().__init__(f"Inventory item {item_id} does not exist.")
+
+
+class InsufficientStock(StockError):
+    def __init__(self, item_id, requested, available):
+        self.item_id = item_id
+        self.requested = requested
+        self.available = available
+        super().__init__(
+            f"Insufficient stock for item {item_id}: requested {requested}, available {available}."
+        )
+
+
+def apply_movement(item_id, transaction_type, quantity):
+    """Change the stored quantity for one movement, or raise a StockError."""
+    rows = Inventory.objects.filter(pk=item_id)
+    if transaction_type == 'OUT':
+        updated = rows.filter(quantity__gte=quantity).update(
+            quantity=F('quantity') - quantity, updated_at=timezone.now()
+        )
+    else:
+        updated = rows.update(quantity=F('quantity') + quantity, updated_at=timezone.now())
+
+    if not updated:
+        available = rows.values_list('quantity', flat=True).first()
+        if available is None:
+            raise UnknownItem(item_id)
+        raise InsufficientStock(item_id, quantity, available)
+
+
+@transaction.atomic
+def post_movement(item_id, transaction_type, quantity, user=None):
+    """Apply one movement and record its Transaction."""
+    apply_movement(item_id, transaction_type, quantity)
+    versions.bump(Inventory)
+    return Transaction.objects.create(
+        item_id=item_id,
+        transaction_type=transaction_type,
+        quantity=quantity,
+        user=user,
+    )
+
+
+def post_movements(movements, user=None, all_or_nothing=False):
+    """Apply many movements in order inside one database transaction.
+
+    ``movements`` is an iterable of dicts with ``item``, ``transaction_type``
+    and ``quantity``. Returns ``(posted, failures)`` where ``failures`` is a
+    list of ``(index, StockError)``. A rejected movement is rolled back on its
+    own savepoint unless ``all_or_nothing`` is set, in which case the first
+    failure is raised and nothing is posted.
+    """
+    accepted = []
+    failures = []
+    with transaction.atomic():
+        for index, movement in enumerate(movements):
+            try:
+                with transaction.atomic():
+                    apply_movement(movement['item'], movement['transaction_type'], movement['quantity'])
+            except StockError as exc:
+                if all_or_nothing:
+                    raise
+                failures.append((index, exc))
+                continue
+            accepted.append(Transaction(
+                item_id=movement['item'],
+                transaction_type=movement['transaction_type'],
+                quantity=movement['quantity'],
+                user=user,
+            ))
+
+        # bulk_create skips post_save, so bump the version stamps ourselves.
+        posted = Transaction.objects.bulk_create(accepted)
+        if posted:
+            versions.bump(Inventory, Transaction)
+    return posted, failures
+
+
+def record_adjustments(changes, user=None):
+    """Record an IN or OUT Transaction for each quantity that was set directly.
+
+    ``changes`` maps item ids to ``(before, after)`` quantities; the stored
+    quantity must already be ``after``. Items whose quantity did not change
+    get no row.
+    """
+    records = [
+        Transaction(
+            item_id=item_id,
+            transaction_type='IN' if after > before else 'OUT',
+            quantity=abs(after - before),
+            user=user,
+        )
+        for item_id, (before, after) in changes.items()
+        if after != before
+    ]
+    records = Transaction.objects.bulk_create(records)
+    if records:
+        versions.bump(Transaction)
+    return records
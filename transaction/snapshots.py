@@ -0,0 +1,219 @@
+"""
+Point-in-time stock from periodic InventorySnapshot checkpoints.
+
+A checkpoint sits on an interval boundary (midnight, Monday or the 1st of
+the month) and stores an item's quantity with every Transaction before the
+boundary applied. Rows are only written for items that moved during the
+interval (plus a baseline the first time an item is seen), so the latest
+snapshot of an item at or before any moment is never more than one
+interval of movements away from it.
+
+Stock as of a moment is that snapshot plus the movements since. Items with
+no snapshot that early fall back to the current quantity minus everything
+posted since the moment.
+
+Snapshots are built, and the fallback computed, by walking back from
+Inventory.quantity, so both rely on every change to an existing item's
+quantity having its Transaction: movements go through
+transaction.services (the API and the admin), the quantity is read-only on
+item updates, and bulk import upserts post the difference as an IN or OUT
+adjustment. Only an item's opening quantity, set when it is created, has
+no Transaction.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dashboard import versions
+from inventory.models import Inventory
+
+from .models import InventorySnapshot, Transaction
+
+INTERVALS = ('day', 'week', 'month')
+
+SIGNED_QUANTITY = Case(
+    When(transaction_type='IN', then=F('quantity')),
+    default=-F('quantity'),
+    output_field=IntegerField(),
+)
+
+
+def boundary_before(moment, interval):
+    """The latest checkpoint boundary at or before ``moment``."""
+    day = timezone.localtime(moment).date()
+    if interval == 'week':
+        day -= timedelta(days=day.weekday())
+    elif interval == 'month':
+        day = day.replace(day=1)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def next_boundary(boundary, interval):
+    day = timezone.localtime(boundary).date()
+    if interval == 'day':
+        day += timedelta(days=1)
+    elif interval == 'week':
+        day += timedelta(days=7)
+    elif day.month == 12:
+        day = day.replace(year=day.year + 1, month=1)
+    else:
+        day = day.replace(month=day.month + 1)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def pending_boundaries(interval, since=None, now=None):
+    """Boundaries after the newest checkpoint (or from ``since``) up to now."""
+    now = now or timezone.now()
+    latest = InventorySnapshot.objects.aggregate(latest=Max('taken_at'))['latest']
+    if since is not None:
+        start = boundary_before(since, interval)
+    elif latest is not None:
+        start = next_boundary(boundary_before(latest, interval), interval)
+    else:
+        # First build: a single baseline at the most recent boundary.
+        start = boundary_before(now, interval)
+
+    boundaries = []
+    while start <= now:
+        boundaries.append(start)
+        start = next_boundary(start, interval)
+    return boundaries
+
+
+@transaction.atomic
+def build_snapshots(interval='day', since=None, now=None):
+    """Write the checkpoints for every pending boundary; returns the number of rows.
+
+    Quantities are walked back from the current stock with one GROUP BY over
+    the movements since the oldest pending boundary.
+    """
+    boundaries = pending_boundaries(interval, since=since, now=now)
+    if not boundaries:
+        return 0
+    oldest = boundaries[0]
+
+    # Net movement and movement count per item, per interval ending at each boundary;
+    # index len(boundaries) collects everything after the newest one.
+    net = defaultdict(lambda: [0] * (len(boundaries) + 1))
+    moved = defaultdict(set)
+    rows = (
+        Transaction.objects
+        .filter(timestamp__gte=oldest)
+        .values_list('item_id', 'timestamp', 'transaction_type', 'quantity')
+        .order_by()
+    )
+    for item_id, timestamp, kind, quantity in rows.iterator(chunk_size=5000):
+        slot = bisect_right(boundaries, timestamp)
+        net[item_id][slot] += quantity if kind == 'IN' else -quantity
+        moved[item_id].add(slot)
+
+    known = set(
+        InventorySnapshot.objects.filter(taken_at__lt=oldest).values_list('item_id', flat=True).distinct()
+    )
+    existing = set(
+        InventorySnapshot.objects.filter(taken_at__in=boundaries).values_list('item_id', 'taken_at')
+    )
+
+    snapshots = []
+    items = Inventory.objects.values_list('id', 'quantity', 'created_at').order_by()
+    for item_id, quantity, created_at in items.iterator(chunk_size=5000):
+        deltas = net.get(item_id, [0] * (len(boundaries) + 1))
+        # Stock just before each boundary, newest first.
+        level = quantity - deltas[len(boundaries)]
+        levels = [0] * len(boundaries)
+        for index in range(len(boundaries) - 1, -1, -1):
+            levels[index] = level
+            level -= deltas[index]
+
+        seen = item_id in known
+        for index, boundary in enumerate(boundaries):
+            if created_at >= boundary:
+                continue
+            if (not seen or index in moved[item_id]) and (item_id, boundary) not in existing:
+                snapshots.append(InventorySnapshot(item_id=item_id, taken_at=boundary, quantity=levels[index]))
+            seen = True
+
+    InventorySnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    versions.bump(InventorySnapshot)
+    return len(snapshots)
+
+
+@transaction.atomic
+def compact_snapshots(older_than, interval='month'):
+    """Thin checkpoints before ``older_than`` to the last one per item per ``interval``.
+
+    Returns the number of rows deleted. Answers stay exact; only the
+    replayed delta for those older moments grows to one coarser interval.
+    """
+    keep = {}
+    rows = (
+        InventorySnapshot.objects
+        .filter(taken_at__lt=older_than)
+        .values_list('id', 'item_id', 'taken_at')
+        .order_by('item_id', 'taken_at')
+    )
+    doomed = []
+    for snapshot_id, item_id, taken_at in rows.iterator(chunk_size=5000):
+        bucket = (item_id, boundary_before(taken_at, interval))
+        if bucket in keep:
+            doomed.append(keep[bucket])
+        keep[bucket] = snapshot_id
+
+    deleted = 0
+    for start in range(0, len(doomed), 500):
+        deleted += InventorySnapshot.objects.filter(pk__in=doomed[start:start + 500]).delete()[0]
+    if deleted:
+        versions.bump(InventorySnapshot)
+    return deleted
+
+
+def with_stock_as_of(queryset, moment):
+    """Annotate ``as_of_quantity`` (stock just before ``moment``) onto an Inventory queryset.
+
+    Items created after ``moment`` are left out.
+    """
+    snapshot = (
+        InventorySnapshot.objects
+        .filter(item=OuterRef('pk'), taken_at__lte=moment)
+        .order_by('-taken_at')
+    )
+
+    def net_movements(**bounds):
+        return Coalesce(
+            Subquery(
+                Transaction.objects
+                .filter(item=OuterRef('pk'), **bounds)
+                .order_by()
+                .values('item')
+                .annotate(net=Sum(SIGNED_QUANTITY))
+                .values('net')[:1]
+            ),
+            Value(0),
+        )
+
+    return (
+        queryset
+        .filter(created_at__lt=moment)
+        .annotate(
+            snapshot_at=Subquery(snapshot.values('taken_at')[:1]),
+            snapshot_quantity=Subquery(snapshot.values('quantity')[:1]),
+        )
+        .annotate(
+            as_of_quantity=Case(
+                When(
+                    snapshot_at__isnull=False,
+                    then=F('snapshot_quantity') + net_movements(
+                        timestamp__gte=OuterRef('snapshot_at'), timestamp__lt=moment
+                    ),
+                ),
+                default=F('quantity') - net_movements(timestamp__gte=moment),
+                output_field=IntegerField(),
+            )
+        )
+    )
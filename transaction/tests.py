@@ -1,3 +1,338 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from inventory.importers import InventoryImporter
+from inventory.models import Inventory
+
+from . import forecast, services, snapshots
+from .models import StockForecast, Transaction
+from .views import TransactionExportView
+
+
+def post_with_retry(*args, attempts=200):
+    # SQLite serialises writers; a busy/locked database just means try again.
+    for _ in range(attempts):
+        try:
+            return services.post_movement(*args)
+        except OperationalError:
+            continue
+    raise AssertionError("database stayed locked")
+
+
+class StockPostingTests(TestCase):
+    def setUp(self):
+        self.item = Inventory.objects.create(item_name="Cement", category="Materials", quantity=10, unit="Bags")
+
+    def test_out_movement_decrements_quantity(self):
+        services.post_movement(self.item.pk, 'OUT', 4)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 6)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_out_movement_never_goes_negative(self):
+        with self.assertRaises(services.InsufficientStock) as raised:
+            services.post_movement(self.item.pk, 'OUT', 11)
+        self.assertEqual(raised.exception.available, 10)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 10)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_bulk_posting_reports_rejected_movements(self):
+        posted, failures = services.post_movements([
+            {'item': self.item.pk, 'transaction_type': 'OUT', 'quantity': 8},
+            {'item': self.item.pk, 'transaction_type': 'OUT', 'quantity': 8},
+            {'item': self.item.pk + 1000, 'transaction_type': 'IN', 'quantity': 1},
+            {'item': self.item.pk, 'transaction_type': 'IN', 'quantity': 5},
+        ])
+        self.assertEqual(len(posted), 2)
+        self.assertEqual([index for index, _ in failures], [1, 2])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 7)
+
+    def test_all_or_nothing_bulk_posts_nothing_on_failure(self):
+        with self.assertRaises(services.InsufficientStock):
+            services.post_movements([
+                {'item': self.item.pk, 'transaction_type': 'OUT', 'quantity': 8},
+                {'item': self.item.pk, 'transaction_type': 'OUT', 'quantity': 8},
+            ], all_or_nothing=True)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 10)
+        self.assertFalse(Transaction.objects.exists())
+
+
+class TransactionAdminTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(username='storekeeper', email='store@example.com', password='x')
+        self.client.force_login(self.admin)
+        self.item = Inventory.objects.create(item_name="Cement", category="Materials", quantity=10, unit="Bags")
+
+    def add(self, transaction_type, quantity):
+        return self.client.post(reverse('admin:transaction_transaction_add'), {
+            'item': self.item.pk, 'transaction_type': transaction_type, 'quantity': quantity,
+        })
+
+    def test_add_posts_the_movement(self):
+        self.assertEqual(self.add('OUT', 4).status_code, 302)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 6)
+        record = Transaction.objects.get()
+        self.assertEqual((record.quantity, record.user), (4, self.admin))
+
+    def test_add_rejects_overdrawing(self):
+        self.assertEqual(self.add('OUT', 11).status_code, 200)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 10)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_posted_movements_cannot_be_changed_or_deleted(self):
+        record = services.post_movement(self.item.pk, 'IN', 5)
+        change_url = reverse('admin:transaction_transaction_change', args=[record.pk])
+        self.assertEqual(self.client.post(change_url, {'item': self.item.pk, 'transaction_type': 'IN', 'quantity': 50}).status_code, 403)
+        self.assertEqual(self.client.post(reverse('admin:transaction_transaction_delete', args=[record.pk]), {'post': 'yes'}).status_code, 403)
+        record.refresh_from_db()
+        self.item.refresh_from_db()
+        self.assertEqual((record.quantity, self.item.quantity), (5, 15))
+
+
+class StockAsOfTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='clerk', email='clerk@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.item = Inventory.objects.create(item_name="Cement", category="Materials", quantity=10, unit="Bags")
+        services.post_movement(self.item.pk, 'OUT', 3)
+        services.post_movement(self.item.pk, 'IN', 1)
+        Inventory.objects.filter(pk=self.item.pk).update(created_at=datetime(2026, 1, 1, 10, 0, 45, tzinfo=timezone.utc))
+        Transaction.objects.update(timestamp=datetime(2026, 1, 1, 10, 1, tzinfo=timezone.utc))
+
+    def stock_as_of(self, moment):
+        response = self.client.get(reverse('inventory-list-create'), {'as_of': moment})
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        return row['quantity']
+
+    def test_later_edits_are_not_backdated(self):
+        for _ in range(2):
+            response = self.client.patch(
+                reverse('inventory-detail', args=[self.item.pk]), {'quantity': self.item.quantity + 50}, format='json'
+            )
+            self.assertEqual(response.status_code, 200)
+        report = InventoryImporter(upsert=True).run_rows([
+            (1, {'item_name': 'Cement', 'category': 'Materials', 'quantity': '108', 'unit': 'Bags'}),
+        ])
+        self.assertEqual(report.updated, 1)
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 108)
+        adjustment = Transaction.objects.latest('pk')
+        self.assertEqual((adjustment.transaction_type, adjustment.quantity), ('IN', 100))
+        self.assertEqual(self.stock_as_of('2026-01-01T10:01:02'), 8)
+
+        snapshots.build_snapshots(
+            'day', since=datetime(2026, 1, 2, tzinfo=timezone.utc), now=datetime(2026, 1, 3, tzinfo=timezone.utc)
+        )
+        self.assertEqual(self.stock_as_of('2026-01-02T12:00:00'), 8)
+
+
+class StockForecastTests(TestCase):
+    now = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+    def item(self, name, quantity):
+        item = Inventory.objects.create(item_name=name, category="Materials", quantity=quantity, unit="Bags")
+        Inventory.objects.filter(pk=item.pk).update(created_at=self.now - timedelta(days=365))
+        return item
+
+    def consume(self, item, days, per_day):
+        records = Transaction.objects.bulk_create(
+            Transaction(item=item, transaction_type='OUT', quantity=per_day) for _ in range(days)
+        )
+        for offset, record in enumerate(records, start=1):
+            Transaction.objects.filter(pk=record.pk).update(timestamp=self.now - timedelta(days=offset))
+
+    def test_steady_burn_and_idle_item(self):
+        steady = self.item("Cement", 100)
+        self.consume(steady, 90, 2)
+        idle = self.item("Sand", 40)
+        Transaction.objects.create(item=idle, transaction_type='IN', quantity=40)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(forecast.build_forecasts(now=self.now), 2)
+        reads = [q for q in captured if q['sql'].startswith('SELECT') and Transaction._meta.db_table in q['sql']]
+        self.assertEqual(len(reads), 1)
+
+        steady_forecast = StockForecast.objects.get(item=steady)
+        self.assertEqual(
+            (steady_forecast.burn_rate_7d, steady_forecast.burn_rate_30d, steady_forecast.burn_rate_90d), (2, 2, 2)
+        )
+        self.assertEqual(steady_forecast.days_to_stockout, 50)
+        self.assertEqual(steady_forecast.stockout_date, date(2026, 4, 20))
+
+        idle_forecast = StockForecast.objects.get(item=idle)
+        self.assertEqual(idle_forecast.burn_rate_7d, 0)
+        self.assertIsNone(idle_forecast.days_to_stockout)
+        self.assertIsNone(idle_forecast.stockout_date)
+
+    def test_window_is_whole_days(self):
+        item = self.item("Cement", 10)
+        # Today's movements fall after the window's midnight end; yesterday's are in column 0.
+        Transaction.objects.create(item=item, transaction_type='OUT', quantity=7)
+        Transaction.objects.filter(item=item).update(timestamp=self.now - timedelta(hours=1))
+        self.consume(item, 1, 3)
+        matrix = forecast.load_daily_consumption(np.asarray([item.pk]), datetime(2026, 3, 1, tzinfo=timezone.utc))
+        self.assertEqual(matrix[0, :2].tolist(), [3, 0])
+        self.assertEqual(matrix.sum(), 3)
+
+
+class ConcurrentStockOutTests(TransactionTestCase):
+    workers = 8
+    attempts_per_worker = 10
+
+    def test_concurrent_stock_outs_never_oversell(self):
+        item = Inventory.objects.create(item_name="Diesel", category="Fuel", quantity=50, unit="Liters")
+        start = threading.Barrier(self.workers)
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            start.wait()
+            try:
+                for _ in range(self.attempts_per_worker):
+                    try:
+                        post_with_retry(item.pk, 'OUT', 1)
+                        outcome = 'posted'
+                    except services.InsufficientStock:
+                        outcome = 'rejected'
+                    with lock:
+                        results.append(outcome)
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        item.refresh_from_db()
+        posted = results.count('posted')
+        self.assertEqual(len(results), self.workers * self.attempts_per_worker)
+        self.assertEqual(posted, 50)
+        self.assertEqual(item.quantity, 0)
+        self.assertEqual(Transaction.objects.filter(item=item, transaction_type='OUT').count(), posted)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            username='clerk', email='clerk@example.com', password='x'
+        ))
+        item = Inventory.objects.create(item_name="Sand", category="Materials", quantity=10, unit="Tonnes")
+        moments = [datetime(2024, 5, day, 12, tzinfo=timezone.utc) for day in (1, 2, 2, 2, 3)]
+        for moment in moments:
+            movement = Transaction.objects.create(item=item, transaction_type='IN', quantity=1)
+            Transaction.objects.filter(pk=movement.pk).update(timestamp=moment)
+        # Newest first, ties on the timestamp broken by id.
+        self.expected = list(Transaction.objects.order_by('-timestamp', '-id').values_list('id', flat=True))
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return body, [row['id'] for row in body['results']]
+
+    def test_pages_walk_ties_in_id_order(self):
+        body, ids = self.get(reverse('transaction-list'), page_size=2)
+        self.assertIsNone(body['previous'])
+        seen = ids
+        while body['next']:
+            body, ids = self.get(body['next'])
+            seen += ids
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(ids), 1)
+
+    def test_previous_cursor_returns_the_same_pages(self):
+        first, first_ids = self.get(reverse('transaction-list'), page_size=2)
+        second, second_ids = self.get(first['next'])
+        third, third_ids = self.get(second['next'])
+        self.assertEqual(first_ids + second_ids + third_ids, self.expected)
+
+        back, back_ids = self.get(third['previous'])
+        self.assertEqual(back_ids, second_ids)
+        self.assertEqual(self.get(back['next'])[1], third_ids)
+        start, start_ids = self.get(back['previous'])
+        self.assertEqual(start_ids, first_ids)
+        self.assertIsNone(start['previous'])
+        self.assertEqual(self.get(start['next'])[1], second_ids)
+
+    def test_malformed_cursor_is_not_found(self):
+        def encode(value):
+            return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+        for cursor in ('not-a-cursor', encode(['yesterday', 1]), encode(['2024-05-02T12:00:00Z', 1, 'back'])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('transaction-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+@mock.patch.object(TransactionExportView, 'rows_per_chunk', 2)
+class TransactionExportTests(TestCase):
+    columns = ['id', 'timestamp', 'transaction_type', 'item', 'item_name', 'quantity', 'user']
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            username='auditor', email='auditor@example.com', password='x'
+        ))
+        self.item = Inventory.objects.create(item_name="Gravel, washed", category="Materials", quantity=50, unit="Tonnes")
+
+    def add_movements(self, count):
+        for day in range(1, count + 1):
+            movement = Transaction.objects.create(item=self.item, transaction_type='OUT', quantity=day)
+            Transaction.objects.filter(pk=movement.pk).update(timestamp=datetime(2024, 6, day, 8, tzinfo=timezone.utc))
+
+    def export(self, **params):
+        response = self.client.get(reverse('transaction-export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        return response, chunks, b''.join(chunks).decode()
+
+    def test_csv_streams_the_header_and_every_row(self):
+        self.add_movements(5)
+        response, chunks, body = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(len(chunks), 4)
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], self.columns)
+        self.assertEqual([row[5] for row in rows[1:]], ['1', '2', '3', '4', '5'])
+        self.assertEqual(rows[1][4], 'Gravel, washed')
+        self.assertEqual(rows[1][1], '2024-06-01T08:00:00+00:00')
+
+    def test_ndjson_streams_every_row(self):
+        self.add_movements(5)
+        response, chunks, body = self.export(output='ndjson', **{'from': '2024-06-02', 'to': '2024-06-04'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('transactions_2024-06-02_2024-06-04.ndjson', response['Content-Disposition'])
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([list(line) for line in lines], [self.columns] * 3)
+        self.assertEqual([line['quantity'] for line in lines], [2, 3, 4])
+
+    def test_empty_export(self):
+        self.assertEqual(self.export()[2].splitlines(), [','.join(self.columns)])
+        self.assertEqual(self.export(output='ndjson')[1], [])
@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import (
+    TransactionListCreateView,
+    TransactionBulkPostView,
+    TransactionExportView,
+)
+
+urlpatterns = [
+    path('', TransactionListCreateView.as_view(), name='transaction-list-create'),
+    path('bulk/', TransactionBulkPostView.as_view(), name='transaction-bulk-post'),
+    path('export/', TransactionExportView.as_view(), name='transaction-export'),
+]
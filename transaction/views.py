@@ -1,3 +1,103 @@
 from django.shortcuts import render
 
 # Create your views here.
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from abv_management.export import BulkExportView
+from dashboard.idempotency import IdempotencyMixin
+from abv_management.pagination import KeysetPagination
+from abv_management.fieldsets import SparseFieldsetMixin
+from .models import Transaction
+from .serializers import StockMovementSerializer, TransactionSerializer
+from . import services
+
+
+def stock_error_response(exc, index=None):
+    body = {"detail": str(exc), "item": exc.item_id}
+    if isinstance(exc, services.InsufficientStock):
+        body["available"] = exc.available
+        code = status.HTTP_409_CONFLICT
+    else:
+        code = status.HTTP_400_BAD_REQUEST
+    if index is not None:
+        body["index"] = index
+    return body, code
+
+
+class TransactionListCreateView(IdempotencyMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
+    """List stock movements, or post one (which updates Inventory.quantity)."""
+
+    queryset = Transaction.objects.all()
+    serializer_class = TransactionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering_field = 'timestamp'
+
+    def create(self, request, *args, **kwargs):
+        movement = StockMovementSerializer(data=request.data)
+        movement.is_valid(raise_exception=True)
+        data = movement.validated_data
+        try:
+            record = services.post_movement(
+                data['item'], data['transaction_type'], data['quantity'], user=request.user
+            )
+        except services.StockError as exc:
+            body, code = stock_error_response(exc)
+            return Response(body, status=code)
+        return Response(TransactionSerializer(record).data, status=status.HTTP_201_CREATED)
+
+
+class TransactionBulkPostView(IdempotencyMixin, APIView):
+    """Post up to ``max_movements`` movements in one call.
+
+    Body: a list of movements, or ``{"movements": [...], "atomic": true}``.
+    With ``atomic`` the whole batch is rejected on the first failure (409/400);
+    otherwise rejected movements are reported and the rest are posted (207).
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_movements = 1000
+
+    def post(self, request):
+        payload = request.data
+        all_or_nothing = False
+        if isinstance(payload, dict):
+            all_or_nothing = bool(payload.get('atomic', False))
+            payload = payload.get('movements')
+
+        movements = StockMovementSerializer(data=payload, many=True, allow_empty=False, max_length=self.max_movements)
+        movements.is_valid(raise_exception=True)
+
+        try:
+            posted, failures = services.post_movements(
+                movements.validated_data, user=request.user, all_or_nothing=all_or_nothing
+            )
+        except services.StockError as exc:
+            body, code = stock_error_response(exc)
+            return Response(body, status=code)
+
+        return Response(
+            {
+                "posted": TransactionSerializer(posted, many=True).data,
+                "errors": [stock_error_response(exc, index)[0] for index, exc in failures],
+            },
+            status=status.HTTP_207_MULTI_STATUS if failures else status.HTTP_201_CREATED,
+        )
+
+
+class TransactionExportView(BulkExportView):
+    queryset = Transaction.objects.all()
+    date_field = 'timestamp'
+    filename = 'transactions'
+    export_columns = {
+        'id': 'id',
+        'timestamp': 'timestamp',
+        'transaction_type': 'transaction_type',
+        'item': 'item_id',
+        'item_name': 'item__item_name',
+        'quantity': 'quantity',
+        'user': 'user_id',
+    }